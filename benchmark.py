@@ -0,0 +1,632 @@
+"""
+PC Control Hub - benchmark.py
+
+Benchmarks dos caminhos críticos da aplicação, sem janela visível
+(`QT_QPA_PLATFORM=offscreen`) e com as chamadas exclusivas do Windows
+substituídas por falsos, para correrem também em Linux.
+
+Uso:
+    python benchmark.py                   # corre tudo e compara com a base guardada (se existir)
+    python benchmark.py --save-baseline   # guarda os resultados atuais como base
+    python benchmark.py --only startup    # só os benchmarks cujo nome contém "startup"
+    python benchmark.py --quick           # menos repetições
+    python benchmark.py --only disk_usage --disk-root /usr   # analisador de disco numa pasta real
+
+Cada benchmark faz aquecimento e várias repetições; compara-se a mediana
+(mais estável do que a média). Uma mediana acima da base mais a
+tolerância conta como regressão e o programa termina com código 1.
+
+Cada grupo de `BENCHMARKS` corre num processo próprio: se um abortar (por
+exemplo, uma falha dentro do Qt), os restantes e a comparação com a base
+continuam, e o grupo aparece como falhado.
+"""
+
+import argparse
+import ctypes
+import json
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from unittest import mock
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_BASELINE = os.path.join(BASE_DIR, "benchmark_baseline.json")
+
+# Código que prepara um interpretador novo para importar main.py fora do Windows
+_FAKE_WINDOWS = "import ctypes, unittest.mock; ctypes.windll = getattr(ctypes, 'windll', None) or unittest.mock.MagicMock()"
+
+
+def _install_fakes():
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    if not hasattr(ctypes, "windll"):
+        # IsUserAnAdmin, SHGetFileInfoW, SHEmptyRecycleBinW... passam a não fazer nada
+        ctypes.windll = mock.MagicMock()
+    if BASE_DIR not in sys.path:
+        sys.path.insert(0, BASE_DIR)
+
+
+# --- ESTATÍSTICAS ---
+def summarize(samples):
+    ordered = sorted(samples)
+    return {
+        "runs": len(samples),
+        "min": ordered[0],
+        "median": statistics.median(ordered),
+        "mean": statistics.fmean(ordered),
+        "stdev": statistics.stdev(ordered) if len(ordered) > 1 else 0.0,
+        "p95": ordered[max(0, int(round(0.95 * len(ordered))) - 1)],
+    }
+
+
+def measure(run, repeat, warmup=1, setup=None):
+    """ Mede `run()` `repeat` vezes (em segundos); `setup()` corre antes de cada medição, fora do tempo. """
+    samples = []
+    for i in range(warmup + repeat):
+        if setup is not None:
+            setup()
+        start = time.perf_counter()
+        run()
+        elapsed = time.perf_counter() - start
+        if i >= warmup:
+            samples.append(elapsed)
+    return summarize(samples)
+
+
+# --- AMBIENTE DOS BENCHMARKS ---
+class Harness:
+    def __init__(self):
+        _install_fakes()
+        from PySide6.QtWidgets import QApplication
+        self.app = QApplication.instance() or QApplication([])
+        self.work_dir = tempfile.mkdtemp(prefix="pchub-bench-")
+        # Pasta real para o benchmark do analisador de disco (`--disk-root`)
+        self.disk_root = None
+        os.environ["LOCALAPPDATA"] = os.path.join(self.work_dir, "localappdata")
+
+    def wait(self, condition, timeout=30.0):
+        deadline = time.perf_counter() + timeout
+        while not condition():
+            if time.perf_counter() > deadline:
+                raise TimeoutError("o benchmark não terminou a tempo")
+            self.app.processEvents()
+            time.sleep(0.0005)
+
+    def window(self):
+        import main
+        return main.MainWindow()
+
+    def close(self):
+        shutil.rmtree(self.work_dir, ignore_errors=True)
+
+
+class _NoIconExtractor:
+    """ Extrator sem Windows: resolve os caminhos a sério, mas não há ícones para extrair. """
+
+    def resolve(self, command):
+        from utils import resolve_icon_sources
+        return resolve_icon_sources(command)
+
+    def extract(self, path, size):
+        return None
+
+
+def serve_text(body, delay=0.0, status=200):
+    """ Servidor HTTP local (numa thread) que responde sempre `body`; devolve o URL e o servidor. """
+    import threading
+    from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+    payload = body.encode("utf-8")
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            time.sleep(delay)
+            self.send_response(status)
+            self.send_header("Content-Length", str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return f"http://127.0.0.1:{server.server_address[1]}/", server
+
+
+def serve_throughput(download_size=8 * 1024 * 1024):
+    """ Servidor HTTP/1.1 local para o teste de velocidade: GET devolve `download_size` bytes, POST descarta o corpo. """
+    import threading
+    from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+    block = b"\0" * (64 * 1024)
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_GET(self):
+            self.send_response(200)
+            self.send_header("Content-Length", str(download_size))
+            self.end_headers()
+            try:
+                for offset in range(0, download_size, len(block)):
+                    self.wfile.write(block[:download_size - offset])
+            except OSError:
+                self.close_connection = True
+
+        def do_POST(self):
+            remaining = int(self.headers.get("Content-Length", 0))
+            try:
+                while remaining > 0:
+                    chunk = self.rfile.read(min(remaining, len(block)))
+                    if not chunk:
+                        break
+                    remaining -= len(chunk)
+            except OSError:
+                self.close_connection = True
+                return
+            self.send_response(200)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    server.daemon_threads = True
+    # O cliente fecha as ligações a meio no fim de cada fase: não é um erro
+    server.handle_error = lambda request, client_address: None
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return f"http://127.0.0.1:{server.server_address[1]}/", server
+
+
+def make_tree(root, files, depth, file_size=512):
+    """ Cria `files` ficheiros repartidos por uma cadeia de `depth` níveis de pastas (2 subpastas por nível). """
+    os.makedirs(root, exist_ok=True)
+    folders = [root]
+    for level in range(depth):
+        parent = folders[-1]
+        for branch in range(2):
+            folders.append(os.path.join(parent, f"d{level}_{branch}"))
+            os.makedirs(folders[-1], exist_ok=True)
+    payload = b"x" * file_size
+    for i in range(files):
+        with open(os.path.join(folders[i % len(folders)], f"f{i}.tmp"), "wb") as f:
+            f.write(payload)
+
+
+# --- BENCHMARKS ---
+def bench_import(harness, repeat):
+    code = f"{_FAKE_WINDOWS}; import main"
+    env = dict(os.environ, QT_QPA_PLATFORM="offscreen")
+
+    def run():
+        subprocess.run([sys.executable, "-c", code], cwd=BASE_DIR, env=env, check=True,
+                       stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+    return {"import main": measure(run, repeat)}
+
+
+def bench_cli(harness, repeat):
+    env = dict(os.environ, LOCALAPPDATA=os.path.join(harness.work_dir, "localappdata"))
+    # A linha de comandos não pode carregar o Qt: é isso que a mantém rápida
+    check = "import sys, cli; cli.main(['metrics', '--interval', '0']); assert 'PySide6' not in sys.modules"
+    subprocess.run([sys.executable, "-c", check], cwd=BASE_DIR, env=env, check=True, stdout=subprocess.DEVNULL)
+
+    def run():
+        subprocess.run([sys.executable, "cli.py", "metrics", "--interval", "0"], cwd=BASE_DIR, env=env, check=True,
+                       stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+    return {"cli.py metrics": measure(run, repeat)}
+
+
+def bench_window(harness, repeat):
+    harness.window().close()  # primeira construção: importações e caches
+
+    def run():
+        window = harness.window()
+        window.close()
+
+    return {"MainWindow()": measure(run, repeat)}
+
+
+def bench_startup_list(harness, repeat):
+    from icon_cache import IconCache
+    from startup_sources import MemoryRegistry, StartupScanner, RegistrySource, HKEY_CURRENT_USER, RUN_PATH
+
+    window = harness.window()
+    window.icon_cache = IconCache(window.scheduler, _NoIconExtractor())
+    results = {}
+    for count in (10, 100, 1000):
+        registry = MemoryRegistry({
+            (HKEY_CURRENT_USER, RUN_PATH): {f"App{i}": f'"C:\\Apps\\app{i}.exe" --tray' for i in range(count)}
+        })
+
+        def setup():
+            # Lista vazia e cache de origens limpa: mede sempre uma leitura completa
+            window.startup_model.set_programs([])
+            window.startup_scanner = StartupScanner([RegistrySource(registry, HKEY_CURRENT_USER, RUN_PATH)])
+
+        def run():
+            window.populate_startup_list()
+            harness.wait(lambda: window.startup_model.rowCount() == count)
+
+        results[f"populate_startup_list[{count}]"] = measure(run, repeat, setup=setup)
+    window.close()
+    return results
+
+
+def bench_cleanup(harness, repeat):
+    window = harness.window()
+    temp_root = os.path.join(harness.work_dir, "temp")
+    results = {}
+    for files, depth in ((200, 2), (2000, 4), (500, 12)):
+
+        def setup():
+            shutil.rmtree(temp_root, ignore_errors=True)
+            make_tree(temp_root, files, depth)
+
+        def run():
+            with mock.patch.dict(os.environ, {"TEMP": temp_root}):
+                window.clean_temp_files()
+                harness.wait(lambda: not window.scheduler.is_running("cleanup"))
+
+        results[f"clean_temp_files[{files} ficheiros, profundidade {depth}]"] = measure(run, repeat, setup=setup)
+    window.close()
+    return results
+
+
+def bench_cleanup_rules(harness, repeat):
+    import dataclasses
+    from cleanup_rules import DEFAULT_RULES, RuleCleaner
+
+    # Perfil falso: TEMP dentro do LOCALAPPDATA, 3 perfis do Chrome, despejos e registos de 40 aplicações
+    profile = os.path.join(harness.work_dir, "profile")
+    environ = {"LOCALAPPDATA": os.path.join(profile, "Local"), "TEMP": os.path.join(profile, "Local", "Temp"),
+               "APPDATA": os.path.join(profile, "Roaming"), "SystemRoot": os.path.join(profile, "Windows"),
+               "ProgramData": os.path.join(profile, "ProgramData")}
+    old = time.time() - 60 * 24 * 60 * 60
+
+    def populate():
+        shutil.rmtree(profile, ignore_errors=True)
+        make_tree(environ["TEMP"], 1000, 4)
+        for name in ("Default", "Profile 1", "Profile 2"):
+            make_tree(os.path.join(environ["LOCALAPPDATA"], "Google", "Chrome", "User Data", name, "Cache"), 300, 2)
+        for app in range(40):
+            folder = os.path.join(environ["LOCALAPPDATA"], f"App{app}", "logs")
+            make_tree(folder, 10, 1)
+            for i in range(5):
+                path = os.path.join(folder, f"app{i}.log")
+                with open(path, "wb") as f:
+                    f.write(b"log" * 100)
+                os.utime(path, (old, old))
+        for root, _, files in os.walk(environ["TEMP"]):
+            for name in files:
+                os.utime(os.path.join(root, name), (old, old))
+
+    rules = [dataclasses.replace(rule, enabled=True) for rule in DEFAULT_RULES]
+    populate()
+
+    def single_pass():
+        result = RuleCleaner(rules, dry_run=True, environ=environ).run()
+        assert result.stats.items == 1000 + 900 + 200, result.stats
+
+    def pass_per_rule():
+        for rule in rules:
+            RuleCleaner([rule], dry_run=True, environ=environ).run()
+
+    def clean():
+        RuleCleaner(rules, environ=environ).run()
+
+    return {
+        "RuleCleaner (9 regras, uma travessia por raiz, simulação)": measure(single_pass, repeat),
+        "RuleCleaner (9 regras, uma travessia por regra, simulação)": measure(pass_per_rule, repeat),
+        "RuleCleaner (9 regras, 2100 ficheiros apagados)": measure(clean, repeat, setup=populate),
+    }
+
+
+def bench_system_info(harness, repeat):
+    from main import MONITOR_PAGE_INDEX
+
+    window = harness.window()
+    window.pages_widget.setCurrentIndex(MONITOR_PAGE_INDEX)
+    harness.wait(lambda: window.metrics_sampler.snapshot() is not None)
+    ticks = 100
+
+    def run():
+        for _ in range(ticks):
+            window.update_system_info()
+
+    stats = measure(run, repeat)
+    window.close()
+    # Custo por atualização do Monitor
+    return {"update_system_info (por tick)": {key: value / ticks if key != "runs" else value
+                                              for key, value in stats.items()}}
+
+
+def bench_icons(harness, repeat):
+    import utils
+
+    apps_root = os.path.join(harness.work_dir, "icons", "LocalAppData")
+    commands = []
+    for i in range(20):
+        app_dir = os.path.join(apps_root, f"App{i}")
+        os.makedirs(os.path.join(app_dir, "app-1.0.0"), exist_ok=True)
+        for path in (os.path.join(app_dir, "Update.exe"), os.path.join(app_dir, "app-1.0.0", f"App{i}.exe")):
+            open(path, "wb").close()
+        commands.append(f'"{os.path.join(app_dir, "Update.exe")}" --processStart App{i}.exe')
+        commands.append(f'"{os.path.join(app_dir, "app-1.0.0", f"App{i}.exe")}" --minimized')
+
+    def run():
+        for command in commands:
+            utils.get_icon_for_executable(command)
+
+    return {f"get_icon_for_executable ({len(commands)} comandos)": measure(run, repeat)}
+
+
+def bench_public_ip(harness, repeat):
+    from ip_resolver import PublicIPResolver
+
+    # Serviços locais: um lento, um com resposta inválida, um com erro e um rápido
+    stand_ins = [serve_text("198.51.100.1", delay=1.0), serve_text("<html>"),
+                 serve_text("erro", status=500), serve_text("203.0.113.7", delay=0.02)]
+    resolver = PublicIPResolver([url for url, _ in stand_ins], timeout=2.0)
+
+    def run():
+        result = resolver.resolve(force=True)
+        assert result.address == "203.0.113.7", result
+
+    results = {"PublicIPResolver.resolve (4 serviços, 1 lento)": measure(run, repeat),
+               "PublicIPResolver.resolve (em cache)": measure(resolver.resolve, repeat)}
+    resolver.close()
+    for _, server in stand_ins:
+        server.shutdown()
+    return results
+
+
+def bench_throughput(harness, repeat):
+    from throughput import ThroughputTester, HttpBackend
+
+    url, server = serve_throughput()
+
+    def run():
+        result = ThroughputTester(HttpBackend(url), streams=4, duration=1.0, warmup=0.3).run()
+        assert result.download.p50_mbps > 0 and result.upload.p50_mbps > 0, result
+
+    # Com fases de duração fixa, um tempo acima de 2×1,3 s indica atrasos a parar as ligações
+    stats = measure(run, min(repeat, 3), warmup=0)
+    server.shutdown()
+    return {"ThroughputTester (4 ligações, servidor local)": stats}
+
+
+def bench_duplicates(harness, repeat):
+    from duplicates import DuplicateFinder, HashCache
+
+    # 120 ficheiros de 1 MB: 40 conteúdos distintos em 3 cópias, mais 40 do mesmo tamanho só com o meio diferente
+    root = os.path.join(harness.work_dir, "duplicates")
+    for i in range(40):
+        payload = bytearray(os.urandom(1024 * 1024))
+        for copy in range(3):
+            folder = os.path.join(root, f"d{copy}", f"s{i % 5}")
+            os.makedirs(folder, exist_ok=True)
+            with open(os.path.join(folder, f"f{i}.bin"), "wb") as f:
+                f.write(payload)
+        payload[len(payload) // 2] ^= 1
+        with open(os.path.join(root, "d0", f"near{i}.bin"), "wb") as f:
+            f.write(payload)
+    cache_path = os.path.join(harness.work_dir, "hash_cache.json")
+
+    def cold():
+        if os.path.exists(cache_path):
+            os.remove(cache_path)
+        result = DuplicateFinder([root], hash_cache=HashCache(cache_path)).run()
+        assert len(result.groups) == 40, len(result.groups)
+
+    def warm():
+        result = DuplicateFinder([root], hash_cache=HashCache(cache_path)).run()
+        assert len(result.groups) == 40 and result.progress.hashed_bytes == 0
+
+    return {"DuplicateFinder (160 ficheiros de 1 MB, sem cache)": measure(cold, repeat),
+            "DuplicateFinder (com cache de hashes)": measure(warm, repeat)}
+
+
+def bench_disk_usage(harness, repeat):
+    from disk_tree import DiskScanner, DiskTree
+
+    # 2000 pastas em 3 níveis, 10 ficheiros vazios em cada (o custo está na listagem, não no tamanho)
+    root = os.path.join(harness.work_dir, "disk_usage")
+    for i in range(2000):
+        folder = os.path.join(root, f"a{i % 20}", f"b{i % 100}", f"c{i}")
+        os.makedirs(folder)
+        for j in range(10):
+            open(os.path.join(folder, f"f{j}.dat"), "wb").close()
+
+    def scan(path, workers):
+        def run():
+            result = DiskScanner(path, max_workers=workers).run()
+            assert result.progress.done and result.progress.errors == 0
+        return run
+
+    def build_tree():
+        # Árvore em arrays com o tamanho de um disco de sistema (16 subpastas por pasta, 5 níveis)
+        tree = DiskTree("/")
+        for i in range(200_000):
+            node = tree.add_dir(i // 16, "pasta")
+            tree.add_files(node, 4096, 1)
+        assert tree.total_files[DiskTree.ROOT] == 200_000
+
+    results = {
+        "DiskScanner (2000 pastas, 20 000 ficheiros, 1 thread)": measure(scan(root, 1), repeat),
+        "DiskScanner (2000 pastas, 20 000 ficheiros, 8 threads)": measure(scan(root, 8), repeat),
+        "DiskTree (200 000 pastas)": measure(build_tree, repeat),
+    }
+    if harness.disk_root:
+        results[f"DiskScanner ({harness.disk_root})"] = measure(scan(harness.disk_root, 8), repeat)
+    return results
+
+
+def bench_theme(harness, repeat):
+    from icon_cache import IconCache
+    from main import MONITOR_PAGE_INDEX, LIMPEZA_PAGE_INDEX
+    from startup_sources import MemoryRegistry, StartupScanner, RegistrySource, HKEY_CURRENT_USER, RUN_PATH
+
+    # Janela visível com a lista de arranque e a tabela de processos preenchidas
+    window = harness.window()
+    window.icon_cache = IconCache(window.scheduler, _NoIconExtractor())
+    registry = MemoryRegistry({(HKEY_CURRENT_USER, RUN_PATH): {f"App{i}": f"C:\\Apps\\app{i}.exe" for i in range(1000)}})
+    window.startup_scanner = StartupScanner([RegistrySource(registry, HKEY_CURRENT_USER, RUN_PATH)])
+    window.show()
+    window.populate_startup_list()
+    harness.wait(lambda: window.startup_model.rowCount() == 1000)
+    window.pages_widget.setCurrentIndex(MONITOR_PAGE_INDEX)
+    harness.wait(lambda: window.process_model.rowCount() > 0)
+    window.pages_widget.setCurrentIndex(LIMPEZA_PAGE_INDEX)
+    themes = iter(["light", "dark"] * (repeat + 2))
+
+    def run():
+        window.set_theme(next(themes))
+        # Inclui a nova pintura da janela
+        window.repaint()
+
+    stats = measure(run, repeat)
+    window.close()
+    return {"set_theme (com 1000 entradas de arranque)": stats}
+
+
+BENCHMARKS = {
+    "import": bench_import,
+    "cli": bench_cli,
+    "window": bench_window,
+    "startup": bench_startup_list,
+    "cleanup": bench_cleanup,
+    "cleanup_rules": bench_cleanup_rules,
+    "system_info": bench_system_info,
+    "icons": bench_icons,
+    "theme": bench_theme,
+    "public_ip": bench_public_ip,
+    "throughput": bench_throughput,
+    "duplicates": bench_duplicates,
+    "disk_usage": bench_disk_usage,
+}
+
+
+# --- EXECUÇÃO ISOLADA ---
+def run_isolated(name, repeat, disk_root=None):
+    """ Corre o grupo `name` num interpretador novo; devolve os resultados ou None se falhar. """
+    fd, output = tempfile.mkstemp(prefix="bench-", suffix=".json")
+    os.close(fd)
+    command = [sys.executable, os.path.abspath(__file__), "--worker", name, "--repeat", str(repeat), "--output", output]
+    if disk_root:
+        command += ["--disk-root", disk_root]
+    try:
+        subprocess.run(command, cwd=BASE_DIR, stdout=subprocess.DEVNULL, check=False)
+        # Lido mesmo com código de saída diferente de 0: um erro ao terminar o
+        # interpretador não invalida medições que já foram escritas
+        with open(output, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+    finally:
+        try:
+            os.remove(output)
+        except OSError:
+            pass
+
+
+def run_worker(name, repeat, disk_root, output):
+    harness = Harness()
+    harness.disk_root = disk_root
+    try:
+        results = BENCHMARKS[name](harness, repeat)
+    finally:
+        harness.close()
+    # Escrito de forma atómica: um ficheiro a meio não passa por resultados
+    tmp_output = output + ".tmp"
+    with open(tmp_output, "w", encoding="utf-8") as f:
+        json.dump(results, f)
+    os.replace(tmp_output, output)
+    return 0
+
+
+# --- BASE E COMPARAÇÃO ---
+def compare(results, baseline, tolerance):
+    """ Devolve [(nome, mediana atual, mediana da base, variação)] e os nomes com regressão. """
+    rows, regressions = [], []
+    for name, stats in results.items():
+        base = baseline.get(name)
+        if base is None:
+            rows.append((name, stats["median"], None, None))
+            continue
+        change = stats["median"] / base["median"] - 1 if base["median"] else 0.0
+        rows.append((name, stats["median"], base["median"], change))
+        if change > tolerance:
+            regressions.append(name)
+    return rows, regressions
+
+
+def _format_ms(seconds):
+    return f"{seconds * 1000:9.2f} ms" if seconds is not None else "         --"
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmarks do PC Control Hub (sem janela).")
+    parser.add_argument("--only", help="só os benchmarks cujo nome contém este texto")
+    parser.add_argument("--quick", action="store_true", help="menos repetições (resultados menos estáveis)")
+    parser.add_argument("--repeat", type=int, help="número de repetições de cada medição")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE, help="ficheiro JSON da base de comparação")
+    parser.add_argument("--save-baseline", action="store_true", help="guardar os resultados como nova base")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="subida da mediana aceite (0.2 = 20%%)")
+    parser.add_argument("--json", action="store_true", help="escrever os resultados em JSON")
+    parser.add_argument("--disk-root", help="pasta real a analisar também no benchmark disk_usage")
+    # Uso interno: corre um só grupo e escreve os resultados em JSON no ficheiro indicado
+    parser.add_argument("--worker", help=argparse.SUPPRESS)
+    parser.add_argument("--output", help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    repeat = args.repeat or (3 if args.quick else 10)
+    if args.worker:
+        return run_worker(args.worker, repeat, args.disk_root, args.output)
+
+    results, failed = {}, []
+    for name in BENCHMARKS:
+        if args.only and args.only not in name:
+            continue
+        group_results = run_isolated(name, repeat, args.disk_root)
+        if group_results is None:
+            failed.append(name)
+        else:
+            results.update(group_results)
+
+    baseline = {}
+    if os.path.exists(args.baseline) and not args.save_baseline:
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            baseline = json.load(f).get("results", {})
+    rows, regressions = compare(results, baseline, args.tolerance)
+
+    if args.json:
+        print(json.dumps({"results": results, "regressions": regressions, "failed": failed},
+                         indent=2, ensure_ascii=False))
+    else:
+        for name, median, base, change in rows:
+            stats = results[name]
+            line = f"{name:55} {_format_ms(median)}  ±{stats['stdev'] * 1000:7.2f}  base {_format_ms(base)}"
+            if change is not None:
+                line += f"  {change:+6.1%}" + ("  REGRESSÃO" if name in regressions else "")
+            print(line)
+        for name in failed:
+            print(f"{name:55} FALHOU (o processo do benchmark terminou sem resultados)")
+
+    if args.save_baseline:
+        payload = {"python": sys.version.split()[0], "platform": sys.platform, "results": results}
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump(payload, f, indent=2, ensure_ascii=False)
+        print(f"Base guardada em {args.baseline}")
+    return 1 if regressions or failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
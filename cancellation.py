@@ -0,0 +1,71 @@
+"""
+PC Control Hub - cancellation.py
+
+Cancelamento cooperativo das tarefas, sem depender do Qt: o `CancelToken`
+é usado pelo agendador da interface (jobs.py) e pela linha de comandos
+(cli.py), que corre as mesmas funções de tarefa (workers.py) diretamente
+na thread que as chama através de um `InlineJob`.
+"""
+
+import threading
+import time
+
+
+class JobCancelled(Exception):
+    pass
+
+
+class CancelToken:
+    def __init__(self):
+        self._event = threading.Event()
+        self._callbacks = []
+        self._lock = threading.Lock()
+
+    @property
+    def cancelled(self):
+        return self._event.is_set()
+
+    def cancel(self):
+        with self._lock:
+            if self._event.is_set():
+                return
+            self._event.set()
+            callbacks, self._callbacks = self._callbacks, []
+        for callback in callbacks:
+            callback()
+
+    def on_cancel(self, callback):
+        """ Chama `callback` ao cancelar (imediatamente, se já estiver cancelado). """
+        with self._lock:
+            if not self._event.is_set():
+                self._callbacks.append(callback)
+                return
+        callback()
+
+    def raise_if_cancelled(self):
+        if self._event.is_set():
+            raise JobCancelled()
+
+
+class InlineJob:
+    """ O mesmo contrato do `Job` do agendador (`token`, `report_progress`), mas `run` corre na thread atual. """
+
+    def __init__(self, name="job", on_progress=None):
+        self.name = name
+        self.token = CancelToken()
+        self.on_progress = on_progress
+        self.run_seconds = None
+
+    def report_progress(self, payload):
+        if self.on_progress is not None:
+            self.on_progress(payload)
+
+    def cancel(self):
+        self.token.cancel()
+
+    def run(self, fn, *args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return fn(self, *args, **kwargs)
+        finally:
+            self.run_seconds = time.perf_counter() - start
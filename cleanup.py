@@ -0,0 +1,196 @@
+"""
+PC Control Hub - cleanup.py
+
+Motor de limpeza de ficheiros temporários. Percorre a pasta alvo com
+`os.scandir` (sem construir listas completas em memória) e apaga os
+ficheiros em paralelo numa pool de threads limitada. Não depende de Qt:
+o `CleanupWorker` em `workers.py` liga o progresso a sinais da interface.
+"""
+
+import errno
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+
+from fswalk import is_reparse_point
+
+
+@dataclass
+class CleanupStats:
+    items: int = 0
+    bytes_freed: int = 0
+    errors: int = 0
+    cancelled: bool = False
+    dry_run: bool = False
+    elapsed: float = 0.0
+
+
+class TempCleaner:
+    """ Apaga (ou simula apagar, em `dry_run`) todo o conteúdo de `target_dir`.
+
+    A pasta alvo em si nunca é removida. `progress_callback` recebe uma cópia de
+    `CleanupStats` no máximo a cada `progress_interval` segundos, a partir de
+    qualquer thread da pool. As pastas em `skip_dirs` (`{caminho: [subpastas]}`,
+    como devolvido por `DirSizeIndex.empty_dirs`) não são listadas: só são
+    removidas de baixo para cima, com as subpastas indicadas.
+    """
+
+    def __init__(self, target_dir, max_workers=8, dry_run=False,
+                 progress_callback=None, progress_interval=0.1, skip_dirs=None):
+        self.target_dir = target_dir
+        self.skip_dirs = skip_dirs or {}
+        self.max_workers = max(1, max_workers)
+        self.dry_run = dry_run
+        self.progress_callback = progress_callback
+        self.progress_interval = progress_interval
+
+        self._cancel_event = threading.Event()
+        self._lock = threading.Lock()
+        self._stats = CleanupStats(dry_run=dry_run)
+        self._last_report = 0.0
+        # Limita o número de tarefas pendentes para a memória não crescer com a árvore
+        self._in_flight = threading.BoundedSemaphore(self.max_workers * 4)
+
+    def cancel(self):
+        self._cancel_event.set()
+
+    @property
+    def cancelled(self):
+        return self._cancel_event.is_set()
+
+    def run(self):
+        start = time.perf_counter()
+        directories = []
+
+        with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="cleanup") as pool:
+            stack = [self.target_dir]
+            while stack and not self.cancelled:
+                current = stack.pop()
+                try:
+                    with os.scandir(current) as entries:
+                        for entry in entries:
+                            if self.cancelled:
+                                break
+                            self._visit(entry, pool, stack, directories)
+                except OSError:
+                    self._record(errors=1)
+
+        # As pastas só ficam vazias depois de todos os ficheiros apagados;
+        # a ordem inversa da descoberta garante filhos antes dos pais.
+        if not self.cancelled:
+            for path in reversed(directories):
+                self._remove_directory(path)
+
+        with self._lock:
+            self._stats.cancelled = self.cancelled
+            self._stats.elapsed = time.perf_counter() - start
+            result = CleanupStats(**vars(self._stats))
+        self._report(force=True)
+        return result
+
+    def _visit(self, entry, pool, stack, directories):
+        try:
+            if entry.is_dir(follow_symlinks=False):
+                if is_reparse_point(entry):
+                    # Junção (ou link) para uma pasta: sai só a junção, nunca o conteúdo do destino
+                    self._submit_removal(pool, entry.path, 0, True)
+                    return
+                if entry.path in self.skip_dirs:
+                    self._collect_skipped(entry.path, stack, directories)
+                    return
+                stack.append(entry.path)
+                directories.append(entry.path)
+                return
+            size = entry.stat(follow_symlinks=False).st_size
+        except OSError:
+            self._record(errors=1)
+            return
+
+        self._submit_removal(pool, entry.path, size, entry.is_symlink())
+
+    def _collect_skipped(self, path, stack, directories):
+        # Ordem de descoberta (pais antes dos filhos), como na travessia normal
+        pending = [path]
+        while pending:
+            current = pending.pop()
+            directories.append(current)
+            for child in self.skip_dirs[current]:
+                if child in self.skip_dirs:
+                    pending.append(child)
+                else:
+                    # Subpasta alterada desde a última análise: volta a ser listada
+                    stack.append(child)
+                    directories.append(child)
+
+    def _submit_removal(self, pool, path, size, is_link):
+        if self.dry_run:
+            self._record(items=1, bytes_freed=size)
+            return
+        self._in_flight.acquire()
+        future = pool.submit(self._remove_file, path, size, is_link)
+        future.add_done_callback(lambda _: self._in_flight.release())
+
+    def _remove_file(self, path, size, is_link):
+        if self.cancelled:
+            return
+        try:
+            os.unlink(path)
+        except (IsADirectoryError, PermissionError):
+            # No Windows, links para pastas só saem com rmdir
+            if not is_link:
+                self._record(errors=1)
+                return
+            try:
+                os.rmdir(path)
+            except OSError:
+                self._record(errors=1)
+                return
+        except FileNotFoundError:
+            return
+        except OSError:
+            self._record(errors=1)
+            return
+        self._record(items=1, bytes_freed=size)
+
+    def _remove_directory(self, path):
+        if self.dry_run:
+            self._record(items=1)
+            return
+        try:
+            os.rmdir(path)
+        except FileNotFoundError:
+            return
+        except OSError as e:
+            # Pasta com ficheiros em uso: o erro já foi contado no ficheiro
+            if e.errno != errno.ENOTEMPTY:
+                self._record(errors=1)
+            return
+        self._record(items=1)
+
+    def _record(self, items=0, bytes_freed=0, errors=0):
+        with self._lock:
+            self._stats.items += items
+            self._stats.bytes_freed += bytes_freed
+            self._stats.errors += errors
+        self._report()
+
+    def _report(self, force=False):
+        if not self.progress_callback:
+            return
+        now = time.monotonic()
+        with self._lock:
+            if not force and now - self._last_report < self.progress_interval:
+                return
+            self._last_report = now
+            snapshot = CleanupStats(**vars(self._stats))
+        self.progress_callback(snapshot)
+
+
+def format_bytes(num_bytes):
+    for unit in ("B", "KB", "MB", "GB"):
+        if abs(num_bytes) < 1024:
+            return f"{num_bytes:.0f} {unit}" if unit == "B" else f"{num_bytes:.2f} {unit}"
+        num_bytes /= 1024
+    return f"{num_bytes:.2f} TB"
@@ -0,0 +1,429 @@
+"""
+PC Control Hub - cleanup_rules.py
+
+Limpeza por regras: cada `CleanupRule` diz onde procurar (pastas com
+%VARIÁVEIS% e `*` em qualquer componente), que ficheiros apagar (padrões
+de nome) e a partir de que idade e tamanho.
+
+As regras são compiladas em padrões e avaliadas em conjunto: as pastas
+de todas as regras são agrupadas em raízes (uma regra cuja pasta está
+dentro da de outra partilha a mesma raiz) e cada raiz é percorrida uma
+só vez, com os padrões de todas as regras a seguir a descida. Cada
+ficheiro pertence à primeira regra que o aceita. O resultado traz um
+relatório por regra (ficheiros, espaço libertado, erros e tempo gasto).
+
+As regras do utilizador (JSON, ver `load_rules`) juntam-se às
+predefinidas e substituem as que tenham o mesmo `id`.
+"""
+
+import errno
+import fnmatch
+import json
+import os
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field, fields
+
+from cleanup import CleanupStats
+from fswalk import is_reparse_point
+
+DAY = 24 * 60 * 60
+_GLOB_CHARS = re.compile(r"[*?\[]")
+_ENV_VAR = re.compile(r"%([^%]+)%")
+_CASE_FLAGS = re.IGNORECASE if os.name == "nt" else 0
+
+
+@dataclass(frozen=True)
+class CleanupRule:
+    id: str
+    name: str
+    # Pastas onde a regra se aplica, por exemplo "%LOCALAPPDATA%\\Google\\Chrome\\User Data\\*\\Cache"
+    roots: tuple
+    include: tuple = ("*",)
+    exclude: tuple = ()
+    min_age_days: float = 0.0
+    min_size: int = 0
+    # Falso: só os ficheiros diretamente nas pastas da regra
+    recursive: bool = True
+    # Apaga as subpastas que ficarem vazias (nunca as pastas da própria regra)
+    remove_empty_dirs: bool = False
+    enabled: bool = True
+    description: str = ""
+
+
+_BROWSER_CACHES = ("Cache", "Code Cache", "GPUCache")
+
+DEFAULT_RULES = (
+    CleanupRule(
+        "temp", "Temporários do utilizador", ("%TEMP%",), min_age_days=1, remove_empty_dirs=True,
+        description="Ficheiros da pasta TEMP com mais de um dia (os recentes podem estar em uso).",
+    ),
+    CleanupRule(
+        "windows_temp", "Temporários do Windows", ("%SystemRoot%\\Temp",), min_age_days=1, remove_empty_dirs=True,
+        description="Pasta Temp do sistema (precisa de administrador).",
+    ),
+    CleanupRule(
+        "chrome_cache", "Cache do Google Chrome",
+        tuple(f"%LOCALAPPDATA%\\Google\\Chrome\\User Data\\*\\{name}" for name in _BROWSER_CACHES),
+        remove_empty_dirs=True, description="Cache de todos os perfis do Chrome (feche o browser antes).",
+    ),
+    CleanupRule(
+        "edge_cache", "Cache do Microsoft Edge",
+        tuple(f"%LOCALAPPDATA%\\Microsoft\\Edge\\User Data\\*\\{name}" for name in _BROWSER_CACHES),
+        remove_empty_dirs=True, description="Cache de todos os perfis do Edge (feche o browser antes).",
+    ),
+    CleanupRule(
+        "firefox_cache", "Cache do Firefox", ("%LOCALAPPDATA%\\Mozilla\\Firefox\\Profiles\\*\\cache2",),
+        remove_empty_dirs=True, description="Cache de todos os perfis do Firefox (feche o browser antes).",
+    ),
+    CleanupRule(
+        "app_caches", "Caches de aplicações",
+        (
+            "%LOCALAPPDATA%\\Microsoft\\Windows\\INetCache",
+            "%LOCALAPPDATA%\\D3DSCache",
+            "%LOCALAPPDATA%\\NVIDIA\\DXCache",
+            "%APPDATA%\\discord\\Cache",
+            "%APPDATA%\\Code\\Cache",
+            "%APPDATA%\\Code\\CachedData",
+            "%APPDATA%\\Microsoft\\Teams\\Cache",
+        ),
+        min_age_days=1, remove_empty_dirs=True,
+        description="Caches que as aplicações voltam a criar quando precisam.",
+    ),
+    CleanupRule(
+        "crash_dumps", "Despejos de falhas",
+        ("%LOCALAPPDATA%\\CrashDumps", "%SystemRoot%\\Minidump"), include=("*.dmp", "*.mdmp"),
+        description="Ficheiros .dmp deixados por programas que falharam.",
+    ),
+    CleanupRule(
+        "error_reports", "Relatórios de erros do Windows",
+        ("%ProgramData%\\Microsoft\\Windows\\WER\\ReportArchive", "%ProgramData%\\Microsoft\\Windows\\WER\\ReportQueue"),
+        remove_empty_dirs=True, description="Relatórios já enviados ou por enviar à Microsoft.",
+    ),
+    CleanupRule(
+        "old_logs", "Registos (logs) antigos",
+        ("%LOCALAPPDATA%", "%SystemRoot%\\Logs"), include=("*.log", "*.log.[0-9]*", "*.etl"), min_age_days=30,
+        enabled=False, description="Ficheiros de registo com mais de 30 dias em todas as aplicações.",
+    ),
+)
+
+
+# --- REGRAS DO UTILIZADOR ---
+_RULE_FIELDS = {f.name for f in fields(CleanupRule)}
+
+
+def rule_from_dict(data):
+    unknown = set(data) - _RULE_FIELDS
+    if unknown:
+        raise ValueError(f"Campos desconhecidos na regra {data.get('id', '?')}: {', '.join(sorted(unknown))}")
+    values = dict(data)
+    for name in ("roots", "include", "exclude"):
+        if isinstance(values.get(name), str):
+            values[name] = (values[name],)
+        elif name in values:
+            values[name] = tuple(values[name])
+    return CleanupRule(**values)
+
+
+def load_rules(path, defaults=DEFAULT_RULES):
+    """ Regras predefinidas mais as do ficheiro JSON `path` (uma lista de objetos com os campos de `CleanupRule`). """
+    rules = {rule.id: rule for rule in defaults}
+    if path and os.path.exists(path):
+        with open(path, 'r', encoding='utf-8') as f:
+            for data in json.load(f):
+                rule = rule_from_dict(data)
+                rules[rule.id] = rule
+    return list(rules.values())
+
+
+# --- COMPILAÇÃO ---
+def expand_root(root, environ=None):
+    """ Substitui as %VARIÁVEIS% de `root` (None se alguma não existir). """
+    environ = os.environ if environ is None else environ
+    missing = []
+
+    def replace(match):
+        value = environ.get(match.group(1))
+        if not value:
+            missing.append(match.group(1))
+            return ""
+        return value
+
+    expanded = _ENV_VAR.sub(replace, root)
+    if missing:
+        return None
+    return os.path.normpath(expanded.replace("\\", os.sep).replace("/", os.sep))
+
+
+def _split_root(path):
+    """ Divide uma pasta expandida na parte fixa (a percorrer) e nos componentes com padrões. """
+    parts = path.split(os.sep)
+    for index, part in enumerate(parts):
+        if _GLOB_CHARS.search(part):
+            break
+    else:
+        index = len(parts)
+    base = os.sep.join(parts[:index]) or os.sep
+    if base.endswith(":"):
+        base += os.sep
+    return base, parts[index:]
+
+
+def _name_pattern(patterns):
+    if not patterns:
+        return None
+    return re.compile("|".join(f"(?:{fnmatch.translate(pattern)})" for pattern in patterns), _CASE_FLAGS)
+
+
+@dataclass
+class RuleReport:
+    rule_id: str
+    name: str
+    files: int = 0
+    bytes_freed: int = 0
+    dirs_removed: int = 0
+    errors: int = 0
+    # Tempo a avaliar os padrões da regra e a apagar os seus ficheiros (somado entre threads)
+    match_seconds: float = 0.0
+    delete_seconds: float = 0.0
+
+    @property
+    def seconds(self):
+        return self.match_seconds + self.delete_seconds
+
+
+@dataclass
+class RuleCleanupResult:
+    reports: list = field(default_factory=list)
+    stats: CleanupStats = None
+    # Pastas percorridas (uma por grupo de regras)
+    roots: list = field(default_factory=list)
+    dirs_scanned: int = 0
+    walk_seconds: float = 0.0
+
+
+class _CompiledRule:
+    __slots__ = ("index", "rule", "include", "exclude", "max_mtime", "min_size")
+
+    def __init__(self, index, rule, now):
+        self.index = index
+        self.rule = rule
+        self.include = _name_pattern(rule.include)
+        self.exclude = _name_pattern(rule.exclude)
+        self.max_mtime = now - rule.min_age_days * DAY if rule.min_age_days > 0 else None
+        self.min_size = rule.min_size
+
+    def accepts_name(self, name):
+        if self.include is not None and not self.include.match(name):
+            return False
+        return self.exclude is None or not self.exclude.match(name)
+
+
+# --- LIMPEZA ---
+class RuleCleaner:
+    """ Aplica `rules` numa travessia por raiz; `run()` devolve um `RuleCleanupResult`.
+
+    `progress_callback` recebe `CleanupStats` com os totais, no máximo a cada
+    `progress_interval` segundos. Em `dry_run` só conta o que seria apagado.
+    """
+
+    def __init__(self, rules, max_workers=8, dry_run=False, progress_callback=None,
+                 progress_interval=0.1, environ=None, now=None):
+        now = time.time() if now is None else now
+        self.rules = [_CompiledRule(index, rule, now) for index, rule in enumerate(rules)]
+        self.max_workers = max(1, max_workers)
+        self.dry_run = dry_run
+        self.progress_callback = progress_callback
+        self.progress_interval = progress_interval
+        self.roots = self._plan(environ)
+
+        self._cancel_event = threading.Event()
+        self._lock = threading.Lock()
+        self._stats = CleanupStats(dry_run=dry_run)
+        self._reports = [RuleReport(rule.id, rule.name) for rule in rules]
+        # Só a thread que percorre as pastas avalia os padrões: este tempo dispensa o lock
+        self._match_seconds = [0.0] * len(self.rules)
+        self._last_report = 0.0
+        self._in_flight = threading.BoundedSemaphore(self.max_workers * 4)
+
+    def cancel(self):
+        self._cancel_event.set()
+
+    @property
+    def cancelled(self):
+        return self._cancel_event.is_set()
+
+    def _plan(self, environ):
+        """ {raiz: [(regra, componentes em falta)]}, com as raízes aninhadas juntas na de cima. """
+        entries = []
+        for compiled in self.rules:
+            for root in compiled.rule.roots:
+                path = expand_root(root, environ)
+                if path is not None:
+                    base, patterns = _split_root(path)
+                    entries.append((base, compiled, patterns))
+
+        roots = {}
+        # As raízes mais curtas primeiro: uma pasta dentro de outra já planeada junta-se a ela
+        for base, compiled, patterns in sorted(entries, key=lambda entry: len(entry[0])):
+            key = os.path.normcase(base)
+            for root_key in roots:
+                prefix = os.path.join(root_key, "")
+                if key == root_key or key.startswith(prefix):
+                    relative = base[len(root_key):].strip(os.sep)
+                    literals = [re.escape(part) for part in relative.split(os.sep) if part]
+                    break
+            else:
+                root_key, literals = key, []
+                roots[root_key] = (base, [])
+            components = tuple(re.compile(part, _CASE_FLAGS) for part in literals) + tuple(
+                re.compile(fnmatch.translate(pattern), _CASE_FLAGS) for pattern in patterns)
+            roots[root_key][1].append((compiled, components))
+        return [(base, states) for base, states in roots.values()]
+
+    def run(self):
+        start = time.perf_counter()
+        directories = []
+        dirs_scanned = 0
+        with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="rule-cleanup") as pool:
+            for base, states in self.roots:
+                pending = [(compiled, components) for compiled, components in states if components]
+                active = sorted((compiled for compiled, components in states if not components),
+                                key=lambda compiled: compiled.index)
+                stack = [(base, pending, active)]
+                while stack and not self.cancelled:
+                    path, pending, active = stack.pop()
+                    dirs_scanned += 1
+                    self._scan_directory(path, pending, active, pool, stack, directories)
+        walk_seconds = time.perf_counter() - start
+
+        # Filhos antes dos pais: a ordem inversa da descoberta
+        if not self.cancelled and not self.dry_run:
+            for path, compiled in reversed(directories):
+                self._remove_directory(path, compiled)
+
+        with self._lock:
+            self._stats.cancelled = self.cancelled
+            self._stats.elapsed = time.perf_counter() - start
+            stats = CleanupStats(**vars(self._stats))
+            reports = [RuleReport(**vars(report)) for report in self._reports]
+        for report, seconds in zip(reports, self._match_seconds):
+            report.match_seconds = seconds
+        self._report(force=True)
+        return RuleCleanupResult(reports=reports, stats=stats, roots=[base for base, _ in self.roots],
+                                 dirs_scanned=dirs_scanned, walk_seconds=walk_seconds)
+
+    def _scan_directory(self, path, pending, active, pool, stack, directories):
+        try:
+            with os.scandir(path) as entries:
+                for entry in entries:
+                    if self.cancelled:
+                        return
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            # Junções (NTFS) e links para pastas não são seguidos
+                            if is_reparse_point(entry):
+                                continue
+                            self._descend(entry, pending, active, stack, directories)
+                            continue
+                        if active:
+                            self._match_file(entry, active, pool)
+                    except OSError:
+                        self._record(errors=1)
+        except OSError as e:
+            # Pastas de regras que não existem nesta máquina não são erros
+            if e.errno != errno.ENOENT:
+                self._record(errors=1)
+
+    def _descend(self, entry, pending, active, stack, directories):
+        name = entry.name
+        child_pending, child_active = [], [compiled for compiled in active if compiled.rule.recursive]
+        for compiled, components in pending:
+            if components[0].match(name):
+                if len(components) > 1:
+                    child_pending.append((compiled, components[1:]))
+                else:
+                    child_active.append(compiled)
+        if not child_pending and not child_active:
+            return
+        if len(child_active) > 1:
+            child_active.sort(key=lambda compiled: compiled.index)
+        stack.append((entry.path, child_pending, child_active))
+        # Só as subpastas de uma regra já ativa podem ser removidas (nunca a pasta da regra)
+        for compiled in active:
+            if compiled.rule.recursive and compiled.rule.remove_empty_dirs:
+                directories.append((entry.path, compiled))
+                break
+
+    def _match_file(self, entry, active, pool):
+        stat = None
+        for compiled in active:
+            started = time.perf_counter()
+            matched = compiled.accepts_name(entry.name)
+            if matched and (compiled.max_mtime is not None or compiled.min_size):
+                stat = stat or entry.stat(follow_symlinks=False)
+                matched = ((compiled.max_mtime is None or stat.st_mtime <= compiled.max_mtime)
+                           and stat.st_size >= compiled.min_size)
+            self._match_seconds[compiled.index] += time.perf_counter() - started
+            if not matched:
+                continue
+            size = (stat or entry.stat(follow_symlinks=False)).st_size
+            if self.dry_run:
+                self._record(compiled.index, files=1, bytes_freed=size)
+            else:
+                self._in_flight.acquire()
+                future = pool.submit(self._remove_file, entry.path, size, compiled.index)
+                future.add_done_callback(lambda _: self._in_flight.release())
+            return
+
+    def _remove_file(self, path, size, rule_index):
+        if self.cancelled:
+            return
+        started = time.perf_counter()
+        try:
+            os.unlink(path)
+        except FileNotFoundError:
+            return
+        except OSError:
+            # Ficheiro em uso ou sem permissão: fica para a próxima limpeza
+            self._record(rule_index, errors=1, seconds=time.perf_counter() - started)
+            return
+        self._record(rule_index, files=1, bytes_freed=size, seconds=time.perf_counter() - started)
+
+    def _remove_directory(self, path, compiled):
+        try:
+            os.rmdir(path)
+        except FileNotFoundError:
+            return
+        except OSError as e:
+            if e.errno not in (errno.ENOTEMPTY, errno.EEXIST):
+                self._record(compiled.index, errors=1)
+            return
+        self._record(compiled.index, dirs=1)
+
+    def _record(self, rule_index=None, files=0, bytes_freed=0, dirs=0, errors=0, seconds=0.0):
+        with self._lock:
+            self._stats.items += files + dirs
+            self._stats.bytes_freed += bytes_freed
+            self._stats.errors += errors
+            if rule_index is not None:
+                report = self._reports[rule_index]
+                report.files += files
+                report.bytes_freed += bytes_freed
+                report.dirs_removed += dirs
+                report.errors += errors
+                report.delete_seconds += seconds
+        self._report()
+
+    def _report(self, force=False):
+        if not self.progress_callback:
+            return
+        now = time.monotonic()
+        with self._lock:
+            if not force and now - self._last_report < self.progress_interval:
+                return
+            self._last_report = now
+            snapshot = CleanupStats(**vars(self._stats))
+        self.progress_callback(snapshot)
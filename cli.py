@@ -0,0 +1,312 @@
+"""
+PC Control Hub - cli.py
+
+Modo de linha de comandos, sem interface: corre as mesmas funções de
+tarefa da janela (workers.py) na thread principal e escreve o resultado
+em JSON no stdout, para scripts e para gerir várias máquinas.
+
+Nunca importa o PySide6 (nem pede elevação como o `main.py`), por isso
+cada chamada arranca em poucas dezenas de milissegundos.
+
+Uso:
+    python cli.py cleanup [--dir PASTA] [--dry-run]
+    python cli.py rules list
+    python cli.py rules run [--only ID ...] [--all] [--dry-run]
+    python cli.py startup list
+    python cli.py startup backup [--name NOME]
+    python cli.py startup snapshots
+    python cli.py duplicates PASTA [PASTA ...] [--min-size 1]
+    python cli.py usage PASTA [--top 20] [--max-nodes 500000]
+    python cli.py metrics [--interval 0.5]
+    python cli.py ip [--provider URL ...] [--timeout 3]
+    python cli.py speedtest [--url URL] [--streams 4] [--duration 8]
+    python cli.py ping 1.1.1.1 google.com:443 [--method ping] [--count 4]
+
+Códigos de saída: 0 sucesso, 1 erro (o JSON traz `"error"`), 130 interrompido.
+Com `--progress`, o progresso das tarefas sai em linhas JSON no stderr.
+"""
+
+import argparse
+import dataclasses
+import json
+import os
+import sys
+import time
+
+from cancellation import InlineJob, JobCancelled
+from probes import ProbeResult, parse_targets, METHOD_TCP, METHOD_PING
+
+EXIT_OK, EXIT_ERROR, EXIT_INTERRUPTED = 0, 1, 130
+
+
+# --- CONVERSÃO PARA JSON ---
+def to_json(value):
+    """ Converte os resultados das tarefas (dataclasses, tuplos, conjuntos...) em tipos JSON. """
+    if isinstance(value, ProbeResult):
+        data = dataclasses.asdict(value)
+        data.update(
+            received=value.received, loss_percent=value.loss_percent, min_ms=value.min_ms,
+            avg_ms=value.avg_ms, max_ms=value.max_ms, p95_ms=value.p95_ms, jitter_ms=value.jitter_ms,
+        )
+        return data
+    if dataclasses.is_dataclass(value) and not isinstance(value, type):
+        return {f.name: to_json(getattr(value, f.name)) for f in dataclasses.fields(value)}
+    if isinstance(value, dict):
+        return {str(key): to_json(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple, set, frozenset)):
+        return [to_json(item) for item in value]
+    return value
+
+
+def _emit(payload, stream, pretty=False):
+    json.dump(to_json(payload), stream, ensure_ascii=False, indent=2 if pretty else None)
+    stream.write("\n")
+    stream.flush()
+
+
+# --- COMANDOS ---
+# Cada comando recebe os argumentos e um `InlineJob` e devolve o que vai para o JSON.
+def cmd_cleanup(args, job):
+    from utils import open_size_index
+    from workers import cleanup_job
+
+    target_dir = args.dir or os.environ.get('TEMP') or os.environ.get('TMP')
+    if not target_dir:
+        raise RuntimeError("Não foi possível encontrar a pasta TEMP.")
+    stats = job.run(cleanup_job, target_dir, dry_run=args.dry_run, max_workers=args.workers,
+                    size_index=open_size_index())
+    return {"target_dir": target_dir, **to_json(stats)}
+
+
+def cmd_rules_list(args, job):
+    from utils import open_cleanup_rules
+    from cleanup_rules import expand_root
+
+    return [
+        {**to_json(rule), "expanded_roots": [expand_root(root) for root in rule.roots]}
+        for rule in open_cleanup_rules()
+    ]
+
+
+def cmd_rules_run(args, job):
+    from utils import open_cleanup_rules
+    from workers import rule_cleanup_job
+
+    rules = open_cleanup_rules()
+    if args.only:
+        unknown = set(args.only) - {rule.id for rule in rules}
+        if unknown:
+            raise RuntimeError(f"Regras desconhecidas: {', '.join(sorted(unknown))}")
+        rules = [rule for rule in rules if rule.id in args.only]
+    elif not args.all:
+        rules = [rule for rule in rules if rule.enabled]
+    result = job.run(rule_cleanup_job, rules, dry_run=args.dry_run, max_workers=args.workers)
+    data = to_json(result)
+    for report, entry in zip(result.reports, data["reports"]):
+        entry["seconds"] = report.seconds
+    return data
+
+
+def cmd_startup_list(args, job):
+    from utils import open_startup_scanner
+    from workers import startup_list_job
+
+    result = job.run(startup_list_job, open_startup_scanner())
+    return {"count": len(result.entries), **to_json(result)}
+
+
+def cmd_startup_backup(args, job):
+    from utils import open_startup_scanner, open_snapshot_store
+    from workers import startup_list_job, startup_backup_job
+
+    entries = job.run(startup_list_job, open_startup_scanner()).entries
+    return job.run(startup_backup_job, open_snapshot_store(), entries, name=args.name)
+
+
+def cmd_startup_snapshots(args, job):
+    from utils import open_snapshot_store, LEGACY_STARTUP_BACKUP
+    from workers import startup_snapshots_job
+
+    return job.run(startup_snapshots_job, open_snapshot_store(), LEGACY_STARTUP_BACKUP)
+
+
+def cmd_duplicates(args, job):
+    from utils import open_hash_cache
+    from workers import duplicate_scan_job
+
+    result = job.run(duplicate_scan_job, args.roots, open_hash_cache(), int(args.min_size * 1024 * 1024))
+    return {"reclaimable": result.reclaimable, **to_json(result)}
+
+
+def cmd_usage(args, job):
+    from disk_tree import DiskScanner, DiskTree, NO_NODE
+    from workers import disk_scan_job
+
+    scanner = DiskScanner(args.root, max_nodes=args.max_nodes, top=args.top, same_device=not args.cross_devices)
+    result = job.run(disk_scan_job, scanner)
+    tree = result.tree
+    return {
+        "root": tree.root_path,
+        "total_bytes": tree.total_bytes[DiskTree.ROOT],
+        "total_files": tree.total_files[DiskTree.ROOT],
+        "cancelled": result.cancelled,
+        "elapsed": result.elapsed,
+        "tree_memory_bytes": tree.memory_bytes(),
+        "progress": result.progress,
+        "largest": [
+            {"path": tree.path(item.node) if item.node != NO_NODE else item.name, "bytes": item.bytes, "files": item.files}
+            for item in tree.top_items(DiskTree.ROOT, args.top)
+        ],
+        "largest_files": [{"path": path, "bytes": size} for size, path in result.largest_files],
+    }
+
+
+def cmd_metrics(args, job):
+    import psutil
+    from disks import DiskMonitor
+    from metrics import collect_sample, DEFAULT_DISK_PATH
+
+    # A percentagem de CPU é medida entre duas leituras: a primeira só marca o início
+    psutil.cpu_percent(interval=None, percpu=True)
+    time.sleep(max(0.0, args.interval))
+    sample = collect_sample(args.disk or DEFAULT_DISK_PATH)
+    monitor = DiskMonitor()
+    try:
+        partitions = monitor.usage()
+    finally:
+        monitor.close()
+    return {"sample": sample, "partitions": partitions}
+
+
+def cmd_ping(args, job):
+    from workers import probe_job
+
+    targets = parse_targets(" ".join(args.targets))
+    if not targets:
+        raise RuntimeError("Nenhum destino indicado.")
+    results = job.run(probe_job, targets, method=args.method, count=args.count,
+                      interval=args.interval, timeout=args.timeout)
+    return {
+        "method": args.method,
+        "reachable": sum(1 for result in results if result.received),
+        "results": results,
+    }
+
+
+def cmd_ip(args, job):
+    from ip_resolver import PublicIPResolver, DEFAULT_PROVIDERS
+    from workers import ip_info_job
+
+    resolver = PublicIPResolver(args.provider or DEFAULT_PROVIDERS, timeout=args.timeout)
+    try:
+        return job.run(ip_info_job, resolver)
+    finally:
+        resolver.close()
+
+
+def cmd_speedtest(args, job):
+    from workers import speedtest_job
+
+    result = job.run(speedtest_job, args.url, args.upload_url, streams=args.streams,
+                     duration=args.duration, warmup=args.warmup)
+    data = to_json(result)
+    if not args.samples:
+        for phase in (data["download"], data["upload"]):
+            if phase is not None:
+                del phase["samples"]
+    return data
+
+
+# --- ARGUMENTOS ---
+def build_parser():
+    parser = argparse.ArgumentParser(prog="cli.py", description="PC Control Hub sem interface (resultados em JSON).")
+    parser.add_argument("--pretty", action="store_true", help="JSON indentado")
+    parser.add_argument("--progress", action="store_true", help="progresso em linhas JSON no stderr")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    cleanup = commands.add_parser("cleanup", help="limpa a pasta de temporários")
+    cleanup.add_argument("--dir", help="pasta a limpar (padrão: %%TEMP%%)")
+    cleanup.add_argument("--dry-run", action="store_true", help="só conta o que seria apagado")
+    cleanup.add_argument("--workers", type=int, default=8)
+    cleanup.set_defaults(handler=cmd_cleanup)
+
+    rules = commands.add_parser("rules", help="limpeza por regras (caches, registos antigos, despejos...)")
+    rules_commands = rules.add_subparsers(dest="action", required=True)
+    rules_commands.add_parser("list", help="lista as regras e as pastas de cada uma").set_defaults(handler=cmd_rules_list)
+    rules_run = rules_commands.add_parser("run", help="aplica as regras numa só travessia por pasta")
+    rules_run.add_argument("--only", action="append", metavar="ID", help="só esta regra (pode repetir)")
+    rules_run.add_argument("--all", action="store_true", help="inclui as regras desativadas por omissão")
+    rules_run.add_argument("--dry-run", action="store_true", help="só conta o que seria apagado")
+    rules_run.add_argument("--workers", type=int, default=8)
+    rules_run.set_defaults(handler=cmd_rules_run)
+
+    startup = commands.add_parser("startup", help="Gestor de Arranque")
+    startup_commands = startup.add_subparsers(dest="action", required=True)
+    startup_commands.add_parser("list", help="lista os programas de arranque").set_defaults(handler=cmd_startup_list)
+    backup = startup_commands.add_parser("backup", help="guarda o estado atual no histórico")
+    backup.add_argument("--name", help="nome do estado (padrão: data e hora)")
+    backup.set_defaults(handler=cmd_startup_backup)
+    startup_commands.add_parser("snapshots", help="lista os estados guardados").set_defaults(handler=cmd_startup_snapshots)
+
+    duplicates = commands.add_parser("duplicates", help="ficheiros grandes e duplicados")
+    duplicates.add_argument("roots", nargs="+", help="pastas a analisar")
+    duplicates.add_argument("--min-size", type=float, default=1.0, help="tamanho mínimo em MB")
+    duplicates.set_defaults(handler=cmd_duplicates)
+
+    usage = commands.add_parser("usage", help="onde está o espaço ocupado numa pasta ou disco")
+    usage.add_argument("root", help="pasta a analisar")
+    usage.add_argument("--top", type=int, default=20, help="subpastas e ficheiros maiores a listar")
+    usage.add_argument("--max-nodes", type=int, default=500_000, help="pastas com nó próprio (limite de memória)")
+    usage.add_argument("--cross-devices", action="store_true", help="entrar noutros sistemas de ficheiros montados")
+    usage.set_defaults(handler=cmd_usage)
+
+    metrics = commands.add_parser("metrics", help="instantâneo de CPU, RAM e discos")
+    metrics.add_argument("--interval", type=float, default=0.5, help="janela da medição de CPU, em segundos")
+    metrics.add_argument("--disk", help="unidade do uso de disco principal (padrão: a do Monitor)")
+    metrics.set_defaults(handler=cmd_metrics)
+
+    ip = commands.add_parser("ip", help="IPs locais de todas as interfaces e IP público")
+    ip.add_argument("--provider", action="append", help="serviço de IP público (pode repetir; padrão: vários conhecidos)")
+    ip.add_argument("--timeout", type=float, default=3.0, help="prazo de cada pedido, em segundos")
+    ip.set_defaults(handler=cmd_ip)
+
+    speed = commands.add_parser("speedtest", help="teste de velocidade com várias ligações em paralelo")
+    speed.add_argument("--url", help="servidor próprio: GET para download, POST para upload (padrão: Ookla)")
+    speed.add_argument("--upload-url", help="URL do upload, se for diferente de --url")
+    speed.add_argument("--streams", type=int, default=4, help="ligações em paralelo")
+    speed.add_argument("--duration", type=float, default=8.0, help="segundos medidos por fase")
+    speed.add_argument("--warmup", type=float, default=2.0, help="segundos iniciais descartados por fase")
+    speed.add_argument("--samples", action="store_true", help="inclui as amostras de 100 ms")
+    speed.set_defaults(handler=cmd_speedtest)
+
+    ping = commands.add_parser("ping", help="testes de latência (vários destinos em simultâneo)")
+    ping.add_argument("targets", nargs="+", help="destinos (host ou host:porta)")
+    ping.add_argument("--method", choices=(METHOD_TCP, METHOD_PING), default=METHOD_TCP)
+    ping.add_argument("--count", type=int, default=4)
+    ping.add_argument("--interval", type=float, default=0.5)
+    ping.add_argument("--timeout", type=float, default=2.0)
+    ping.set_defaults(handler=cmd_ping)
+    return parser
+
+
+def main(argv=None, stdout=None, stderr=None):
+    stdout = stdout or sys.stdout
+    stderr = stderr or sys.stderr
+    args = build_parser().parse_args(argv)
+    on_progress = (lambda payload: _emit({"progress": payload}, stderr)) if args.progress else None
+    job = InlineJob(name=args.command, on_progress=on_progress)
+    try:
+        result = args.handler(args, job)
+    except (KeyboardInterrupt, JobCancelled):
+        job.cancel()
+        _emit({"error": "interrompido"}, stdout, args.pretty)
+        return EXIT_INTERRUPTED
+    except Exception as e:
+        _emit({"error": str(e) or type(e).__name__}, stdout, args.pretty)
+        return EXIT_ERROR
+    _emit(result, stdout, args.pretty)
+    return EXIT_OK
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,357 @@
+"""
+PC Control Hub - disk_tree.py
+
+Analisador de espaço em disco: mostra onde está ocupado o espaço de uma
+pasta (ou de um disco inteiro).
+
+As pastas são listadas em paralelo com `os.scandir` e os tamanhos somados
+numa árvore guardada em arrays (`DiskTree`): um índice por pasta e uma
+coluna `array` por campo, em vez de um dicionário Python por nó. Os
+ficheiros não ficam guardados, só entram nos totais da pasta (e os
+`top` maiores numa lista à parte), por isso a memória depende do número
+de pastas e não do de ficheiros. Acima de `max_nodes` pastas, as mais
+fundas deixam de ter nó próprio e são somadas à pasta mãe.
+
+A árvore pode ser lida (com `tree.lock`) enquanto a análise decorre, o
+que permite desenhar o mapa e a lista dos maiores à medida que chegam.
+"""
+
+import heapq
+import os
+import threading
+import time
+from array import array
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from dataclasses import dataclass, field
+
+from fswalk import is_reparse_point
+
+DEFAULT_MAX_NODES = 500_000
+DEFAULT_TOP_FILES = 100
+
+NO_NODE = -1
+# Bits de `DiskTree.flags`
+COLLAPSED = 1   # tem subpastas sem nó próprio (limite de memória), somadas a esta
+UNREADABLE = 2  # não foi possível listar a pasta
+
+
+@dataclass(frozen=True)
+class DiskItem:
+    """ Uma linha da vista: uma subpasta (`node`) ou um agregado sem nó ("ficheiros nesta pasta", "outras"). """
+    node: int
+    name: str
+    bytes: int
+    files: int
+    is_dir: bool = True
+
+
+@dataclass
+class DiskScanProgress:
+    dirs_scanned: int = 0
+    files_scanned: int = 0
+    bytes_scanned: int = 0
+    nodes: int = 1
+    collapsed_dirs: int = 0
+    # Outros sistemas de ficheiros, junções e links para pastas que não foram percorridos
+    skipped_mounts: int = 0
+    errors: int = 0
+    done: bool = False
+
+
+@dataclass
+class DiskScanResult:
+    tree: "DiskTree"
+    # Os maiores ficheiros (tamanho, caminho), do maior para o menor
+    largest_files: list = field(default_factory=list)
+    progress: DiskScanProgress = None
+    cancelled: bool = False
+    elapsed: float = 0.0
+
+
+# --- ÁRVORE EM ARRAYS ---
+class DiskTree:
+    """ Pastas em arrays paralelos; o nó 0 é a raiz. Os filhos formam uma lista ligada (`first_child`/`next_sibling`). """
+
+    ROOT = 0
+
+    def __init__(self, root_path):
+        self.root_path = root_path
+        self.lock = threading.Lock()
+        self.names = [root_path]
+        self.parent = array('i', [NO_NODE])
+        self.first_child = array('i', [NO_NODE])
+        self.next_sibling = array('i', [NO_NODE])
+        self.own_bytes = array('q', [0])
+        self.total_bytes = array('q', [0])
+        self.total_files = array('q', [0])
+        self.flags = bytearray(1)
+
+    def __len__(self):
+        return len(self.parent)
+
+    def add_dir(self, parent, name):
+        node = len(self.parent)
+        self.names.append(name)
+        self.parent.append(parent)
+        self.first_child.append(NO_NODE)
+        self.next_sibling.append(self.first_child[parent])
+        self.own_bytes.append(0)
+        self.total_bytes.append(0)
+        self.total_files.append(0)
+        self.flags.append(0)
+        # O filho só fica visível depois de completo (leituras sem `lock` nunca veem um nó a meio)
+        self.first_child[parent] = node
+        return node
+
+    def add_files(self, node, size, count):
+        """ Soma ficheiros diretamente em `node` e atualiza os totais de todos os antecessores. """
+        self.own_bytes[node] += size
+        while node != NO_NODE:
+            self.total_bytes[node] += size
+            self.total_files[node] += count
+            node = self.parent[node]
+
+    def children(self, node):
+        child = self.first_child[node]
+        while child != NO_NODE:
+            yield child
+            child = self.next_sibling[child]
+
+    def path(self, node):
+        parts = []
+        while node > self.ROOT:
+            parts.append(self.names[node])
+            node = self.parent[node]
+        return os.path.join(self.root_path, *reversed(parts))
+
+    def top_items(self, node, limit=100):
+        """ As `limit` maiores subpastas de `node`, mais os ficheiros da própria pasta e o resto agregado. """
+        with self.lock:
+            children = [(self.total_bytes[child], child) for child in self.children(node)]
+            largest = heapq.nlargest(limit, children)
+            items = [DiskItem(child, self.names[child], size, self.total_files[child]) for size, child in largest]
+            own_files = self.total_files[node] - sum(self.total_files[child] for _, child in children)
+            own_bytes = self.own_bytes[node]
+            collapsed = self.flags[node] & COLLAPSED
+            rest = len(children) - len(largest)
+            if rest:
+                rest_bytes = sum(size for size, _ in children) - sum(item.bytes for item in items)
+                rest_files = sum(self.total_files[child] for _, child in children) - sum(item.files for item in items)
+                items.append(DiskItem(NO_NODE, f"(outras {rest} pastas)", rest_bytes, rest_files))
+        if own_bytes or own_files:
+            name = "(ficheiros nesta pasta e subpastas agregadas)" if collapsed else "(ficheiros nesta pasta)"
+            items.append(DiskItem(NO_NODE, name, own_bytes, own_files, is_dir=False))
+        items.sort(key=lambda item: item.bytes, reverse=True)
+        return items
+
+    def memory_bytes(self):
+        """ Memória aproximada da árvore (arrays e nomes). """
+        arrays = (self.parent, self.first_child, self.next_sibling, self.own_bytes, self.total_bytes, self.total_files)
+        return (sum(column.itemsize * len(column) for column in arrays) + len(self.flags)
+                + sum(len(name) for name in self.names) + 8 * len(self.names))
+
+
+# --- ANÁLISE ---
+class DiskScanner:
+    """ `run()` percorre `root` e devolve um `DiskScanResult`; a árvore (`self.tree`) existe desde o início.
+
+    `on_progress(DiskScanProgress)` é chamado no máximo a cada `progress_interval` segundos.
+    Com `same_device=True` não entra noutros sistemas de ficheiros montados dentro de `root`.
+    Links para pastas e junções nunca são percorridos; no Windows, um volume montado numa
+    pasta também é uma junção, por isso fica de fora mesmo sem comparar `st_dev`.
+    """
+
+    def __init__(self, root, max_workers=8, max_nodes=DEFAULT_MAX_NODES, top=DEFAULT_TOP_FILES,
+                 same_device=True, on_progress=None, progress_interval=0.2):
+        self.root = os.path.abspath(root)
+        self.tree = DiskTree(self.root)
+        self.max_workers = max(1, max_workers)
+        self.max_nodes = max(1, max_nodes)
+        self.top = top
+        self.same_device = same_device
+        self.on_progress = on_progress
+        self.progress_interval = progress_interval
+        self._cancel_event = threading.Event()
+        self._progress = DiskScanProgress()
+        self._last_report = 0.0
+        self._largest = []
+        # Tamanho mínimo para um ficheiro entrar na lista dos maiores (lido pelas threads sem lock)
+        self._top_threshold = 0
+        self._root_device = 0
+
+    def cancel(self):
+        self._cancel_event.set()
+
+    @property
+    def cancelled(self):
+        return self._cancel_event.is_set()
+
+    def run(self):
+        start = time.perf_counter()
+        try:
+            device = os.stat(self.root).st_dev
+        except OSError as e:
+            raise FileNotFoundError(f"Pasta inacessível: {self.root} ({e})") from e
+        self._root_device = device if self.same_device else 0
+        seen_links = set()
+        # Pilha (e não fila) de pastas por listar: percorrer em profundidade mantém-na pequena
+        todo = deque([(DiskTree.ROOT, self.root)])
+        with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="disk-scan") as pool:
+            running = {}
+            while (todo or running) and not self.cancelled:
+                while todo and len(running) < self.max_workers * 4:
+                    node, path = todo.pop()
+                    running[pool.submit(self._list_dir, path)] = node
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    node = running.pop(future)
+                    self._merge(node, future.result(), todo, seen_links)
+                self._report()
+            for future in running:
+                future.cancel()
+        self._progress.done = not self.cancelled
+        self._report(force=True)
+        largest = sorted(self._largest, reverse=True)
+        return DiskScanResult(tree=self.tree, largest_files=largest, progress=DiskScanProgress(**vars(self._progress)),
+                              cancelled=self.cancelled, elapsed=time.perf_counter() - start)
+
+    def _merge(self, node, listing, todo, seen_links):
+        file_bytes, file_count, subdirs, big_files, links, errors, skipped = listing
+        progress = self._progress
+        # Ficheiros com vários nomes (hard links) contam uma vez só
+        for file_id, size in links:
+            if file_id not in seen_links:
+                seen_links.add(file_id)
+                file_bytes += size
+                file_count += 1
+        tree = self.tree
+        with tree.lock:
+            if file_count:
+                tree.add_files(node, file_bytes, file_count)
+            if errors and subdirs is None:
+                tree.flags[node] |= UNREADABLE
+            for name, path in subdirs or ():
+                if len(tree) < self.max_nodes:
+                    todo.append((tree.add_dir(node, name), path))
+                else:
+                    tree.flags[node] |= COLLAPSED
+                    progress.collapsed_dirs += 1
+                    todo.append((node, path))
+            progress.nodes = len(tree)
+        progress.dirs_scanned += 1
+        progress.files_scanned += file_count
+        progress.bytes_scanned += file_bytes
+        progress.errors += errors
+        progress.skipped_mounts += skipped
+        for item in big_files:
+            if len(self._largest) < self.top:
+                heapq.heappush(self._largest, item)
+            elif item[0] > self._largest[0][0]:
+                heapq.heapreplace(self._largest, item)
+        if len(self._largest) >= self.top:
+            self._top_threshold = self._largest[0][0]
+
+    def _list_dir(self, path):
+        file_bytes, file_count, subdirs, big_files, links, errors, skipped = 0, 0, [], [], [], 0, 0
+        if self.cancelled:
+            return file_bytes, file_count, subdirs, big_files, links, errors, skipped
+        threshold = self._top_threshold
+        root_device = self._root_device
+        try:
+            with os.scandir(path) as entries:
+                for entry in entries:
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            if is_reparse_point(entry):
+                                skipped += 1
+                                continue
+                            # No Windows o `DirEntry.stat()` não preenche st_dev (fica 0): aí não se compara
+                            if root_device:
+                                device = entry.stat(follow_symlinks=False).st_dev
+                                if device and device != root_device:
+                                    skipped += 1
+                                    continue
+                            subdirs.append((entry.name, entry.path))
+                            continue
+                        stat = entry.stat(follow_symlinks=False)
+                    except OSError:
+                        errors += 1
+                        continue
+                    size = stat.st_size
+                    if stat.st_nlink > 1 and stat.st_ino and entry.is_file(follow_symlinks=False):
+                        links.append(((stat.st_dev, stat.st_ino), size))
+                    else:
+                        file_bytes += size
+                        file_count += 1
+                    if size > threshold:
+                        big_files.append((size, entry.path))
+        except OSError:
+            return file_bytes, file_count, None, big_files, links, errors + 1, skipped
+        if len(big_files) > self.top:
+            big_files = heapq.nlargest(self.top, big_files)
+        return file_bytes, file_count, subdirs, big_files, links, errors, skipped
+
+    def _report(self, force=False):
+        if self.on_progress is None:
+            return
+        now = time.monotonic()
+        if not force and now - self._last_report < self.progress_interval:
+            return
+        self._last_report = now
+        self.on_progress(DiskScanProgress(**vars(self._progress)))
+
+
+# --- MAPA (TREEMAP) ---
+def _worst_ratio(row_sum, row_max, row_min, side):
+    side2 = side * side
+    total2 = row_sum * row_sum
+    return max(side2 * row_max / total2, total2 / (side2 * row_min))
+
+
+def squarify(sizes, x, y, width, height):
+    """ Retângulos (x, y, largura, altura) para `sizes` (positivos, do maior para o menor), pela ordem dada.
+
+    Algoritmo "squarified" (Bruls, Huizing e van Wijk): as linhas crescem enquanto
+    a pior proporção dos retângulos melhorar, o que evita tiras finas.
+    """
+    rects = []
+    total = sum(sizes)
+    if total <= 0 or width <= 0 or height <= 0:
+        return [(x, y, 0.0, 0.0) for _ in sizes]
+    scale = width * height / total
+    areas = [size * scale for size in sizes]
+    i, count = 0, len(areas)
+    while i < count:
+        side = min(width, height)
+        row_sum = row_max = row_min = areas[i]
+        end = i + 1
+        while end < count:
+            area = areas[end]
+            if (_worst_ratio(row_sum + area, row_max, area, side)
+                    > _worst_ratio(row_sum, row_max, row_min, side)):
+                break
+            row_sum += area
+            row_min = area
+            end += 1
+        # A linha ocupa o lado mais curto do espaço livre
+        if width >= height:
+            thickness = row_sum / height
+            offset = y
+            for area in areas[i:end]:
+                length = area / thickness
+                rects.append((x, offset, thickness, length))
+                offset += length
+            x += thickness
+            width -= thickness
+        else:
+            thickness = row_sum / width
+            offset = x
+            for area in areas[i:end]:
+                length = area / thickness
+                rects.append((offset, y, length, thickness))
+                offset += length
+            y += thickness
+            height -= thickness
+        i = end
+    return rects
@@ -0,0 +1,172 @@
+"""
+PC Control Hub - disks.py
+
+Monitorização de todas as partições montadas e da atividade de cada
+disco físico. A lista de partições fica em cache e só é relida quando os
+pontos de montagem mudam; o débito (bytes/s) e as IOPS vêm das diferenças
+entre leituras de `psutil.disk_io_counters(perdisk=True)`.
+"""
+
+import ctypes
+import functools
+import os
+import select
+import time
+from dataclasses import dataclass, field
+
+import psutil
+
+# Dispositivos virtuais que não interessam no Linux
+_VIRTUAL_DISK_PREFIXES = ('loop', 'ram', 'zram', 'dm-')
+
+
+@dataclass(frozen=True)
+class PartitionUsage:
+    mountpoint: str
+    device: str
+    fstype: str
+    total: int
+    used: int
+    percent: float
+
+
+@dataclass(frozen=True)
+class DiskRate:
+    read_bps: float
+    write_bps: float
+    read_iops: float
+    write_iops: float
+
+
+@dataclass(frozen=True)
+class DiskSnapshot:
+    partitions: list = field(default_factory=list)
+    io: dict = field(default_factory=dict)
+
+
+class MountWatcher:
+    """ Diz se os pontos de montagem mudaram desde a última consulta, sem os listar.
+
+    Windows: máscara de unidades de `GetLogicalDrives`. Linux: `poll` em
+    `/proc/self/mounts` (o kernel assinala POLLPRI quando a tabela muda).
+    Noutros sistemas assume mudança a cada `fallback_interval` segundos.
+    """
+
+    def __init__(self, fallback_interval=30.0):
+        self.fallback_interval = fallback_interval
+        self._last_refresh = None
+        self._drive_mask = None
+        self._mounts_file = None
+        self._poller = None
+        if os.name != 'nt' and os.path.exists('/proc/self/mounts') and hasattr(select, 'poll'):
+            self._mounts_file = open('/proc/self/mounts', 'rb')
+            self._mounts_file.read()
+            self._poller = select.poll()
+            self._poller.register(self._mounts_file, select.POLLERR | select.POLLPRI)
+
+    def changed(self):
+        first = self._last_refresh is None
+        if first:
+            self._last_refresh = time.monotonic()
+
+        if os.name == 'nt':
+            try:
+                mask = ctypes.windll.kernel32.GetLogicalDrives()
+            except (AttributeError, OSError):
+                mask = None
+            changed = mask != self._drive_mask
+            self._drive_mask = mask
+            return first or changed
+
+        if self._poller is not None:
+            if self._poller.poll(0):
+                self._mounts_file.seek(0)
+                self._mounts_file.read()
+                return True
+            return first
+        now = time.monotonic()
+        if first or now - self._last_refresh >= self.fallback_interval:
+            self._last_refresh = now
+            return True
+        return False
+
+    def close(self):
+        """ Liberta o descritor de `/proc/self/mounts`; depois disto volta ao modo por intervalo. """
+        if self._mounts_file is not None:
+            self._poller.unregister(self._mounts_file)
+            self._mounts_file.close()
+            self._mounts_file = None
+            self._poller = None
+
+
+class DiskMonitor:
+    def __init__(self, mount_watcher=None):
+        self.mount_watcher = mount_watcher or MountWatcher()
+        self._partitions = []
+        self._last_counters = None
+        self._last_time = None
+
+    def partitions(self):
+        if self.mount_watcher.changed():
+            self._partitions = [
+                part for part in psutil.disk_partitions(all=False)
+                # Leitores de CD/DVD vazios dão erro em disk_usage
+                if part.fstype and 'cdrom' not in part.opts
+            ]
+        return self._partitions
+
+    def usage(self):
+        usages = []
+        for part in self.partitions():
+            try:
+                usage = psutil.disk_usage(part.mountpoint)
+            except OSError:
+                continue
+            usages.append(PartitionUsage(part.mountpoint, part.device, part.fstype,
+                                         usage.total, usage.used, usage.percent))
+        return usages
+
+    def io_rates(self):
+        """ Débito e IOPS por disco físico desde a chamada anterior (vazio na primeira). """
+        now = time.monotonic()
+        try:
+            counters = psutil.disk_io_counters(perdisk=True) or {}
+        except (RuntimeError, OSError):
+            counters = {}
+        counters = {name: c for name, c in counters.items() if _is_physical_disk(name)}
+
+        rates = {}
+        if self._last_counters is not None:
+            elapsed = now - self._last_time
+            if elapsed > 0:
+                for name, current in counters.items():
+                    previous = self._last_counters.get(name)
+                    if previous is None:
+                        continue
+                    rates[name] = DiskRate(
+                        read_bps=max(0, current.read_bytes - previous.read_bytes) / elapsed,
+                        write_bps=max(0, current.write_bytes - previous.write_bytes) / elapsed,
+                        read_iops=max(0, current.read_count - previous.read_count) / elapsed,
+                        write_iops=max(0, current.write_count - previous.write_count) / elapsed,
+                    )
+        self._last_counters = counters
+        self._last_time = now
+        return rates
+
+    def sample(self):
+        return DiskSnapshot(partitions=self.usage(), io=self.io_rates())
+
+    def close(self):
+        self.mount_watcher.close()
+
+
+@functools.lru_cache(maxsize=None)
+def _is_physical_disk(name):
+    if os.name == 'nt':
+        return True
+    if name.startswith(_VIRTUAL_DISK_PREFIXES):
+        return False
+    # No Linux o psutil devolve discos e partições; só os discos estão em /sys/block
+    if os.path.isdir('/sys/block'):
+        return os.path.exists(os.path.join('/sys/block', name))
+    return True
@@ -0,0 +1,414 @@
+"""
+PC Control Hub - duplicates.py
+
+Procura de ficheiros grandes e duplicados nas pastas escolhidas pelo
+utilizador. A comparação é feita por etapas, cada uma mais cara e com
+menos ficheiros do que a anterior:
+
+1. Listagem das pastas em paralelo e agrupamento por tamanho (só os
+   tamanhos repetidos podem ser duplicados).
+2. Hash do primeiro e do último bloco de cada candidato (threads).
+3. Hash completo só dos que coincidiram até aqui, em vários processos,
+   com leitura por `mmap`.
+
+Cada grupo de duplicados é entregue (`on_group`) logo que fica
+confirmado, começando pelos tamanhos maiores. Os hashes ficam em cache
+entre execuções (`HashCache`), indexados pelo caminho, tamanho e mtime.
+"""
+
+import hashlib
+import heapq
+import json
+import mmap
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, FIRST_COMPLETED, wait
+from dataclasses import dataclass, field
+
+from fswalk import is_reparse_point
+
+EDGE_BLOCK = 64 * 1024
+HASH_CHUNK = 8 * 1024 * 1024
+DEFAULT_MIN_SIZE = 1024 * 1024
+
+SCANNING, EDGE_HASHING, FULL_HASHING, DONE = "scanning", "edges", "full", "done"
+
+
+@dataclass(frozen=True)
+class FileInfo:
+    path: str
+    size: int
+    mtime_ns: int
+
+
+@dataclass
+class DuplicateGroup:
+    size: int
+    digest: str
+    paths: list
+
+    @property
+    def reclaimable(self):
+        """ Espaço libertado ao manter só uma cópia. """
+        return self.size * (len(self.paths) - 1)
+
+
+@dataclass
+class FinderProgress:
+    phase: str = SCANNING
+    files_scanned: int = 0
+    bytes_scanned: int = 0
+    candidates: int = 0
+    hashed_bytes: int = 0
+    cache_hits: int = 0
+    groups: int = 0
+    reclaimable: int = 0
+    errors: int = 0
+
+
+@dataclass
+class FinderResult:
+    groups: list = field(default_factory=list)
+    # Os maiores ficheiros encontrados (FileInfo), do maior para o menor
+    largest: list = field(default_factory=list)
+    progress: FinderProgress = None
+    cancelled: bool = False
+    elapsed: float = 0.0
+
+    @property
+    def reclaimable(self):
+        return sum(group.reclaimable for group in self.groups)
+
+
+# --- HASHES ---
+def edge_hash(path, size):
+    """ Hash do primeiro e do último bloco (o ficheiro inteiro, se couber nos dois). """
+    digest = hashlib.blake2b(digest_size=16)
+    with open(path, 'rb') as f:
+        digest.update(f.read(EDGE_BLOCK))
+        if size > EDGE_BLOCK:
+            f.seek(max(EDGE_BLOCK, size - EDGE_BLOCK))
+            digest.update(f.read(EDGE_BLOCK))
+    return digest.hexdigest()
+
+
+def full_hash(path):
+    """ Hash do ficheiro inteiro, lido por mmap (corre nos processos da pool). """
+    digest = hashlib.blake2b()
+    with open(path, 'rb') as f:
+        size = os.fstat(f.fileno()).st_size
+        if size:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped, memoryview(mapped) as view:
+                for offset in range(0, size, HASH_CHUNK):
+                    digest.update(view[offset:offset + HASH_CHUNK])
+    return digest.hexdigest()
+
+
+class HashCache:
+    """ Hashes já calculados, por caminho; só valem enquanto o tamanho e o mtime forem os mesmos. """
+
+    def __init__(self, path=None):
+        self.path = path
+        self._entries = {}
+        self._lock = threading.Lock()
+        self._dirty = False
+        self._loaded = False
+
+    def load(self):
+        self._loaded = True
+        if not self.path or not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                entries = json.load(f).get("entries", {})
+        except (OSError, ValueError):
+            return
+        with self._lock:
+            self._entries = entries
+
+    def get(self, info, kind):
+        if not self._loaded:
+            self.load()
+        with self._lock:
+            entry = self._entries.get(info.path)
+        if entry is None or entry[0] != info.size or entry[1] != info.mtime_ns:
+            return None
+        return entry[2] if kind == "edge" else entry[3]
+
+    def put(self, info, kind, digest):
+        with self._lock:
+            entry = self._entries.get(info.path)
+            if entry is None or entry[0] != info.size or entry[1] != info.mtime_ns:
+                entry = self._entries[info.path] = [info.size, info.mtime_ns, None, None]
+            entry[2 if kind == "edge" else 3] = digest
+            self._dirty = True
+
+    def prune(self):
+        """ Esquece os ficheiros que já não existem. """
+        with self._lock:
+            missing = [path for path in self._entries if not os.path.exists(path)]
+            for path in missing:
+                del self._entries[path]
+            self._dirty = self._dirty or bool(missing)
+
+    def save(self):
+        if not self.path:
+            return
+        with self._lock:
+            if not self._dirty:
+                return
+            payload = json.dumps({"entries": self._entries}, separators=(",", ":"), ensure_ascii=False)
+            self._dirty = False
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write(payload)
+        os.replace(tmp_path, self.path)
+
+
+# --- PROCURA ---
+def outermost_roots(roots):
+    """ Sem repetições nem pastas contidas noutra raiz: cada pasta é listada uma só vez. """
+    normalized = {}
+    for root in roots:
+        normalized.setdefault(os.path.normcase(os.path.realpath(root)), os.path.abspath(root))
+
+    def has_ancestor(key):
+        parent = os.path.dirname(key)
+        while parent != key:
+            if parent in normalized:
+                return True
+            key, parent = parent, os.path.dirname(parent)
+        return False
+
+    return [root for key, root in normalized.items() if not has_ancestor(key)]
+
+
+class DuplicateFinder:
+    """ Procura duplicados (e os `top` maiores ficheiros) em `roots`, ignorando ficheiros menores que `min_size`.
+
+    `on_group(DuplicateGroup)` e `on_progress(FinderProgress)` podem ser chamados de
+    outras threads; o progresso é enviado no máximo a cada `progress_interval` segundos.
+    """
+
+    def __init__(self, roots, min_size=DEFAULT_MIN_SIZE, top=50, max_workers=8, processes=None,
+                 hash_cache=None, on_group=None, on_progress=None, progress_interval=0.1):
+        self.roots = outermost_roots(roots)
+        self.min_size = max(1, min_size)
+        self.top = top
+        self.max_workers = max(1, max_workers)
+        self.processes = processes or max(1, min(4, os.cpu_count() or 1))
+        self.hash_cache = hash_cache or HashCache()
+        self.on_group = on_group
+        self.on_progress = on_progress
+        self.progress_interval = progress_interval
+
+        self._cancel_event = threading.Event()
+        self._lock = threading.Lock()
+        self._progress = FinderProgress()
+        self._last_report = 0.0
+
+    def cancel(self):
+        self._cancel_event.set()
+
+    @property
+    def cancelled(self):
+        return self._cancel_event.is_set()
+
+    def run(self):
+        start = time.perf_counter()
+        by_size, largest = self._scan()
+        groups = []
+        if not self.cancelled:
+            candidates = [files for files in by_size.values() if len(files) > 1]
+            self._update(phase=EDGE_HASHING, candidates=sum(len(files) for files in candidates))
+            candidates = self._split_by_edges(candidates)
+        if not self.cancelled:
+            self._update(phase=FULL_HASHING)
+            groups = self._confirm(candidates)
+        if not self.cancelled:
+            self._update(phase=DONE)
+        self.hash_cache.save()
+        self._report(force=True)
+        groups.sort(key=lambda group: group.reclaimable, reverse=True)
+        with self._lock:
+            progress = FinderProgress(**vars(self._progress))
+        return FinderResult(groups=groups, largest=largest, progress=progress,
+                            cancelled=self.cancelled, elapsed=time.perf_counter() - start)
+
+    # Etapa 1: listagem paralela das pastas e agrupamento por tamanho
+    def _scan(self):
+        by_size = {}
+        largest = []
+        seen_files = set()
+        with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="dup-scan") as pool:
+            pending = {pool.submit(self._list_dir, root) for root in self.roots}
+            while pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    files, subdirs, errors = future.result()
+                    if self.cancelled:
+                        continue
+                    accepted, accepted_bytes = 0, 0
+                    for info, file_id in files:
+                        # O mesmo ficheiro por dois caminhos (raízes sobrepostas, hard links) conta uma vez
+                        if file_id is not None:
+                            if file_id in seen_files:
+                                continue
+                            seen_files.add(file_id)
+                        by_size.setdefault(info.size, []).append(info)
+                        accepted += 1
+                        accepted_bytes += info.size
+                        if len(largest) < self.top:
+                            heapq.heappush(largest, (info.size, info.path, info))
+                        elif info.size > largest[0][0]:
+                            heapq.heapreplace(largest, (info.size, info.path, info))
+                    self._update(files_scanned=accepted, bytes_scanned=accepted_bytes, errors=errors, add=True)
+                    pending.update(pool.submit(self._list_dir, path) for path in subdirs)
+        return by_size, [item[2] for item in sorted(largest, reverse=True)]
+
+    def _list_dir(self, path):
+        files, subdirs, errors = [], [], 0
+        if self.cancelled:
+            return files, subdirs, errors
+        try:
+            with os.scandir(path) as entries:
+                for entry in entries:
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            # Junções e links para pastas: o destino seria contado duas vezes
+                            if not is_reparse_point(entry):
+                                subdirs.append(entry.path)
+                            continue
+                        if not entry.is_file(follow_symlinks=False):
+                            continue
+                        stat = entry.stat(follow_symlinks=False)
+                        if stat.st_size < self.min_size:
+                            continue
+                        if not stat.st_ino:
+                            # No Windows o stat da listagem não traz o índice do ficheiro
+                            # (st_ino/st_dev a 0); só os candidatos pagam o os.stat completo
+                            stat = os.stat(entry.path, follow_symlinks=False)
+                    except OSError:
+                        errors += 1
+                        continue
+                    file_id = (stat.st_dev, stat.st_ino) if stat.st_ino else None
+                    files.append((FileInfo(entry.path, stat.st_size, stat.st_mtime_ns), file_id))
+        except OSError:
+            errors += 1
+        return files, subdirs, errors
+
+    # Etapa 2: primeiro e último bloco
+    def _split_by_edges(self, size_groups):
+        def hash_edges(info):
+            digest = self.hash_cache.get(info, "edge")
+            if digest is not None:
+                self._update(cache_hits=1, add=True)
+                return info, digest
+            if self.cancelled:
+                return info, None
+            try:
+                digest = edge_hash(info.path, info.size)
+            except OSError:
+                self._update(errors=1, add=True)
+                return info, None
+            self.hash_cache.put(info, "edge", digest)
+            self._update(hashed_bytes=min(info.size, 2 * EDGE_BLOCK), add=True)
+            return info, digest
+
+        split = []
+        with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="dup-edges") as pool:
+            for files in size_groups:
+                by_edge = {}
+                for info, digest in pool.map(hash_edges, files):
+                    if digest is not None:
+                        by_edge.setdefault(digest, []).append(info)
+                split.extend(group for group in by_edge.values() if len(group) > 1)
+                if self.cancelled:
+                    break
+        return split
+
+    # Etapa 3: hash completo em vários processos; cada grupo sai assim que fica completo
+    def _confirm(self, candidates):
+        # Os maiores primeiro: os grupos que mais espaço libertam aparecem antes
+        candidates.sort(key=lambda files: files[0].size * (len(files) - 1), reverse=True)
+        groups = []
+        remaining = {}
+        digests = {}
+        jobs = {}
+        pool = None
+        try:
+            for index, files in enumerate(candidates):
+                remaining[index] = len(files)
+                digests[index] = []
+                for info in files:
+                    if files[0].size <= 2 * EDGE_BLOCK:
+                        # O hash das pontas já cobriu o ficheiro inteiro
+                        digest = self.hash_cache.get(info, "edge")
+                    else:
+                        digest = self.hash_cache.get(info, "full")
+                    if digest is not None:
+                        if files[0].size > 2 * EDGE_BLOCK:
+                            self._update(cache_hits=1, add=True)
+                        digests[index].append((info, digest))
+                        remaining[index] -= 1
+                        continue
+                    if pool is None:
+                        pool = ProcessPoolExecutor(max_workers=self.processes)
+                    jobs[pool.submit(full_hash, info.path)] = (index, info)
+                if remaining[index] == 0:
+                    groups.extend(self._finish_group(digests.pop(index)))
+
+            pending = set(jobs)
+            while pending and not self.cancelled:
+                done, pending = wait(pending, timeout=0.2, return_when=FIRST_COMPLETED)
+                for future in done:
+                    index, info = jobs.pop(future)
+                    try:
+                        digest = future.result()
+                    except OSError:
+                        self._update(errors=1, add=True)
+                    else:
+                        self.hash_cache.put(info, "full", digest)
+                        self._update(hashed_bytes=info.size, add=True)
+                        digests[index].append((info, digest))
+                    remaining[index] -= 1
+                    if remaining[index] == 0:
+                        groups.extend(self._finish_group(digests.pop(index)))
+        finally:
+            if pool is not None:
+                pool.shutdown(wait=not self.cancelled, cancel_futures=True)
+        return groups
+
+    def _finish_group(self, hashed):
+        by_digest = {}
+        for info, digest in hashed:
+            by_digest.setdefault(digest, []).append(info)
+        groups = []
+        for digest, files in by_digest.items():
+            if len(files) < 2:
+                continue
+            group = DuplicateGroup(size=files[0].size, digest=digest, paths=sorted(info.path for info in files))
+            groups.append(group)
+            self._update(groups=1, reclaimable=group.reclaimable, add=True)
+            if self.on_group is not None:
+                self.on_group(group)
+        return groups
+
+    def _update(self, add=False, **values):
+        with self._lock:
+            for name, value in values.items():
+                setattr(self._progress, name, getattr(self._progress, name) + value if add else value)
+        self._report(force=not add)
+
+    def _report(self, force=False):
+        if not self.on_progress:
+            return
+        now = time.monotonic()
+        with self._lock:
+            if not force and now - self._last_report < self.progress_interval:
+                return
+            self._last_report = now
+            snapshot = FinderProgress(**vars(self._progress))
+        self.on_progress(snapshot)
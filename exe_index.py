@@ -0,0 +1,108 @@
+"""
+PC Control Hub - exe_index.py
+
+Índice em memória dos executáveis (nome em minúsculas -> caminhos) por
+pasta raiz, usado para encontrar a aplicação real por trás dos lançadores
+`Update.exe` (Squirrel: Discord, Teams, Slack...). Cada raiz é percorrida
+uma vez, com limite de profundidade e de pastas, e reaproveitada entre
+entradas e atualizações da lista.
+
+O índice é invalidado pelo `mtime` das pastas visitadas: criar, apagar ou
+renomear um ficheiro numa delas obriga a percorrer a raiz de novo.
+"""
+
+import os
+import threading
+import time
+from collections import OrderedDict
+
+from fswalk import is_reparse_point
+
+
+class _RootIndex:
+    def __init__(self, root):
+        self.root = root
+        self.names = {}
+        self.dir_mtimes = {}
+        self.truncated = False
+        self.checked_at = 0.0
+
+
+class ExecutableIndex:
+    """ `find(root, nome)` devolve os caminhos de `nome` (sem distinguir maiúsculas) sob `root`.
+
+    `max_depth` conta a partir da raiz (0 = só os ficheiros da própria raiz); `max_dirs` limita as
+    pastas listadas por raiz. Os `mtime` só são revalidados a cada `check_interval` segundos,
+    para uma lista inteira de entradas partilhar a mesma verificação.
+    """
+
+    def __init__(self, max_depth=3, max_dirs=5000, max_roots=16, check_interval=2.0, extensions=('.exe',)):
+        self.max_depth = max_depth
+        self.max_dirs = max_dirs
+        self.max_roots = max_roots
+        self.check_interval = check_interval
+        self.extensions = tuple(extensions)
+        self._roots = OrderedDict()
+        self._lock = threading.Lock()
+
+    def find(self, root, name):
+        key = os.path.normcase(os.path.abspath(root))
+        with self._lock:
+            index = self._roots.get(key)
+            if index is None or not self._is_fresh(index):
+                index = self._build(root)
+                self._roots[key] = index
+                if len(self._roots) > self.max_roots:
+                    self._roots.popitem(last=False)
+            self._roots.move_to_end(key)
+            return list(index.names.get(name.lower(), ()))
+
+    def invalidate(self, root=None):
+        with self._lock:
+            if root is None:
+                self._roots.clear()
+            else:
+                self._roots.pop(os.path.normcase(os.path.abspath(root)), None)
+
+    def _is_fresh(self, index):
+        now = time.monotonic()
+        if now - index.checked_at < self.check_interval:
+            return True
+        for path, mtime in index.dir_mtimes.items():
+            try:
+                if os.stat(path).st_mtime_ns != mtime:
+                    return False
+            except OSError:
+                return False
+        index.checked_at = now
+        return True
+
+    def _build(self, root):
+        index = _RootIndex(root)
+        stack = [(root, 0)]
+        while stack:
+            if len(index.dir_mtimes) >= self.max_dirs:
+                index.truncated = True
+                break
+            path, depth = stack.pop()
+            try:
+                index.dir_mtimes[path] = os.stat(path).st_mtime_ns
+                entries = os.scandir(path)
+            except OSError:
+                continue
+            subdirs = []
+            with entries:
+                for entry in entries:
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            # Junções (ex.: `app-*` -> versão anterior) repetiriam ou sairiam da raiz
+                            if depth < self.max_depth and not is_reparse_point(entry):
+                                subdirs.append(entry.path)
+                        elif entry.name.lower().endswith(self.extensions):
+                            index.names.setdefault(entry.name.lower(), []).append(entry.path)
+                    except OSError:
+                        continue
+            # Ordem inversa na pilha para visitar as subpastas pela ordem listada
+            stack.extend((subdir, depth + 1) for subdir in reversed(subdirs))
+        index.checked_at = time.monotonic()
+        return index
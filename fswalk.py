@@ -0,0 +1,29 @@
+"""
+PC Control Hub - fswalk.py
+
+Apoio comum às travessias de pastas com `os.scandir` (limpeza, limpeza
+por regras, duplicados e analisador de disco).
+
+No Windows, as junções NTFS (por exemplo "Application Data" dentro do
+perfil) aparecem como pastas normais em `DirEntry.is_dir(follow_symlinks=False)`
+até ao Python 3.11: entrar nelas contaria (ou apagaria) o conteúdo de
+outra pasta. `is_reparse_point` identifica-as para a travessia as saltar.
+"""
+
+import os
+
+FILE_ATTRIBUTE_REPARSE_POINT = 0x400
+
+
+def is_reparse_point(entry):
+    """ Verdadeiro para links simbólicos e junções: a travessia não deve entrar nestas pastas. """
+    if entry.is_symlink():
+        return True
+    is_junction = getattr(entry, "is_junction", None)
+    if is_junction is not None:
+        return is_junction()  # Python 3.12+
+    if os.name != "nt":
+        return False
+    # No Windows o stat da entrada vem da própria listagem (sem chamada extra ao sistema)
+    attributes = getattr(entry.stat(follow_symlinks=False), "st_file_attributes", 0)
+    return bool(attributes & FILE_ATTRIBUTE_REPARSE_POINT)
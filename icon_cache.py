@@ -0,0 +1,180 @@
+"""
+PC Control Hub - icon_cache.py
+
+Cache de ícones do Gestor de Arranque em dois níveis: uma LRU de QPixmap
+em memória e uma pasta de PNG em disco, indexada pelo caminho do
+executável, tamanho e `mtime`. A extração corre no `JobScheduler`, fora da
+thread da interface; até lá a vista mostra um ícone provisório. Em
+memória, a chave inclui também o `mtime`: um executável atualizado volta
+a ser extraído.
+
+A extração está atrás de `IconExtractor`, para o cache e o carregador
+poderem ser testados fora do Windows com um extrator falso.
+"""
+
+import abc
+import ctypes
+import hashlib
+import os
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+
+from PySide6.QtGui import QImage, QPixmap
+
+from jobs import PRIORITY_LOW
+from utils import resolve_icon_sources, extract_icon_image
+
+# Segundos até voltar a tentar um comando sem ícone (ex.: executável instalado depois)
+MISSING_RETRY_SECONDS = 60.0
+
+
+class IconExtractor(abc.ABC):
+    """ `resolve` lista os ficheiros candidatos ao ícone (pela ordem a tentar), `extract` devolve um QImage (ou None). """
+
+    @abc.abstractmethod
+    def resolve(self, command):
+        ...
+
+    @abc.abstractmethod
+    def extract(self, path, size):
+        ...
+
+
+class WindowsIconExtractor(IconExtractor):
+    _com_state = threading.local()
+
+    def resolve(self, command):
+        return resolve_icon_sources(command)
+
+    def extract(self, path, size):
+        self._ensure_com()
+        return extract_icon_image(path, large=size > 16)
+
+    def _ensure_com(self):
+        # SHGetFileInfoW exige COM inicializado em cada thread que o chama
+        if getattr(self._com_state, "ready", False):
+            return
+        try:
+            ctypes.windll.ole32.CoInitialize(None)
+        except (AttributeError, OSError):
+            pass
+        self._com_state.ready = True
+
+
+def _disk_cache_path(cache_dir, path, size, mtime_ns):
+    digest = hashlib.sha1(f"{os.path.normcase(path)}|{size}|{mtime_ns}".encode("utf-8")).hexdigest()
+    return os.path.join(cache_dir, f"{digest}.png")
+
+
+def icon_load_job(job, extractor, cache_dir, command, size):
+    """ Tarefa do agendador: devolve `(caminho, mtime_ns, QImage)` do primeiro candidato com ícone, ou None. """
+    for path in extractor.resolve(command):
+        try:
+            mtime_ns = os.stat(path).st_mtime_ns
+        except OSError:
+            continue
+        image = _load_icon(extractor, cache_dir, path, size, mtime_ns)
+        if image is not None:
+            return path, mtime_ns, image
+    return None
+
+
+def _load_icon(extractor, cache_dir, path, size, mtime_ns):
+    cached_file = _disk_cache_path(cache_dir, path, size, mtime_ns) if cache_dir else None
+    if cached_file and os.path.exists(cached_file):
+        image = QImage(cached_file)
+        if not image.isNull():
+            return image
+
+    image = extractor.extract(path, size)
+    if image is None or image.isNull():
+        return None
+    if cached_file:
+        _save_to_disk_cache(image, cache_dir, cached_file)
+    return image
+
+
+def _save_to_disk_cache(image, cache_dir, cached_file):
+    # Nome temporário único: duas tarefas podem extrair o mesmo ícone ao mesmo tempo
+    try:
+        fd, tmp_file = tempfile.mkstemp(dir=cache_dir, suffix=".png")
+        os.close(fd)
+    except OSError:
+        return
+    try:
+        if image.save(tmp_file, "PNG"):
+            os.replace(tmp_file, cached_file)
+    except OSError:
+        # Ex.: o destino está aberto por outra tarefa no Windows; o ícone fica só em memória
+        pass
+    finally:
+        if os.path.exists(tmp_file):
+            try:
+                os.remove(tmp_file)
+            except OSError:
+                pass
+
+
+class IconCache:
+    """ Ponto de entrada da interface: `request` devolve já o pixmap em memória ou agenda o carregamento. """
+
+    def __init__(self, scheduler, extractor=None, cache_dir=None, capacity=256, missing_retry=MISSING_RETRY_SECONDS):
+        self.scheduler = scheduler
+        self.extractor = extractor or WindowsIconExtractor()
+        self.cache_dir = cache_dir
+        self.capacity = capacity
+        self.missing_retry = missing_retry
+        # LRU indexada por (caminho, tamanho, mtime_ns); `_sources` lembra o ficheiro de cada comando
+        self._pixmaps = OrderedDict()
+        self._sources = {}
+        # (comando, tamanho) -> instante (monotonic) da última tentativa sem ícone
+        self._missing = {}
+        if cache_dir:
+            os.makedirs(cache_dir, exist_ok=True)
+
+    def get(self, command, size):
+        path = self._sources.get(command)
+        if path is None:
+            return None
+        try:
+            key = (path, size, os.stat(path).st_mtime_ns)
+        except OSError:
+            return None
+        pixmap = self._pixmaps.get(key)
+        if pixmap is not None:
+            self._pixmaps.move_to_end(key)
+        return pixmap
+
+    def request(self, command, size, callback):
+        """ Chama `callback(pixmap)` na thread da interface; sem chamada se não houver ícone. """
+        pixmap = self.get(command, size)
+        if pixmap is not None:
+            callback(pixmap)
+            return
+        failed_at = self._missing.get((command, size))
+        if failed_at is not None:
+            if time.monotonic() - failed_at < self.missing_retry:
+                return
+            del self._missing[(command, size)]
+        self.scheduler.submit(
+            icon_load_job, self.extractor, self.cache_dir, command, size,
+            key=("icon", command, size), priority=PRIORITY_LOW,
+            on_finished=lambda result: self._loaded(command, size, result, callback),
+        )
+
+    def _loaded(self, command, size, result, callback):
+        if result is None:
+            self._missing[(command, size)] = time.monotonic()
+            return
+        path, mtime_ns, image = result
+        self._sources[command] = path
+        key = (path, size, mtime_ns)
+        pixmap = self._pixmaps.get(key)
+        if pixmap is None:
+            pixmap = QPixmap.fromImage(image)
+            self._pixmaps[key] = pixmap
+            if len(self._pixmaps) > self.capacity:
+                self._pixmaps.popitem(last=False)
+        callback(pixmap)
@@ -0,0 +1,227 @@
+"""
+PC Control Hub - ip_resolver.py
+
+Endereços IP da máquina. O IP público é pedido a vários serviços ao mesmo
+tempo (asyncio) e vale a primeira resposta válida; cada pedido tem prazo
+próprio e todos partilham uma sessão HTTP com ligações reutilizadas. O
+resultado fica em cache durante `ttl` segundos, por isso cliques seguidos
+em "Verificar IPs" não voltam à rede.
+
+Os IPs locais vêm de `psutil.net_if_addrs` (todas as interfaces e
+endereços, IPv4 e IPv6), sem depender da resolução do nome da máquina.
+
+Os serviços são configuráveis (`providers`), o que também permite testar
+o resolvedor com servidores HTTP locais.
+"""
+
+import asyncio
+import ipaddress
+import socket
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+
+import psutil
+
+# Todos respondem só com o IP em texto simples
+DEFAULT_PROVIDERS = (
+    "https://api.ipify.org",
+    "https://checkip.amazonaws.com",
+    "https://icanhazip.com",
+    "https://ifconfig.me/ip",
+)
+DEFAULT_TIMEOUT = 3.0
+DEFAULT_TTL = 300.0
+
+_FAMILIES = {socket.AF_INET: "IPv4", socket.AF_INET6: "IPv6"}
+
+
+@dataclass(frozen=True)
+class InterfaceAddress:
+    interface: str
+    family: str
+    address: str
+    netmask: str = None
+    is_up: bool = True
+
+    @property
+    def is_loopback(self):
+        return ipaddress.ip_address(self.address).is_loopback
+
+
+@dataclass(frozen=True)
+class PublicIPResult:
+    address: str = None
+    provider: str = None
+    elapsed: float = 0.0
+    # (serviço, erro) dos que falharam antes da resposta válida
+    errors: tuple = ()
+    fetched_at: float = 0.0
+    from_cache: bool = False
+
+
+@dataclass(frozen=True)
+class IPInfo:
+    local_ip: str
+    interfaces: list = field(default_factory=list)
+    public: PublicIPResult = None
+
+
+def parse_ip(text):
+    """ O endereço IP contido na resposta de um serviço (None se não for um IP válido). """
+    candidate = text.strip()
+    try:
+        return str(ipaddress.ip_address(candidate))
+    except ValueError:
+        return None
+
+
+# --- ENDEREÇOS LOCAIS ---
+def local_addresses(include_loopback=False):
+    """ Todos os endereços IPv4/IPv6 das interfaces, com as interfaces ativas primeiro. """
+    try:
+        stats = psutil.net_if_stats()
+    except OSError:
+        stats = {}
+    addresses = []
+    for name, entries in psutil.net_if_addrs().items():
+        is_up = stats[name].isup if name in stats else True
+        for entry in entries:
+            family = _FAMILIES.get(entry.family)
+            if family is None:
+                continue
+            # Endereços IPv6 de ligação local trazem a interface ("fe80::1%eth0")
+            address = entry.address.split('%', 1)[0]
+            item = InterfaceAddress(name, family, address, entry.netmask, is_up)
+            if include_loopback or not item.is_loopback:
+                addresses.append(item)
+    addresses.sort(key=lambda item: (not item.is_up, item.family != "IPv4", item.interface))
+    return addresses
+
+
+def primary_local_ip():
+    """ IP da interface usada para sair para a internet (sem enviar nada: um socket UDP só escolhe a rota). """
+    try:
+        with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as sock:
+            sock.connect(("192.0.2.1", 9))
+            return sock.getsockname()[0]
+    except OSError:
+        pass
+    try:
+        return socket.gethostbyname(socket.gethostname())
+    except OSError:
+        return None
+
+
+# --- IP PÚBLICO ---
+class PublicIPResolver:
+    """ `resolve()` devolve um `PublicIPResult` (com `address=None` se nenhum serviço respondeu).
+
+    Só as respostas válidas ficam em cache; `force=True` ignora a cache.
+    """
+
+    def __init__(self, providers=DEFAULT_PROVIDERS, timeout=DEFAULT_TIMEOUT, ttl=DEFAULT_TTL, session=None):
+        self.providers = tuple(providers)
+        self.timeout = timeout
+        self.ttl = ttl
+        self._session = session
+        self._executor = None
+        self._inflight = {}
+        self._cached = None
+        self._lock = threading.Lock()
+
+    def cached(self):
+        with self._lock:
+            if self._cached is not None and time.monotonic() - self._cached[1] < self.ttl:
+                return self._cached[0]
+        return None
+
+    def invalidate(self):
+        with self._lock:
+            self._cached = None
+
+    def resolve(self, force=False):
+        """ Versão síncrona de `resolve_async`, para threads sem event loop. """
+        return asyncio.run(self.resolve_async(force))
+
+    async def resolve_async(self, force=False):
+        if not force:
+            result = self.cached()
+            if result is not None:
+                return PublicIPResult(result.address, result.provider, result.elapsed, result.errors,
+                                      result.fetched_at, from_cache=True)
+
+        start = time.perf_counter()
+        pending = {asyncio.wrap_future(self._request(url)): url for url in self.providers}
+        errors = []
+        winner = None
+        while pending and winner is None:
+            remaining = self.timeout - (time.perf_counter() - start)
+            if remaining <= 0:
+                break
+            done, _ = await asyncio.wait(pending, timeout=remaining, return_when=asyncio.FIRST_COMPLETED)
+            for future in done:
+                url = pending.pop(future)
+                try:
+                    address = parse_ip(future.result())
+                except Exception as e:
+                    errors.append((url, str(e) or type(e).__name__))
+                    continue
+                if address is None:
+                    errors.append((url, "resposta inválida"))
+                elif winner is None:
+                    winner = (url, address)
+        elapsed = time.perf_counter() - start
+        if winner is None:
+            errors.extend((url, "sem resposta no prazo") for url in pending.values())
+            return PublicIPResult(elapsed=elapsed, errors=tuple(errors), fetched_at=time.time())
+        result = PublicIPResult(winner[1], winner[0], elapsed, tuple(errors), time.time())
+        with self._lock:
+            self._cached = (result, time.monotonic())
+        return result
+
+    def close(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+            self._inflight.clear()
+        if self._session is not None:
+            self._session.close()
+            self._session = None
+
+    def _request(self, url):
+        """ Pedido a um serviço; se o anterior ao mesmo serviço ainda não acabou, reaproveita-o.
+
+        Assim um serviço lento nunca ocupa mais do que uma thread, mesmo com pedidos seguidos.
+        """
+        with self._lock:
+            future = self._inflight.get(url)
+            if future is None or future.done():
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(max_workers=max(1, len(self.providers)),
+                                                        thread_name_prefix="public-ip")
+                future = self._inflight[url] = self._executor.submit(self._fetch, url)
+            return future
+
+    def _ensure_session(self):
+        with self._lock:
+            if self._session is None:
+                import requests  # só carregado quando é preciso (arranque mais rápido)
+                from requests.adapters import HTTPAdapter
+
+                session = requests.Session()
+                adapter = HTTPAdapter(pool_connections=len(self.providers), pool_maxsize=len(self.providers))
+                session.mount("http://", adapter)
+                session.mount("https://", adapter)
+                self._session = session
+            return self._session
+
+    def _fetch(self, url):
+        response = self._ensure_session().get(url, timeout=self.timeout)
+        response.raise_for_status()
+        return response.text
+
+
+def collect_ip_info(resolver, force=False):
+    return IPInfo(local_ip=primary_local_ip(), interfaces=local_addresses(), public=resolver.resolve(force))
@@ -0,0 +1,216 @@
+"""
+PC Control Hub - jobs.py
+
+Agendador único para todo o trabalho em segundo plano. As tarefas correm
+numa `QThreadPool` limitada, com prioridade, token de cancelamento,
+progresso por sinais e medição de tempos. As tarefas longas (limpezas,
+análises de disco, testes de rede) têm uma pool própria, para nunca
+ocuparem as threads das tarefas curtas da interface. Pedidos idênticos (mesma `key`)
+enquanto uma tarefa está pendente ou a correr devolvem a tarefa existente
+em vez de criar outra.
+
+Uma função de tarefa recebe o `Job` como primeiro argumento e pode chamar
+`job.report_progress(...)` e consultar `job.token.cancelled`.
+"""
+
+import itertools
+import time
+import traceback
+from collections import deque
+
+from PySide6.QtCore import QObject, QRunnable, QThreadPool, Signal
+
+from cancellation import CancelToken, JobCancelled
+
+PRIORITY_LOW = -10
+PRIORITY_NORMAL = 0
+PRIORITY_HIGH = 10
+
+PENDING, RUNNING, DONE, FAILED, CANCELLED = "pending", "running", "done", "failed", "cancelled"
+
+
+class Job:
+    _ids = itertools.count(1)
+
+    def __init__(self, scheduler, fn, args, kwargs, key, name, priority, long_running=False):
+        self.id = next(self._ids)
+        self.key = key
+        self.name = name or getattr(fn, "__name__", "job")
+        self.priority = priority
+        self.long_running = long_running
+        self.token = CancelToken()
+        self.state = PENDING
+        self.result = None
+        self.error = None
+        self.submitted_at = time.perf_counter()
+        self.started_at = None
+        self.finished_at = None
+        self._scheduler = scheduler
+        self._fn, self._args, self._kwargs = fn, args, kwargs
+        self._callbacks = {"progress": [], "finished": [], "error": [], "cancelled": []}
+
+    @property
+    def queued_seconds(self):
+        if self.started_at is None:
+            return None
+        return self.started_at - self.submitted_at
+
+    @property
+    def run_seconds(self):
+        if self.started_at is None or self.finished_at is None:
+            return None
+        return self.finished_at - self.started_at
+
+    @property
+    def active(self):
+        return self.state in (PENDING, RUNNING)
+
+    def report_progress(self, payload):
+        self._scheduler._emit_event(self, "progress", payload)
+
+    def cancel(self):
+        self._scheduler.cancel(self)
+
+    def add_callbacks(self, on_progress=None, on_finished=None, on_error=None, on_cancelled=None):
+        for kind, callback in (("progress", on_progress), ("finished", on_finished),
+                               ("error", on_error), ("cancelled", on_cancelled)):
+            # Um pedido repetido com o mesmo callback não o chama duas vezes
+            if callback is not None and callback not in self._callbacks[kind]:
+                self._callbacks[kind].append(callback)
+        return self
+
+
+class _JobRunnable(QRunnable):
+    def __init__(self, job):
+        super().__init__()
+        self.job = job
+        self.setAutoDelete(False)
+
+    def run(self):
+        job = self.job
+        scheduler = job._scheduler
+        if job.token.cancelled:
+            scheduler._emit_event(job, "cancelled", None)
+            return
+        job.started_at = time.perf_counter()
+        job.state = RUNNING
+        scheduler._emit_event(job, "started", None)
+        try:
+            result = job._fn(job, *job._args, **job._kwargs)
+        except JobCancelled:
+            job.finished_at = time.perf_counter()
+            scheduler._emit_event(job, "cancelled", None)
+        except Exception as e:
+            job.finished_at = time.perf_counter()
+            job.error = traceback.format_exc()
+            scheduler._emit_event(job, "error", str(e))
+        else:
+            job.finished_at = time.perf_counter()
+            scheduler._emit_event(job, "finished", result)
+
+
+class JobScheduler(QObject):
+    """ Os sinais e os callbacks de cada `Job` são sempre entregues na thread do agendador (a da interface). """
+
+    started = Signal(object)
+    progress = Signal(object, object)
+    finished = Signal(object, object)
+    failed = Signal(object, str)
+    cancelled = Signal(object)
+
+    _event = Signal(object, str, object)
+
+    def __init__(self, max_workers=4, max_long_workers=4, history_size=200, parent=None):
+        super().__init__(parent)
+        self._pool = QThreadPool(self)
+        self._pool.setMaxThreadCount(max_workers)
+        self._long_pool = QThreadPool(self)
+        self._long_pool.setMaxThreadCount(max_long_workers)
+        self._active = {}
+        self._runnables = {}
+        self.history = deque(maxlen=history_size)
+        self._event.connect(self._dispatch)
+
+    def submit(self, fn, *args, key=None, name=None, priority=PRIORITY_NORMAL, long_running=False,
+               on_progress=None, on_finished=None, on_error=None, on_cancelled=None, **kwargs):
+        """ `long_running`: tarefa que pode demorar minutos; corre na pool das tarefas longas. """
+        if key is not None:
+            existing = self._active.get(key)
+            if existing is not None and existing.active and not existing.token.cancelled:
+                # Pedido repetido: junta-se à tarefa que já está em curso
+                return existing.add_callbacks(on_progress, on_finished, on_error, on_cancelled)
+
+        job = Job(self, fn, args, kwargs, key, name, priority, long_running)
+        job.add_callbacks(on_progress, on_finished, on_error, on_cancelled)
+        if key is not None:
+            self._active[key] = job
+        runnable = _JobRunnable(job)
+        self._runnables[job.id] = runnable
+        self._pool_for(job).start(runnable, priority)
+        return job
+
+    def cancel(self, job):
+        job.token.cancel()
+        runnable = self._runnables.get(job.id)
+        if runnable is not None and job.state == PENDING and self._pool_for(job).tryTake(runnable):
+            # Ainda não tinha começado: sai da fila sem ocupar uma thread
+            self._emit_event(job, "cancelled", None)
+
+    def cancel_all(self):
+        for job in [runnable.job for runnable in self._runnables.values()]:
+            self.cancel(job)
+
+    def is_running(self, key):
+        job = self._active.get(key)
+        return job is not None and job.active
+
+    def wait_for_done(self, timeout_ms=-1):
+        if timeout_ms < 0:
+            return self._pool.waitForDone() and self._long_pool.waitForDone()
+        deadline = time.monotonic() + timeout_ms / 1000
+        if not self._pool.waitForDone(timeout_ms):
+            return False
+        remaining = max(0, int((deadline - time.monotonic()) * 1000))
+        return self._long_pool.waitForDone(remaining)
+
+    def _pool_for(self, job):
+        return self._long_pool if job.long_running else self._pool
+
+    def _emit_event(self, job, kind, payload):
+        self._event.emit(job, kind, payload)
+
+    def _dispatch(self, job, kind, payload):
+        if kind == "started":
+            self.started.emit(job)
+            return
+        if kind == "progress":
+            if job.state == RUNNING:
+                for callback in job._callbacks["progress"]:
+                    callback(payload)
+                self.progress.emit(job, payload)
+            return
+        if not job.active:
+            return
+
+        if kind == "finished":
+            job.state, job.result = DONE, payload
+        elif kind == "error":
+            job.state = FAILED
+        else:
+            job.state = CANCELLED
+        self._runnables.pop(job.id, None)
+        if job.key is not None and self._active.get(job.key) is job:
+            del self._active[job.key]
+        self.history.append(job)
+
+        for callback in job._callbacks[kind]:
+            if kind == "cancelled":
+                callback()
+            else:
+                callback(payload)
+        if kind == "finished":
+            self.finished.emit(job, payload)
+        elif kind == "error":
+            self.failed.emit(job, payload)
+        else:
+            self.cancelled.emit(job)
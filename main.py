@@ -6,31 +6,76 @@ e lógica de interação. Os workers e estilos ficam em módulos separados
 (`workers.py`, `styles.py`, `utils.py`).
 """
 
+import time
+
+_IMPORT_START = time.perf_counter()
+
 import ctypes
+import multiprocessing
 import os
 import sys
-import subprocess
-import shutil
-import glob
-import psutil
-import winreg
-import json
-import socket
-import requests
-
-from PySide6.QtGui import QIcon, QPixmap
+
+from PySide6.QtGui import QIcon, QPixmap, QPalette
 from PySide6.QtWidgets import (
     QApplication, QMainWindow, QWidget,
     QVBoxLayout, QHBoxLayout, QPushButton,
-    QLabel, QFrame, QStackedWidget, QListWidget, QListWidgetItem, QStyle,
-    QLineEdit, QTextEdit
+    QLabel, QFrame, QStackedWidget, QListView, QStyle,
+    QLineEdit, QTextEdit, QTableView, QHeaderView, QAbstractItemView, QSpinBox, QComboBox,
+    QTreeWidget, QTreeWidgetItem, QFileDialog, QTabWidget
 )
-from PySide6.QtCore import Qt, QTimer
+from PySide6.QtCore import Qt, QTimer, QSortFilterProxyModel, QEvent
 
 # --- IMPORTAÇÕES DOS NOSSOS MÓDULOS ---
-from styles import DARK_STYLE, LIGHT_STYLE
-from workers import PingWorker, SpeedtestWorker
-from utils import resource_path, is_admin, get_icon_for_executable
+from styles import ThemeManager, style_text
+from workers import (
+    launch_job, probe_job, speedtest_job, ip_info_job, cleanup_job, size_scan_job,
+    empty_recycle_bin_job, process_poll_job, startup_list_job, startup_backup_job,
+    startup_restore_job, startup_disable_job, startup_snapshots_job, startup_impact_job,
+    duplicate_scan_job, disk_scan_job, rule_cleanup_job,
+)
+from jobs import JobScheduler, PRIORITY_HIGH, PRIORITY_LOW
+from utils import (
+    resource_path, is_admin, app_data_dir, open_startup_scanner, open_snapshot_store, open_size_index,
+    open_hash_cache, open_cleanup_rules, LEGACY_STARTUP_BACKUP,
+)
+from icon_cache import IconCache
+from startup_impact import StartupImpactEstimator
+from cleanup import format_bytes
+from cleanup_rules import DEFAULT_RULES
+from metrics import MetricsSampler, SamplingPolicy
+from metrics_store import MetricsStore
+from disks import DiskMonitor
+from network import NetworkMonitor
+from probes import parse_targets, METHOD_TCP, METHOD_PING
+from ip_resolver import PublicIPResolver
+from models import (
+    ProcessTableModel, SORT_ROLE, StartupListModel, StartupItemDelegate, startup_key, DiskUsageModel, NODE_ROLE,
+)
+from disk_tree import DiskScanner, DiskTree, NO_NODE
+from treemap import TreemapWidget
+from processes import CPU, ProcessTracker
+from startup_timing import StartupTimings
+
+LIMPEZA_PAGE_INDEX = 0
+MONITOR_PAGE_INDEX = 2
+REDE_PAGE_INDEX = 3
+ESPACO_PAGE_INDEX = 4
+
+# Subpastas mostradas no mapa e na lista do analisador (as restantes aparecem agregadas)
+DISK_TOP_ITEMS = 200
+
+# Ritmo fixo do MetricsSampler (s); a gravação em disco é que pode ser mais espaçada
+SAMPLE_INTERVAL = 1.0
+
+SPEEDTEST_OOKLA, SPEEDTEST_CUSTOM = "ookla", "custom"
+SPEEDTEST_PHASES = {
+    "latency": "A medir a latência em repouso...",
+    "download": "A testar Download...",
+    "upload": "A testar Upload...",
+}
+
+STARTUP_TIMINGS = StartupTimings(origin=_IMPORT_START)
+STARTUP_TIMINGS.mark("importações")
 
 try:
     myappid = 'pccontrolhub.app.v3.0' 
@@ -41,22 +86,53 @@ except ImportError:
 
 # --- MainWindow: janela principal, layouts e comportamentos das páginas ---
 class MainWindow(QMainWindow):
-    def __init__(self):
+    def __init__(self, timings=None):
         super().__init__()
+        # Fases do arranque; consultar com `self.startup_timings.checkpoints()` (ou na página Configurações)
+        self.startup_timings = timings or StartupTimings()
         self.setWindowTitle("PC Control Hub")
         self.setGeometry(100, 100, 900, 650)
         self.current_startup_programs = [] 
+        self.theme_status_label = None
+        self.scheduler = JobScheduler(max_workers=4, max_long_workers=4, parent=self)
+        self.cleanup_job = None
+        self.rule_cleanup_job = None
+        self.probe_job = None
+        self.speedtest_job = None
+        self.duplicate_job = None
+        self.disk_job = None
+        self.disk_scanner = None
+        self.disk_node = DiskTree.ROOT
+        self.icon_cache = IconCache(self.scheduler, cache_dir=os.path.join(app_data_dir(), "icons"))
+        self.startup_scanner = open_startup_scanner()
+        self.snapshot_store = open_snapshot_store()
+        self.impact_estimator = StartupImpactEstimator()
+        self.ip_resolver = PublicIPResolver()
+        self.size_index = open_size_index()
+        self.hash_cache = open_hash_cache()
+        try:
+            self.cleanup_rules = open_cleanup_rules()
+        except (OSError, ValueError, TypeError):
+            # cleanup_rules.json inválido: ficam só as regras predefinidas
+            self.cleanup_rules = list(DEFAULT_RULES)
+        self.metrics_store = MetricsStore(os.path.join(app_data_dir(), "metrics"))
+        self.disk_monitor = DiskMonitor()
+        self.metrics_sampler = MetricsSampler(
+            interval=SAMPLE_INTERVAL,
+            sinks=[self.metrics_store],
+            collectors={"disks": self.disk_monitor.sample,
+                        "network": NetworkMonitor(window_seconds=60.0, interval=SAMPLE_INTERVAL).sample},
+        )
+        self.sampling_policy = SamplingPolicy(visible_interval=1.0)
+        self.startup_timings.mark("serviços")
 
         # Tenta carregar um ícone personalizado se existir
         icon_path = resource_path("icon.ico")
-        print(f"Tentando carregar ícone de: {icon_path}")
-        print(f"O arquivo existe? {os.path.exists(icon_path)}")
         if os.path.exists(icon_path):
             self.setWindowIcon(QIcon(icon_path))
         else:
             # Tenta caminho alternativo direto
             alt_path = os.path.join(os.path.dirname(__file__), "assets", "icon.ico")
-            print(f"Tentando caminho alternativo: {alt_path}")
             if os.path.exists(alt_path):
                 self.setWindowIcon(QIcon(alt_path))
             else:
@@ -68,6 +144,8 @@ class MainWindow(QMainWindow):
 
         sidebar_frame = QFrame()
         sidebar_frame.setObjectName("sidebar")
+        sidebar_frame.setBackgroundRole(QPalette.ColorRole.AlternateBase)
+        sidebar_frame.setAutoFillBackground(True)
         sidebar_frame.setFixedWidth(180)
         sidebar_layout = QVBoxLayout(sidebar_frame)
         sidebar_layout.setAlignment(Qt.AlignmentFlag.AlignTop)
@@ -84,6 +162,9 @@ class MainWindow(QMainWindow):
         btn_rede = QPushButton("Rede")
         btn_rede.setToolTip("Informações de IP, Ping e Teste de Velocidade")
 
+        btn_espaco = QPushButton("Espaço em Disco")
+        btn_espaco.setToolTip("Onde está o espaço ocupado, ficheiros grandes e duplicados")
+
         btn_config = QPushButton("Configurações")
         btn_config.setToolTip("Alterar tema do aplicativo")
 
@@ -91,28 +172,38 @@ class MainWindow(QMainWindow):
         sidebar_layout.addWidget(btn_atalhos)
         sidebar_layout.addWidget(btn_monitor)
         sidebar_layout.addWidget(btn_rede)
+        sidebar_layout.addWidget(btn_espaco)
         sidebar_layout.addStretch()
         sidebar_layout.addWidget(btn_config)
         
+        # Cada página só é construída na primeira vez que é mostrada (ver `ensure_page`);
+        # até lá o QStackedWidget guarda um contentor vazio no seu lugar.
         self.pages_widget = QStackedWidget()
-
-        self.page_limpeza = self.create_limpeza_page()
-        self.page_atalhos = self.create_atalhos_page()
-        self.page_monitor = self.create_monitor_page()
-        self.page_rede = self.create_rede_page()
-        self.page_config = self.create_config_page()
-
-        self.pages_widget.addWidget(self.page_limpeza)
-        self.pages_widget.addWidget(self.page_atalhos)
-        self.pages_widget.addWidget(self.page_monitor)
-        self.pages_widget.addWidget(self.page_rede)
-        self.pages_widget.addWidget(self.page_config)
+        self._page_factories = [
+            self.create_limpeza_page,
+            self.create_atalhos_page,
+            self.create_monitor_page,
+            self.create_rede_page,
+            self.create_espaco_page,
+            self.create_config_page,
+        ]
+        self._pages = [None] * len(self._page_factories)
+        self.page_build_seconds = {}
+        for _ in self._page_factories:
+            host = QWidget()
+            host_layout = QVBoxLayout(host)
+            host_layout.setContentsMargins(0, 0, 0, 0)
+            self.pages_widget.addWidget(host)
+        self.pages_widget.currentChanged.connect(self.ensure_page)
+        self.ensure_page(LIMPEZA_PAGE_INDEX)
+        self.startup_timings.mark("página inicial")
 
         btn_limpeza.clicked.connect(lambda: self.pages_widget.setCurrentIndex(0))
         btn_atalhos.clicked.connect(lambda: self.pages_widget.setCurrentIndex(1))
         btn_monitor.clicked.connect(lambda: self.pages_widget.setCurrentIndex(2))
         btn_rede.clicked.connect(lambda: self.pages_widget.setCurrentIndex(3))
-        btn_config.clicked.connect(lambda: self.pages_widget.setCurrentIndex(4))
+        btn_espaco.clicked.connect(lambda: self.pages_widget.setCurrentIndex(4))
+        btn_config.clicked.connect(lambda: self.pages_widget.setCurrentIndex(5))
 
         main_layout.addWidget(sidebar_frame)
         main_layout.addWidget(self.pages_widget)
@@ -121,11 +212,37 @@ class MainWindow(QMainWindow):
         central_widget.setLayout(main_layout)
         self.setCentralWidget(central_widget)
 
+        self.theme = ThemeManager(QApplication.instance())
         self.set_theme('dark')
+        self.startup_timings.mark("janela")
+
+        self.metrics_sampler.start()
+
+        self.process_tracker = ProcessTracker()
+        self.process_timer = QTimer(self)
+        self.process_timer.timeout.connect(self.refresh_process_table)
 
+        # O Monitor só é atualizado quando está visível (ver `apply_sampling_policy`)
         self.monitor_timer = QTimer(self)
         self.monitor_timer.timeout.connect(self.update_system_info)
-        self.monitor_timer.start(1000) 
+        self.network_timer = QTimer(self)
+        self.network_timer.timeout.connect(self.update_network_info)
+        self.impact_timer = QTimer(self)
+        self.impact_timer.timeout.connect(self.refresh_startup_impact)
+        self.pages_widget.currentChanged.connect(self.apply_sampling_policy)
+        self.apply_sampling_policy()
+
+        self.refresh_snapshot_list()
+        self.startup_timings.mark("temporizadores")
+
+    def ensure_page(self, index):
+        if index < 0 or self._pages[index] is not None:
+            return
+        start = time.perf_counter()
+        page = self._page_factories[index]()
+        self._pages[index] = page
+        self.pages_widget.widget(index).layout().addWidget(page)
+        self.page_build_seconds[index] = time.perf_counter() - start
 
     # --- Backend: Operações do sistema (limpeza, arranque, utilitários) ---
     # Responsabilidades deste bloco:
@@ -134,306 +251,639 @@ class MainWindow(QMainWindow):
     # - Gerir programas de arranque (backup/restore/disable)
     
     def open_task_manager(self):
-        try:
-            subprocess.Popen('taskmgr.exe')
-            self.status_label_atalhos.setText("Gestor de Tarefas iniciado.")
-        except Exception as e:
-            self.status_label_atalhos.setText(f"Erro ao abrir Gestor: {e}")
+        self._launch_tool('taskmgr.exe', "Gestor de Tarefas iniciado.", "Erro ao abrir Gestor")
 
     def open_control_panel(self):
-        try:
-            subprocess.Popen('control.exe')
-            self.status_label_atalhos.setText("Painel de Controlo iniciado.")
-        except Exception as e:
-            self.status_label_atalhos.setText(f"Erro ao abrir Painel de Controlo: {e}")
+        self._launch_tool('control.exe', "Painel de Controlo iniciado.", "Erro ao abrir Painel de Controlo")
 
     def open_device_manager(self):
-        try:
-            subprocess.Popen('devmgmt.msc', shell=True)
-            self.status_label_atalhos.setText("Gestor de Dispositivos iniciado.")
-        except Exception as e:
-            self.status_label_atalhos.setText(f"Erro ao abrir Gestor de Dispositivos: {e}")
+        self._launch_tool('devmgmt.msc', "Gestor de Dispositivos iniciado.", "Erro ao abrir Gestor de Dispositivos", shell=True)
 
     def open_programs_and_features(self):
-        try:
-            subprocess.Popen('appwiz.cpl', shell=True)
-            self.status_label_atalhos.setText("Programas e Recursos iniciado.")
-        except Exception as e:
-            self.status_label_atalhos.setText(f"Erro ao abrir Programas e Recursos: {e}")
+        self._launch_tool('appwiz.cpl', "Programas e Recursos iniciado.", "Erro ao abrir Programas e Recursos", shell=True)
+
+    def _launch_tool(self, command, success_message, error_prefix, shell=False):
+        self.scheduler.submit(
+            launch_job, command, shell=shell, key=("launch", command), priority=PRIORITY_HIGH,
+            on_finished=lambda _: self.status_label_atalhos.setText(success_message),
+            on_error=lambda err: self.status_label_atalhos.setText(f"{error_prefix}: {err}"),
+        )
 
     def clean_temp_files(self):
-        self.status_label_limpeza.setText("A procurar ficheiros temporários...")
-        QApplication.processEvents()
-        
         temp_folder = os.environ.get('TEMP')
         if not temp_folder:
             self.status_label_limpeza.setText("Erro: Não foi possível encontrar a pasta TEMP.")
             return
 
         self.status_label_limpeza.setText(f"Limpando pasta: {temp_folder}...")
-        QApplication.processEvents()
-
-        deleted_count = 0
-        error_count = 0
-
-        for path in glob.glob(os.path.join(temp_folder, '*')) + glob.glob(os.path.join(temp_folder, '.*')):
-            try:
-                if os.path.isfile(path) or os.path.islink(path):
-                    os.unlink(path)
-                elif os.path.isdir(path):
-                    shutil.rmtree(path)
-                deleted_count += 1
-            except Exception as e:
-                error_count += 1
-        
-        self.status_label_limpeza.setText(f"Limpeza concluída! {deleted_count} itens removidos. {error_count} erros.")
+        self.btn_clean_temp.setEnabled(False)
+        self.btn_cancel_clean.setEnabled(True)
+
+        # --- USA O AGENDADOR (a limpeza corre fora da thread da interface) ---
+        self.cleanup_job = self.scheduler.submit(
+            cleanup_job, temp_folder, size_index=self.size_index, long_running=True, key="cleanup",
+            on_progress=self.update_cleanup_progress,
+            on_finished=self.handle_cleanup_result,
+            on_error=self.handle_cleanup_error,
+            on_cancelled=self._finish_cleanup,
+        )
+
+    def cancel_temp_cleanup(self):
+        for job in (self.cleanup_job, self.rule_cleanup_job):
+            if job is not None and job.active:
+                job.cancel()
+                self.status_label_limpeza.setText("A cancelar limpeza...")
+
+    def update_cleanup_progress(self, stats):
+        self.status_label_limpeza.setText(
+            f"A limpar... {stats.items} itens removidos ({format_bytes(stats.bytes_freed)}). {stats.errors} erros."
+        )
+
+    def handle_cleanup_result(self, stats):
+        state = "cancelada" if stats.cancelled else "concluída"
+        self.status_label_limpeza.setText(
+            f"Limpeza {state}! {stats.items} itens removidos ({format_bytes(stats.bytes_freed)} libertados). {stats.errors} erros."
+        )
+        self._finish_cleanup()
+
+    def handle_cleanup_error(self, err):
+        self.status_label_limpeza.setText(f"Erro na limpeza: {err}")
+        self._finish_cleanup()
+
+    def _finish_cleanup(self):
+        self.btn_clean_temp.setEnabled(True)
+        self.btn_cancel_clean.setEnabled(self.rule_cleanup_job is not None and self.rule_cleanup_job.active)
+        self.preview_temp_cleanup()
+
+    # --- Limpeza por regras ---
+    # - `run_cleanup_rules`: aplica (ou simula) as regras marcadas numa só travessia por pasta
+    # - `handle_rule_cleanup_result`: preenche a lista com o relatório de cada regra
+    def selected_cleanup_rules(self):
+        selected = set()
+        for position in range(self.rules_tree.topLevelItemCount()):
+            item = self.rules_tree.topLevelItem(position)
+            if item.checkState(0) == Qt.CheckState.Checked:
+                selected.add(item.data(0, Qt.ItemDataRole.UserRole))
+        return [rule for rule in self.cleanup_rules if rule.id in selected]
+
+    def run_cleanup_rules(self, dry_run=False):
+        rules = self.selected_cleanup_rules()
+        if not rules:
+            self.status_label_limpeza.setText("Marque pelo menos uma regra.")
+            return
+        self.status_label_limpeza.setText("A simular limpeza..." if dry_run else "A aplicar as regras de limpeza...")
+        self.btn_rules_preview.setEnabled(False)
+        self.btn_rules_clean.setEnabled(False)
+        self.btn_cancel_clean.setEnabled(True)
+        self.rule_cleanup_job = self.scheduler.submit(
+            rule_cleanup_job, rules, dry_run=dry_run, long_running=True, key="rule_cleanup",
+            on_progress=self.update_rule_cleanup_progress,
+            on_finished=self.handle_rule_cleanup_result,
+            on_error=self.handle_rule_cleanup_error,
+            on_cancelled=self._finish_rule_cleanup,
+        )
+
+    def update_rule_cleanup_progress(self, stats):
+        action = "A simular" if stats.dry_run else "A limpar"
+        self.status_label_limpeza.setText(
+            f"{action}... {stats.items} itens ({format_bytes(stats.bytes_freed)}). {stats.errors} erros."
+        )
+
+    def handle_rule_cleanup_result(self, result):
+        reports = {report.rule_id: report for report in result.reports}
+        for position in range(self.rules_tree.topLevelItemCount()):
+            item = self.rules_tree.topLevelItem(position)
+            report = reports.get(item.data(0, Qt.ItemDataRole.UserRole))
+            if report is None:
+                continue
+            item.setText(1, str(report.files))
+            item.setText(2, format_bytes(report.bytes_freed))
+            item.setText(3, f"{report.seconds * 1000:.1f} ms")
+            item.setToolTip(1, f"{report.dirs_removed} pastas vazias removidas, {report.errors} erros")
+        stats = result.stats
+        if stats.dry_run:
+            text = f"Simulação: {format_bytes(stats.bytes_freed)} a libertar em {stats.items} ficheiros"
+        else:
+            state = "cancelada" if stats.cancelled else "concluída"
+            text = f"Limpeza por regras {state}! {stats.items} itens removidos ({format_bytes(stats.bytes_freed)} libertados)"
+        self.status_label_limpeza.setText(
+            f"{text}. {stats.errors} erros, {result.dirs_scanned} pastas percorridas em {stats.elapsed:.1f} s."
+        )
+        self._finish_rule_cleanup()
+
+    def handle_rule_cleanup_error(self, err):
+        self.status_label_limpeza.setText(f"Erro na limpeza por regras: {err}")
+        self._finish_rule_cleanup()
+
+    def _finish_rule_cleanup(self):
+        self.btn_rules_preview.setEnabled(True)
+        self.btn_rules_clean.setEnabled(True)
+        self.btn_cancel_clean.setEnabled(self.cleanup_job is not None and self.cleanup_job.active)
+
+    def preview_temp_cleanup(self):
+        temp_folder = os.environ.get('TEMP')
+        if not temp_folder:
+            self.label_reclaimable.setText("Espaço recuperável: pasta TEMP não encontrada.")
+            return
+        self.label_reclaimable.setText("Espaço recuperável: a calcular...")
+        self.scheduler.submit(
+            size_scan_job, self.size_index, temp_folder, key=("size_scan", temp_folder),
+            on_finished=self.handle_size_preview,
+            on_error=lambda err: self.label_reclaimable.setText(f"Espaço recuperável: erro ({err})"),
+        )
+
+    def handle_size_preview(self, summary):
+        self.label_reclaimable.setText(
+            f"Espaço recuperável: {format_bytes(summary.total_bytes)} em {summary.total_files} ficheiros "
+            f"({summary.elapsed * 1000:.0f} ms)"
+        )
 
     def empty_recycle_bin(self):
         self.status_label_limpeza.setText("A esvaziar a Reciclagem...")
-        QApplication.processEvents()
-        try:
-            result = ctypes.windll.shell32.SHEmptyRecycleBinW(None, None, 7)
-            if result == 0:
-                self.status_label_limpeza.setText("Reciclagem esvaziada com sucesso!")
-            else:
-                self.status_label_limpeza.setText(f"Não foi possível esvaziar a Reciclagem (código: {result}).")
-        except Exception as e:
-            self.status_label_limpeza.setText(f"Erro ao esvaziar a Reciclagem: {e}")
-
-    def get_startup_programs(self):
-        startup_programs = []
-        registry_paths = [
-            (winreg.HKEY_CURRENT_USER, r"Software\Microsoft\Windows\CurrentVersion\Run"),
-            (winreg.HKEY_LOCAL_MACHINE, r"Software\Microsoft\Windows\CurrentVersion\Run"),
-        ]
+        self.scheduler.submit(
+            empty_recycle_bin_job, key="recycle_bin",
+            on_finished=self.handle_recycle_bin_result,
+            on_error=lambda err: self.status_label_limpeza.setText(f"Erro ao esvaziar a Reciclagem: {err}"),
+        )
 
-        for hive, path in registry_paths:
-            try:
-                with winreg.OpenKey(hive, path, 0, winreg.KEY_READ) as key:
-                    i = 0
-                    while True:
-                        try:
-                            name, value, _ = winreg.EnumValue(key, i)
-                            program_details = {"name": name, "command": value, "hive": hive, "path": path}
-                            startup_programs.append(program_details)
-                            i += 1
-                        except OSError:
-                            break
-            except FileNotFoundError:
-                continue
-        return startup_programs
+    def handle_recycle_bin_result(self, result):
+        if result == 0:
+            self.status_label_limpeza.setText("Reciclagem esvaziada com sucesso!")
+        else:
+            self.status_label_limpeza.setText(f"Não foi possível esvaziar a Reciclagem (código: {result}).")
 
     def populate_startup_list(self):
-        self.startup_list_widget.clear()
-        self.current_startup_programs = self.get_startup_programs()
-        
-        if self.current_startup_programs:
-            for program in self.current_startup_programs:
-                list_item = QListWidgetItem(self.startup_list_widget)
-                item_widget = QWidget()
-                item_widget.setMinimumHeight(40)
-
-                item_layout = QHBoxLayout(item_widget)
-                item_layout.setSpacing(10) 
-                item_layout.setContentsMargins(5, 2, 5, 2)
-                
-                icon_label = QLabel()
-                icon_label.setFixedSize(32, 32)
-                
-                # --- AQUI: Usa a função importada de utils.py ---
-                pixmap = get_icon_for_executable(program["command"])
-                if pixmap:
-                    icon_label.setPixmap(pixmap)
-                else:
-                    default_icon = self.style().standardIcon(QStyle.StandardPixmap.SP_FileIcon)
-                    icon_label.setPixmap(default_icon.pixmap(32, 32))
-
-                name_label = QLabel(program["name"])
-                name_label.setWordWrap(True)
-
-                disable_button = QPushButton("Desativar")
-                disable_button.setFixedWidth(90)
-                disable_button.setToolTip(f"Desativar {program['name']} do arranque do Windows")
-                disable_button.clicked.connect(lambda checked, p=program: self.disable_startup_program(p))
-
-                item_layout.addWidget(icon_label)
-                item_layout.addWidget(name_label)
-                item_layout.addStretch()
-                item_layout.addWidget(disable_button)
-                
-                list_item.setSizeHint(item_widget.sizeHint())
-                self.startup_list_widget.addItem(list_item)
-                self.startup_list_widget.setItemWidget(list_item, item_widget)
-
-            self.btn_backup_startup.setEnabled(True)
-        else:
-            self.startup_list_widget.addItem("Nenhum programa de arranque encontrado.")
-            self.btn_backup_startup.setEnabled(False)
+        self.status_label_limpeza.setText("A procurar programas de arranque...")
+        self._scan_startup_list()
 
-        self.status_label_limpeza.setText(f"{len(self.current_startup_programs)} programas de arranque encontrados.")
-        
-        if os.path.exists("startup_backup.json"):
-            self.btn_restore_startup.setEnabled(True)
+    def _scan_startup_list(self, message=None):
+        # `message` substitui a contagem no fim (ex.: o resumo de um restauro)
+        self.scheduler.submit(
+            startup_list_job, self.startup_scanner, key="startup_list",
+            on_finished=lambda result: self.show_startup_programs(result.entries, message, result.unreadable),
+            on_error=lambda err: self.status_label_limpeza.setText(f"Erro ao ler programas de arranque: {err}"),
+        )
+
+    def show_startup_programs(self, programs, message=None, unreadable=()):
+        # Só as entradas novas, removidas ou alteradas chegam à vista
+        for program in self.startup_model.set_programs(programs):
+            self.icon_cache.request(program["command"], 32, lambda pixmap, c=program["command"]: self.startup_model.set_icon(c, pixmap))
+        self._update_startup_state()
+        self.startup_empty_label.setVisible(not self.current_startup_programs)
+        self.refresh_startup_impact()
+        if unreadable:
+            # Ex.: chave do HKLM sem permissão de leitura; as restantes origens aparecem na mesma
+            details = [f"Sem acesso: {source} ({error})" for source, error in unreadable]
+            if message:
+                # Mantém os detalhes do restauro que deu origem a esta leitura
+                details.insert(0, self.status_label_limpeza.toolTip())
+            self.status_label_limpeza.setToolTip("\n".join(details))
+        message = message or f"{len(self.current_startup_programs)} programas de arranque encontrados."
+        if unreadable:
+            message += f" {len(unreadable)} origens sem acesso."
+        self.status_label_limpeza.setText(message)
+
+    def refresh_startup_impact(self):
+        if not self.current_startup_programs:
+            return
+        self.scheduler.submit(
+            startup_impact_job, self.impact_estimator, list(self.current_startup_programs),
+            key="startup_impact", priority=PRIORITY_LOW,
+            on_finished=self.startup_model.set_impacts,
+        )
+
+    def sort_startup_list(self, mode):
+        # Coluna -1 repõe a ordem do modelo (a do registo)
+        if mode == 1:
+            self.startup_proxy.sort(0, Qt.SortOrder.DescendingOrder)
         else:
-            self.btn_restore_startup.setEnabled(False)
+            self.startup_proxy.sort(-1)
+
+    def _update_startup_state(self):
+        self.current_startup_programs = self.startup_model.programs()
+        self.btn_backup_startup.setEnabled(bool(self.current_startup_programs))
+        self.btn_restore_startup.setEnabled(self.snapshot_combo.count() > 0)
+
+    def refresh_snapshot_list(self):
+        self.scheduler.submit(
+            startup_snapshots_job, self.snapshot_store, LEGACY_STARTUP_BACKUP, key="startup_snapshots",
+            priority=PRIORITY_LOW,
+            on_finished=self.show_snapshot_list,
+            on_error=lambda err: self.status_label_limpeza.setText(f"Erro ao ler os estados guardados: {err}"),
+        )
+
+    def show_snapshot_list(self, snapshots):
+        self.snapshot_combo.clear()
+        for info in snapshots:
+            self.snapshot_combo.addItem(f"{info.name} ({info.count} entradas)", info.id)
+        self._update_startup_state()
 
     def backup_startup_state(self):
-        backup_file = "startup_backup.json"
-        try:
-            with open(backup_file, 'w') as f:
-                json.dump(self.current_startup_programs, f, indent=4)
-            self.status_label_limpeza.setText(f"Backup salvo com sucesso em {backup_file}!")
-            self.btn_restore_startup.setEnabled(True)
-        except Exception as e:
-            self.status_label_limpeza.setText(f"Erro ao salvar backup: {e}")
+        name = self.snapshot_name_edit.text().strip() or None
+        self.scheduler.submit(
+            startup_backup_job, self.snapshot_store, list(self.current_startup_programs), name, key="startup_backup",
+            on_finished=self.handle_startup_backup_result,
+            on_error=lambda err: self.status_label_limpeza.setText(f"Erro ao salvar backup: {err}"),
+        )
+
+    def handle_startup_backup_result(self, info):
+        self.status_label_limpeza.setText(f'Estado "{info.name}" guardado ({info.count} entradas).')
+        self.snapshot_name_edit.clear()
+        self.refresh_snapshot_list()
 
     def restore_startup_state(self):
-        backup_file = "startup_backup.json"
-        try:
-            with open(backup_file, 'r') as f:
-                backup_programs = json.load(f)
-        except FileNotFoundError:
-            self.status_label_limpeza.setText("Ficheiro de backup não encontrado! Crie um primeiro.")
+        snapshot_id = self.snapshot_combo.currentData()
+        if snapshot_id is None:
+            self.status_label_limpeza.setText("Nenhum estado guardado! Crie um primeiro.")
             return
-        except Exception as e:
-            self.status_label_limpeza.setText(f"Erro ao ler o backup: {e}")
-            return
-
-        restored_count = 0
-        error_count = 0
-        for program in backup_programs:
-            try:
-                hive, path, name, command = program["hive"], program["path"], program["name"], program["command"]
-                with winreg.OpenKey(hive, path, 0, winreg.KEY_SET_VALUE) as key:
-                    winreg.SetValueEx(key, name, 0, winreg.REG_SZ, command)
-                restored_count += 1
-            except Exception as e:
-                error_count += 1
+        self.scheduler.submit(
+            startup_restore_job, self.snapshot_store, self.startup_scanner, snapshot_id, key="startup_restore",
+            on_finished=self.handle_startup_restore_result,
+            on_error=lambda err: self.status_label_limpeza.setText(f"Erro ao ler o backup: {err}"),
+        )
 
-        self.status_label_limpeza.setText(f"Restauro concluído! {restored_count} programas restaurados. {error_count} erros.")
-        self.populate_startup_list()
+    def handle_startup_restore_result(self, report):
+        message = (
+            f"Restauro concluído! {len(report.added)} repostos, {len(report.changed)} corrigidos, "
+            f"{report.unchanged} já estavam iguais, {len(report.failed)} erros."
+        )
+        details = [f"Reposto: {name}" for name in report.added]
+        details += [f"Corrigido: {name}" for name in report.changed]
+        details += [f"Erro: {name} ({error})" for name, error in report.failed]
+        details += [f"Não está no estado guardado (mantido): {name}" for name in report.extra]
+        self.status_label_limpeza.setToolTip("\n".join(details))
+        self._scan_startup_list(message)
 
     def disable_startup_program(self, program_details):
-        try:
-            hive, path, name = program_details["hive"], program_details["path"], program_details["name"]
-            with winreg.OpenKey(hive, path, 0, winreg.KEY_SET_VALUE) as key:
-                winreg.DeleteValue(key, name)
-            self.status_label_limpeza.setText(f'Programa "{name}" desativado com sucesso!')
-            self.populate_startup_list()
-        except FileNotFoundError:
-             self.status_label_limpeza.setText(f'Erro: O programa "{name}" já não existe no registo.')
-        except Exception as e:
-            self.status_label_limpeza.setText(f"Erro ao desativar: {e}")
+        self.scheduler.submit(
+            startup_disable_job, self.startup_scanner, program_details, key=("startup_disable",) + startup_key(program_details),
+            on_finished=lambda _: self.handle_startup_disable_result(program_details),
+            on_error=lambda err: self.status_label_limpeza.setText(f"Erro ao desativar: {err}"),
+        )
+
+    def handle_startup_disable_result(self, program_details):
+        # Só a linha desativada sai da lista; não é preciso reler o registo
+        self.startup_model.remove_program(program_details)
+        self._update_startup_state()
+        self.startup_empty_label.setVisible(not self.current_startup_programs)
+        self.status_label_limpeza.setText(f'Programa "{program_details["name"]}" desativado com sucesso!')
 
     def update_system_info(self):
-        cpu_percent = psutil.cpu_percent(interval=None)
-        self.cpu_label.setText(f"Uso de CPU: {cpu_percent}%")
+        # Só lê o último instantâneo; o psutil corre na thread do MetricsSampler
+        sample = self.metrics_sampler.snapshot()
+        if sample is None:
+            return
 
-        ram = psutil.virtual_memory()
-        ram_total_gb, ram_used_gb = ram.total / (1024**3), ram.used / (1024**3)
-        self.ram_label.setText(f"Uso de RAM: {ram_used_gb:.2f} GB / {ram_total_gb:.2f} GB ({ram.percent}%)")
+        self.cpu_label.setText(f"Uso de CPU: {sample.cpu_percent}%")
 
-        try:
-            disk = psutil.disk_usage('C:')
-            disk_total_gb, disk_used_gb = disk.total / (1024**3), disk.used / (1024**3)
-            self.disk_label.setText(f"Uso de Disco (C:): {disk_used_gb:.2f} GB / {disk_total_gb:.2f} GB ({disk.percent}%)")
-        except FileNotFoundError:
-            self.disk_label.setText("Uso de Disco (C:): Unidade não encontrada.")
+        ram_total_gb, ram_used_gb = sample.ram_total / (1024**3), sample.ram_used / (1024**3)
+        self.ram_label.setText(f"Uso de RAM: {ram_used_gb:.2f} GB / {ram_total_gb:.2f} GB ({sample.ram_percent}%)")
+
+        if sample.disk_percent is not None:
+            disk_total_gb, disk_used_gb = sample.disk_total / (1024**3), sample.disk_used / (1024**3)
+            self.disk_label.setText(f"Uso de Disco ({sample.disk_path}): {disk_used_gb:.2f} GB / {disk_total_gb:.2f} GB ({sample.disk_percent}%)")
+        else:
+            self.disk_label.setText(f"Uso de Disco ({sample.disk_path}): Unidade não encontrada.")
+
+        disks = self.metrics_sampler.latest("disks")
+        if disks is not None:
+            lines = [
+                f"{part.mountpoint} ({part.fstype}): {part.used / (1024**3):.1f} GB / {part.total / (1024**3):.1f} GB ({part.percent}%)"
+                for part in disks.partitions
+            ]
+            lines += [
+                f"{name}: leitura {format_bytes(rate.read_bps)}/s ({rate.read_iops:.0f} IOPS), "
+                f"escrita {format_bytes(rate.write_bps)}/s ({rate.write_iops:.0f} IOPS)"
+                for name, rate in sorted(disks.io.items())
+            ]
+            self.disks_label.setText("\n".join(lines))
+
+        overhead = self.metrics_sampler.overhead()
+        self.overhead_label.setText(
+            f"Custo da amostragem: {overhead.avg_ms:.2f} ms por amostra, {overhead.cpu_percent:.2f}% de CPU"
+        )
+
+    def apply_sampling_policy(self, *_):
+        current = None if self.isMinimized() else self.pages_widget.currentIndex()
+
+        interval = self.sampling_policy.interval_for(current == MONITOR_PAGE_INDEX)
+        if interval is None:
+            self.monitor_timer.stop()
+            self.process_timer.stop()
+        else:
+            self.monitor_timer.start(int(interval * 1000))
+            self.process_timer.start(int(max(interval, 2.0) * 1000))
+            self.update_system_info()
+            self.refresh_process_table()
+
+        interval = self.sampling_policy.interval_for(current == REDE_PAGE_INDEX)
+        if interval is None:
+            self.network_timer.stop()
+        else:
+            self.network_timer.start(int(interval * 1000))
+            self.update_network_info()
+
+        # O impacto do arranque muda devagar: no mínimo 5 s entre leituras
+        interval = self.sampling_policy.interval_for(current == LIMPEZA_PAGE_INDEX)
+        if interval is None:
+            self.impact_timer.stop()
+        else:
+            self.impact_timer.start(int(max(interval, 5.0) * 1000))
+            self.refresh_startup_impact()
+
+    def refresh_process_table(self):
+        # A chave evita leituras sobrepostas se uma demorar mais do que o intervalo
+        self.scheduler.submit(
+            process_poll_job, self.process_tracker, key="process_poll", priority=PRIORITY_LOW,
+            on_finished=self.process_model.apply_diff,
+        )
+
+    def set_monitor_interval(self, interval_ms):
+        self.sampling_policy.visible_interval = interval_ms / 1000
+        self.apply_sampling_policy()
+
+    def set_recording_interval(self, interval_s):
+        self.metrics_sampler.set_record_interval(interval_s)
+
+    def changeEvent(self, event):
+        if event.type() == QEvent.Type.WindowStateChange:
+            self.apply_sampling_policy()
+        super().changeEvent(event)
+
+    def closeEvent(self, event):
+        self.metrics_sampler.stop()
+        self.metrics_sampler.join(timeout=2)
+        if not self.metrics_sampler.is_alive():
+            # A thread ainda pode estar a usar o histórico e o monitor se não parou a tempo
+            self.metrics_store.close()
+            self.disk_monitor.close()
+        self.process_timer.stop()
+        self.scheduler.cancel_all()
+        self.scheduler.wait_for_done(3000)
+        self.ip_resolver.close()
+        super().closeEvent(event)
 
     # --- Rede: IP, Ping e Speedtest (network utilities) ---
-    # - `get_ip_info`: obtém IP local e público
-    # - `start_ping_test` / `handle_ping_result`: ping via worker
-    # - `start_speedtest` / handlers: Speedtest via worker (Ookla)
+    # - `update_network_info`: débito ao vivo por interface (lido do MetricsSampler)
+    # - `get_ip_info`: obtém os IPs locais e o público (vários serviços em simultâneo, com cache)
+    # - `start_ping_test` / handlers: latência para vários destinos via worker
+    # - `start_speedtest` / handlers: teste de velocidade com várias ligações (Ookla ou servidor próprio)
+    def update_network_info(self):
+        rates = self.metrics_sampler.latest("network")
+        if not rates:
+            return
+        lines = [
+            f"{rate.name}: ↓ {format_bytes(rate.rx_bps)}/s (pico {format_bytes(rate.rx_peak)}/s, média {format_bytes(rate.rx_avg)}/s)  "
+            f"↑ {format_bytes(rate.tx_bps)}/s (pico {format_bytes(rate.tx_peak)}/s, média {format_bytes(rate.tx_avg)}/s)  "
+            f"{rate.rx_pps + rate.tx_pps:.0f} pacotes/s  erros {rate.errors_total} ({rate.errors_ps:.1f}/s)  "
+            f"descartes {rate.drops_total} ({rate.drops_ps:.1f}/s)"
+            for rate in sorted(rates.values(), key=lambda r: r.rx_bps + r.tx_bps, reverse=True)
+        ]
+        self.label_interfaces.setText("\n".join(lines))
+
     def get_ip_info(self):
         self.status_label_rede.setText("A obter informações de IP...")
-        QApplication.processEvents()
-        try:
-            hostname = socket.gethostname()
-            local_ip = socket.gethostbyname(hostname)
-            try:
-                public_ip = requests.get('https://api.ipify.org').text
-            except:
-                public_ip = "Sem internet"
-            self.label_local_ip.setText(f"IP Local: {local_ip}")
-            self.label_public_ip.setText(f"IP Público: {public_ip}")
+        self.scheduler.submit(
+            ip_info_job, self.ip_resolver, key="ip_info",
+            on_finished=self.handle_ip_info,
+            on_error=lambda err: self.status_label_rede.setText(f"Erro ao obter IPs: {err}"),
+        )
+
+    def handle_ip_info(self, info):
+        self.label_local_ip.setText(f"IP Local: {info.local_ip or 'Desconhecido'}")
+        self.label_local_addresses.setText("\n".join(
+            f"{item.interface} ({item.family}): {item.address}" + ("" if item.is_up else " (inativa)")
+            for item in info.interfaces
+        ))
+
+        public = info.public
+        errors = "\n".join(f"{url}: {error}" for url, error in public.errors)
+        if public.address is None:
+            self.label_public_ip.setText("IP Público: Sem internet")
+            self.label_public_ip.setToolTip(errors)
+            self.status_label_rede.setText("Nenhum serviço devolveu o IP público.")
+            return
+        self.label_public_ip.setText(f"IP Público: {public.address}")
+        self.label_public_ip.setToolTip(f"Obtido de {public.provider} em {public.elapsed * 1000:.0f} ms" +
+                                        (f"\n\nSem resposta válida:\n{errors}" if errors else ""))
+        if public.from_cache:
+            age = time.time() - public.fetched_at
+            self.status_label_rede.setText(f"Informações de IP atualizadas (IP público em cache, obtido há {age:.0f} s).")
+        else:
             self.status_label_rede.setText("Informações de IP atualizadas.")
-        except Exception as e:
-            self.status_label_rede.setText(f"Erro ao obter IPs: {e}")
 
     def start_ping_test(self):
-        address = self.input_ping.text()
-        if not address:
+        targets = parse_targets(self.input_ping.text())
+        if not targets:
             self.status_label_rede.setText("Por favor, digite um endereço para testar.")
             return
-        self.status_label_rede.setText(f"A testar ping para {address}...")
+        if self.probe_job is not None and self.probe_job.active:
+            self.probe_job.cancel()
+            self.status_label_rede.setText("A cancelar teste de latência...")
+            return
+
+        count = self.spin_ping_count.value()
+        self.status_label_rede.setText(f"A testar latência para {len(targets)} destino(s)...")
         self.text_ping_result.clear()
-        
-        # --- USA O WORKER IMPORTADO ---
-        self.ping_worker = PingWorker(address)
-        self.ping_worker.finished.connect(self.handle_ping_result)
-        self.ping_worker.start()
+        self.probe_replies = 0
+        self.probe_expected = len(targets) * count
+        self.btn_ping.setText("Cancelar")
+
+        # --- USA O AGENDADOR ---
+        self.probe_job = self.scheduler.submit(
+            probe_job, targets, method=self.combo_ping_method.currentData(), count=count,
+            long_running=True, key="probe",
+            on_progress=self.update_ping_progress,
+            on_finished=self.handle_ping_result,
+            on_error=self.handle_ping_error,
+            on_cancelled=lambda: self.btn_ping.setText("Testar Latência"),
+        )
+
+    def update_ping_progress(self, event):
+        if event[0] == "host":
+            self.text_ping_result.append(event[1].summary())
+            return
+        self.probe_replies += 1
+        self.status_label_rede.setText(f"A testar latência... {self.probe_replies}/{self.probe_expected} tentativas.")
 
-    def handle_ping_result(self, result):
-        self.text_ping_result.setText(result)
-        self.status_label_rede.setText("Teste de Ping concluído.")
+    def handle_ping_result(self, results):
+        reachable = sum(1 for result in results if result.received)
+        self.status_label_rede.setText(f"Teste de latência concluído: {reachable}/{len(results)} destinos responderam.")
+        self.btn_ping.setText("Testar Latência")
+
+    def handle_ping_error(self, err):
+        self.status_label_rede.setText(f"Erro no teste de latência: {err}")
+        self.btn_ping.setText("Testar Latência")
 
     def start_speedtest(self):
+        if self.speedtest_job is not None and self.speedtest_job.active:
+            self.speedtest_job.cancel()
+            self.status_label_rede.setText("A cancelar Teste de Velocidade...")
+            return
+        server_url = None
+        if self.combo_speed_server.currentData() == SPEEDTEST_CUSTOM:
+            server_url = self.input_speed_url.text().strip()
+            if not server_url:
+                self.status_label_rede.setText("Indique o URL do servidor de teste.")
+                return
+
         self.status_label_rede.setText("A preparar Teste de Velocidade...")
-        self.btn_speedtest.setEnabled(False) 
-        
-        # --- USA O WORKER IMPORTADO ---
-        self.speed_worker = SpeedtestWorker()
-        self.speed_worker.progress.connect(self.update_speed_status)
-        self.speed_worker.finished.connect(self.handle_speedtest_result)
-        self.speed_worker.error.connect(self.handle_speedtest_error)
-        self.speed_worker.start()
-
-    def update_speed_status(self, msg):
-        self.status_label_rede.setText(msg)
-
-    def handle_speedtest_result(self, down, up, ping):
-        self.label_speed_down.setText(f"Download: {down:.2f} Mbps")
-        self.label_speed_up.setText(f"Upload: {up:.2f} Mbps")
-        self.label_speed_ping.setText(f"Ping: {ping:.0f} ms")
-        self.status_label_rede.setText("Teste de Velocidade concluído!")
-        self.btn_speedtest.setEnabled(True)
+        self.label_speed_down.setText("Download: -- Mbps")
+        self.label_speed_up.setText("Upload: -- Mbps")
+        self.label_speed_ping.setText("Ping: -- ms")
+        self.btn_speedtest.setText("Cancelar")
+
+        # --- USA O AGENDADOR ---
+        self.speedtest_job = self.scheduler.submit(
+            speedtest_job, server_url, streams=self.spin_speed_streams.value(), long_running=True, key="speedtest",
+            on_progress=self.update_speed_status,
+            on_finished=self.handle_speedtest_result,
+            on_error=self.handle_speedtest_error,
+            on_cancelled=self.handle_speedtest_cancelled,
+        )
+
+    def update_speed_status(self, event):
+        if event[0] == "phase":
+            self.status_label_rede.setText(SPEEDTEST_PHASES[event[1]])
+            return
+        _, direction, _, mbps, warming = event
+        label = self.label_speed_down if direction == "download" else self.label_speed_up
+        name = "Download" if direction == "download" else "Upload"
+        label.setText(f"{name}: {mbps:.1f} Mbps" + (" (aquecimento)" if warming else ""))
+
+    def handle_speedtest_result(self, result):
+        for label, name, phase in ((self.label_speed_down, "Download", result.download),
+                                   (self.label_speed_up, "Upload", result.upload)):
+            if phase is None:
+                continue
+            label.setText(f"{name}: {phase.p50_mbps:.2f} Mbps")
+            tooltip = (f"p50 {phase.p50_mbps:.1f} / p90 {phase.p90_mbps:.1f} / média {phase.mean_mbps:.1f} Mbps\n"
+                       f"{format_bytes(phase.bytes)} em {phase.seconds:.1f} s com {phase.streams} ligações")
+            if phase.loaded_latency_ms is not None:
+                tooltip += f"\nLatência com carga: {phase.loaded_latency_ms:.0f} ms"
+            label.setToolTip(tooltip)
+
+        if result.idle_latency_ms is None:
+            self.label_speed_ping.setText("Ping: -- ms")
+        else:
+            bloat = [value for value in (result.bufferbloat_ms("download"), result.bufferbloat_ms("upload")) if value is not None]
+            extra = f" (+{max(bloat):.0f} ms com carga)" if bloat else ""
+            self.label_speed_ping.setText(f"Ping: {result.idle_latency_ms:.0f} ms{extra}")
+        self.label_speed_ping.setToolTip("Latência em repouso e o aumento máximo com a ligação cheia (bufferbloat).")
+        self.status_label_rede.setText(f"Teste de Velocidade concluído! Servidor: {result.server}")
+        self._finish_speedtest()
 
     def handle_speedtest_error(self, err):
         self.status_label_rede.setText(f"Erro no Speedtest: {err}")
-        self.btn_speedtest.setEnabled(True)
+        self._finish_speedtest()
+
+    def handle_speedtest_cancelled(self):
+        self.status_label_rede.setText("Teste de Velocidade cancelado.")
+        self._finish_speedtest()
+
+    def _finish_speedtest(self):
+        self.btn_speedtest.setText("Iniciar Speedtest")
 
     # --- UI: Página - Limpeza e Otimização ---
     # Contém ações de limpeza, gestão de arranque e botões relacionados.
     def create_limpeza_page(self):
         page = self.create_page("Limpeza e Otimização")
         layout = page.layout()
-        btn_clean_temp = QPushButton("Limpar Ficheiros Temporários")
-        btn_clean_temp.setToolTip("Apaga ficheiros temporários do sistema para libertar espaço.")
-        btn_clean_temp.clicked.connect(self.clean_temp_files)
-        layout.addWidget(btn_clean_temp)
+        clean_buttons_layout = QHBoxLayout()
+        self.btn_clean_temp = QPushButton("Limpar Ficheiros Temporários")
+        self.btn_clean_temp.setToolTip("Apaga ficheiros temporários do sistema para libertar espaço.")
+        self.btn_clean_temp.clicked.connect(self.clean_temp_files)
+        self.btn_cancel_clean = QPushButton("Cancelar")
+        self.btn_cancel_clean.setToolTip("Interrompe a limpeza em curso.")
+        self.btn_cancel_clean.clicked.connect(self.cancel_temp_cleanup)
+        self.btn_cancel_clean.setEnabled(False)
+        btn_preview_clean = QPushButton("Calcular Espaço")
+        btn_preview_clean.setToolTip("Mostra quanto espaço a limpeza de temporários vai libertar.")
+        btn_preview_clean.clicked.connect(self.preview_temp_cleanup)
+        clean_buttons_layout.addWidget(self.btn_clean_temp)
+        clean_buttons_layout.addWidget(btn_preview_clean)
+        clean_buttons_layout.addWidget(self.btn_cancel_clean)
+        layout.addLayout(clean_buttons_layout)
+        self.label_reclaimable = QLabel("Espaço recuperável: --")
+        layout.addWidget(self.label_reclaimable)
         btn_empty_recycle_bin = QPushButton("Esvaziar Reciclagem")
         btn_empty_recycle_bin.setToolTip("Esvazia a Reciclagem do Windows permanentemente.")
         btn_empty_recycle_bin.clicked.connect(self.empty_recycle_bin)
         layout.addWidget(btn_empty_recycle_bin)
+        rules_label = QLabel("Limpeza por Regras")
+        style_text(rules_label, "page_title")
+        layout.addWidget(rules_label)
+        self.rules_tree = QTreeWidget()
+        self.rules_tree.setHeaderLabels(["Regra", "Ficheiros", "Espaço", "Tempo"])
+        self.rules_tree.setRootIsDecorated(False)
+        self.rules_tree.setMaximumHeight(220)
+        self.rules_tree.header().setSectionResizeMode(0, QHeaderView.ResizeMode.Stretch)
+        self.rules_tree.header().setStretchLastSection(False)
+        for rule in self.cleanup_rules:
+            item = QTreeWidgetItem([rule.name, "", "", ""])
+            item.setFlags(item.flags() | Qt.ItemFlag.ItemIsUserCheckable)
+            item.setCheckState(0, Qt.CheckState.Checked if rule.enabled else Qt.CheckState.Unchecked)
+            item.setToolTip(0, "\n".join([rule.description, *rule.roots]).strip())
+            item.setData(0, Qt.ItemDataRole.UserRole, rule.id)
+            self.rules_tree.addTopLevelItem(item)
+        layout.addWidget(self.rules_tree)
+        rules_buttons_layout = QHBoxLayout()
+        self.btn_rules_preview = QPushButton("Simular")
+        self.btn_rules_preview.setToolTip("Mostra por regra quanto seria libertado, sem apagar nada.")
+        self.btn_rules_preview.clicked.connect(lambda: self.run_cleanup_rules(dry_run=True))
+        self.btn_rules_clean = QPushButton("Limpar Selecionadas")
+        self.btn_rules_clean.setToolTip("Aplica as regras marcadas (uma só passagem por cada pasta).")
+        self.btn_rules_clean.clicked.connect(lambda: self.run_cleanup_rules(dry_run=False))
+        rules_buttons_layout.addWidget(self.btn_rules_preview)
+        rules_buttons_layout.addWidget(self.btn_rules_clean)
+        layout.addLayout(rules_buttons_layout)
         separator = QFrame()
         separator.setFrameShape(QFrame.Shape.HLine)
         separator.setFrameShadow(QFrame.Shadow.Sunken)
         layout.addWidget(separator)
         startup_label = QLabel("Gestor de Programas de Arranque")
-        startup_label.setObjectName("page_title")
+        style_text(startup_label, "page_title")
         layout.addWidget(startup_label)
-        self.startup_list_widget = QListWidget()
-        layout.addWidget(self.startup_list_widget)
+        self.startup_model = StartupListModel(self)
+        self.startup_model.placeholder_icon = self.style().standardIcon(QStyle.StandardPixmap.SP_FileIcon).pixmap(32, 32)
+        self.startup_proxy = QSortFilterProxyModel(self)
+        self.startup_proxy.setSourceModel(self.startup_model)
+        self.startup_proxy.setSortRole(SORT_ROLE)
+        self.startup_proxy.setDynamicSortFilter(True)
+        self.startup_list_view = QListView()
+        self.startup_list_view.setModel(self.startup_proxy)
+        self.startup_list_view.setUniformItemSizes(True)
+        startup_delegate = StartupItemDelegate(self.startup_list_view)
+        startup_delegate.disable_requested.connect(self.disable_startup_program)
+        self.startup_list_view.setItemDelegate(startup_delegate)
+        startup_sort_combo = QComboBox()
+        startup_sort_combo.addItems(["Ordem do registo", "Maior impacto primeiro"])
+        startup_sort_combo.setToolTip("Impacto estimado pelo CPU, memória e E/S que os processos de cada programa gastam.")
+        startup_sort_combo.currentIndexChanged.connect(self.sort_startup_list)
+        layout.addWidget(startup_sort_combo, 0, Qt.AlignmentFlag.AlignRight)
+        layout.addWidget(self.startup_list_view)
+        self.startup_empty_label = QLabel("Nenhum programa de arranque encontrado.")
+        self.startup_empty_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        self.startup_empty_label.hide()
+        layout.addWidget(self.startup_empty_label)
         startup_buttons_layout = QHBoxLayout()
         btn_scan_startup = QPushButton("Analisar")
         btn_scan_startup.setToolTip("Procurar programas que iniciam com o Windows.")
         btn_scan_startup.clicked.connect(self.populate_startup_list)
+        snapshot_layout = QHBoxLayout()
+        self.snapshot_name_edit = QLineEdit()
+        self.snapshot_name_edit.setPlaceholderText("Nome do estado (opcional)")
+        self.snapshot_combo = QComboBox()
+        self.snapshot_combo.setToolTip("Estados guardados, do mais recente para o mais antigo.")
+        snapshot_layout.addWidget(self.snapshot_name_edit)
+        snapshot_layout.addWidget(self.snapshot_combo, 1)
+        layout.addLayout(snapshot_layout)
         self.btn_backup_startup = QPushButton("Salvar Estado")
-        self.btn_backup_startup.setToolTip("Cria um backup da lista atual para restauro futuro.")
+        self.btn_backup_startup.setToolTip("Guarda a lista atual como um novo estado para restauro futuro.")
         self.btn_backup_startup.clicked.connect(self.backup_startup_state)
         self.btn_backup_startup.setEnabled(False) 
         self.btn_restore_startup = QPushButton("Carregar Estado")
-        self.btn_restore_startup.setToolTip("Restaura os programas de arranque a partir do backup.")
+        self.btn_restore_startup.setToolTip("Repõe o estado selecionado (só escreve as entradas em falta ou alteradas).")
         self.btn_restore_startup.clicked.connect(self.restore_startup_state)
         self.btn_restore_startup.setEnabled(False)
         startup_buttons_layout.addWidget(btn_scan_startup)
@@ -441,7 +891,7 @@ class MainWindow(QMainWindow):
         startup_buttons_layout.addWidget(self.btn_restore_startup)
         layout.addLayout(startup_buttons_layout)
         self.status_label_limpeza = QLabel("Aguardando comando...")
-        self.status_label_limpeza.setObjectName("status_label")
+        style_text(self.status_label_limpeza, "status_label")
         layout.addWidget(self.status_label_limpeza)
         return page
 
@@ -465,7 +915,7 @@ class MainWindow(QMainWindow):
         btn_programs_features.clicked.connect(self.open_programs_and_features)
         layout.addWidget(btn_programs_features)
         self.status_label_atalhos = QLabel("")
-        self.status_label_atalhos.setObjectName("status_label")
+        style_text(self.status_label_atalhos, "status_label")
         layout.addWidget(self.status_label_atalhos)
         return page
     
@@ -473,20 +923,43 @@ class MainWindow(QMainWindow):
         page = self.create_page("Monitor do Sistema em Tempo Real")
         layout = page.layout()
         self.cpu_label = QLabel("Uso de CPU: --%")
-        self.cpu_label.setObjectName("status_label")
-        self.cpu_label.setStyleSheet("font-size: 18px;")
+        style_text(self.cpu_label, "metric_label")
         self.cpu_label.setToolTip("Percentagem de processamento em uso.")
         layout.addWidget(self.cpu_label)
         self.ram_label = QLabel("Uso de RAM: -- GB / -- GB (--%)")
-        self.ram_label.setObjectName("status_label")
-        self.ram_label.setStyleSheet("font-size: 18px;")
+        style_text(self.ram_label, "metric_label")
         self.ram_label.setToolTip("Memória física usada vs total disponível.")
         layout.addWidget(self.ram_label)
         self.disk_label = QLabel("Uso de Disco (C:): -- GB / -- GB (--%)")
-        self.disk_label.setObjectName("status_label")
-        self.disk_label.setStyleSheet("font-size: 18px;")
+        style_text(self.disk_label, "metric_label")
         self.disk_label.setToolTip("Espaço usado no disco principal.")
         layout.addWidget(self.disk_label)
+        self.disks_label = QLabel("Partições e atividade dos discos: --")
+        self.disks_label.setToolTip("Ocupação de cada partição montada e débito/IOPS de cada disco físico.")
+        layout.addWidget(self.disks_label)
+
+        processes_label = QLabel("Processos")
+        style_text(processes_label, "page_title")
+        layout.addWidget(processes_label)
+        self.process_model = ProcessTableModel(self)
+        process_proxy = QSortFilterProxyModel(self)
+        process_proxy.setSourceModel(self.process_model)
+        process_proxy.setSortRole(SORT_ROLE)
+        process_proxy.setDynamicSortFilter(True)
+        self.process_table = QTableView()
+        self.process_table.setModel(process_proxy)
+        self.process_table.setSortingEnabled(True)
+        self.process_table.sortByColumn(CPU, Qt.SortOrder.DescendingOrder)
+        self.process_table.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
+        self.process_table.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+        self.process_table.verticalHeader().setVisible(False)
+        self.process_table.horizontalHeader().setSectionResizeMode(1, QHeaderView.ResizeMode.Stretch)
+        self.process_table.setToolTip("Processos em execução (CPU, memória, E/S de disco e threads).")
+        layout.addWidget(self.process_table)
+        self.overhead_label = QLabel("Custo da amostragem: --")
+        style_text(self.overhead_label, "status_label")
+        self.overhead_label.setToolTip("Tempo e CPU gastos pelo próprio PC Control Hub a recolher as métricas.")
+        layout.addWidget(self.overhead_label)
         return page
 
     # --- UI: Página - Rede e Internet ---
@@ -499,17 +972,29 @@ class MainWindow(QMainWindow):
         ip_layout.setContentsMargins(0,0,0,0) 
         
         self.label_local_ip = QLabel("IP Local: --")
-        self.label_local_ip.setStyleSheet("font-size: 16px;")
+        style_text(self.label_local_ip, "ip_label")
         self.label_public_ip = QLabel("IP Público: --")
-        self.label_public_ip.setStyleSheet("font-size: 16px;")
+        style_text(self.label_public_ip, "ip_label")
         
         btn_get_ip = QPushButton("Verificar IPs")
         btn_get_ip.clicked.connect(self.get_ip_info)
         
+        self.label_local_addresses = QLabel("")
+        style_text(self.label_local_addresses, "status_label")
+        self.label_local_addresses.setToolTip("Todos os endereços das placas de rede (psutil.net_if_addrs).")
+
         ip_layout.addWidget(self.label_local_ip)
+        ip_layout.addWidget(self.label_local_addresses)
         ip_layout.addWidget(self.label_public_ip)
         ip_layout.addWidget(btn_get_ip)
         layout.addWidget(ip_frame)
+
+        traffic_label = QLabel("Tráfego por Interface")
+        style_text(traffic_label, "page_title")
+        layout.addWidget(traffic_label)
+        self.label_interfaces = QLabel("A recolher dados...")
+        self.label_interfaces.setToolTip("Débito atual, pico e média do último minuto, pacotes, erros e descartes de cada placa de rede.")
+        layout.addWidget(self.label_interfaces)
         
         separator1 = QFrame()
         separator1.setFrameShape(QFrame.Shape.HLine)
@@ -517,19 +1002,38 @@ class MainWindow(QMainWindow):
         
         layout.addWidget(separator1)
         speed_label = QLabel("Teste de Velocidade (Speedtest)")
-        speed_label.setObjectName("page_title")
+        style_text(speed_label, "page_title")
         layout.addWidget(speed_label)
         results_layout = QHBoxLayout()
         self.label_speed_down = QLabel("Download: -- Mbps")
-        self.label_speed_down.setObjectName("speed_result")
+        style_text(self.label_speed_down, "speed_result")
         self.label_speed_up = QLabel("Upload: -- Mbps")
-        self.label_speed_up.setObjectName("speed_result")
+        style_text(self.label_speed_up, "speed_result")
         self.label_speed_ping = QLabel("Ping: -- ms")
-        self.label_speed_ping.setObjectName("speed_result")
+        style_text(self.label_speed_ping, "speed_result")
         results_layout.addWidget(self.label_speed_down)
         results_layout.addWidget(self.label_speed_up)
         results_layout.addWidget(self.label_speed_ping)
         layout.addLayout(results_layout)
+        speed_options_layout = QHBoxLayout()
+        self.combo_speed_server = QComboBox()
+        self.combo_speed_server.addItem("Ookla (servidor mais próximo)", SPEEDTEST_OOKLA)
+        self.combo_speed_server.addItem("Servidor próprio (URL)", SPEEDTEST_CUSTOM)
+        self.input_speed_url = QLineEdit()
+        self.input_speed_url.setPlaceholderText("http://servidor/ficheiro-grande (GET para download, POST para upload)")
+        self.input_speed_url.setEnabled(False)
+        self.combo_speed_server.currentIndexChanged.connect(
+            lambda: self.input_speed_url.setEnabled(self.combo_speed_server.currentData() == SPEEDTEST_CUSTOM)
+        )
+        self.spin_speed_streams = QSpinBox()
+        self.spin_speed_streams.setRange(1, 32)
+        self.spin_speed_streams.setValue(4)
+        self.spin_speed_streams.setPrefix("Ligações: ")
+        self.spin_speed_streams.setToolTip("Número de ligações em paralelo em cada fase.")
+        speed_options_layout.addWidget(self.combo_speed_server)
+        speed_options_layout.addWidget(self.input_speed_url, 1)
+        speed_options_layout.addWidget(self.spin_speed_streams)
+        layout.addLayout(speed_options_layout)
         self.btn_speedtest = QPushButton("Iniciar Speedtest")
         self.btn_speedtest.clicked.connect(self.start_speedtest)
         layout.addWidget(self.btn_speedtest)
@@ -537,30 +1041,141 @@ class MainWindow(QMainWindow):
         separator2.setFrameShape(QFrame.Shape.HLine)
         separator2.setFrameShadow(QFrame.Shadow.Sunken)
         layout.addWidget(separator2)
-        ping_label = QLabel("Ping Manual (CMD)")
-        ping_label.setObjectName("page_title")
+        ping_label = QLabel("Teste de Latência")
+        style_text(ping_label, "page_title")
         layout.addWidget(ping_label)
         self.input_ping = QLineEdit()
-        self.input_ping.setPlaceholderText("Digite um site (ex: google.com)")
+        self.input_ping.setPlaceholderText("Digite um ou mais sites (ex: google.com, 1.1.1.1, exemplo.pt:80)")
         layout.addWidget(self.input_ping)
-        btn_ping = QPushButton("Testar Ping")
-        btn_ping.clicked.connect(self.start_ping_test)
-        layout.addWidget(btn_ping)
+        ping_options_layout = QHBoxLayout()
+        self.combo_ping_method = QComboBox()
+        self.combo_ping_method.addItem("Ligação TCP", METHOD_TCP)
+        self.combo_ping_method.addItem("Ping (ICMP)", METHOD_PING)
+        self.combo_ping_method.setToolTip("TCP mede o tempo de ligação (porta 443 por omissão); ICMP usa o comando ping.")
+        self.spin_ping_count = QSpinBox()
+        self.spin_ping_count.setRange(1, 100)
+        self.spin_ping_count.setValue(4)
+        self.spin_ping_count.setPrefix("Tentativas: ")
+        self.btn_ping = QPushButton("Testar Latência")
+        self.btn_ping.clicked.connect(self.start_ping_test)
+        ping_options_layout.addWidget(self.combo_ping_method)
+        ping_options_layout.addWidget(self.spin_ping_count)
+        ping_options_layout.addWidget(self.btn_ping)
+        layout.addLayout(ping_options_layout)
         self.text_ping_result = QTextEdit()
         self.text_ping_result.setReadOnly(True)
-        self.text_ping_result.setPlaceholderText("O resultado do ping aparecerá aqui...")
+        self.text_ping_result.setPlaceholderText("Os resultados (mín/méd/máx/p95, jitter e perda) aparecerão aqui à medida que chegam...")
         layout.addWidget(self.text_ping_result)
         self.status_label_rede = QLabel("Aguardando comando...")
-        self.status_label_rede.setObjectName("status_label")
+        style_text(self.status_label_rede, "status_label")
         layout.addWidget(self.status_label_rede)
         return page
 
+    # --- UI: Página - Espaço em Disco ---
+    # Analisador de espaço (mapa e maiores pastas) e ficheiros grandes e duplicados, em separadores.
+    def create_espaco_page(self):
+        page = self.create_page("Espaço em Disco")
+        tabs = QTabWidget()
+        tabs.addTab(self.create_disk_analyzer_tab(), "Onde Está o Espaço")
+        tabs.addTab(self.create_duplicates_tab(), "Ficheiros Grandes e Duplicados")
+        page.layout().addWidget(tabs, 1)
+        return page
+
+    def create_disk_analyzer_tab(self):
+        tab = QWidget()
+        layout = QVBoxLayout(tab)
+        root_layout = QHBoxLayout()
+        self.input_disk_root = QLineEdit()
+        self.input_disk_root.setPlaceholderText("Pasta ou disco a analisar")
+        if os.name == "nt":
+            self.input_disk_root.setText(os.environ.get("SystemDrive", "C:") + os.sep)
+        else:
+            self.input_disk_root.setText(os.path.expanduser("~"))
+        btn_choose_root = QPushButton("Escolher Pasta...")
+        btn_choose_root.clicked.connect(self.choose_disk_root)
+        self.btn_disk_scan = QPushButton("Analisar")
+        self.btn_disk_scan.setToolTip("Lista as pastas em paralelo; o mapa e a lista atualizam-se durante a análise.")
+        self.btn_disk_scan.clicked.connect(self.start_disk_scan)
+        root_layout.addWidget(self.input_disk_root, 1)
+        root_layout.addWidget(btn_choose_root)
+        root_layout.addWidget(self.btn_disk_scan)
+        layout.addLayout(root_layout)
+
+        path_layout = QHBoxLayout()
+        self.btn_disk_up = QPushButton("Subir")
+        self.btn_disk_up.setToolTip("Voltar à pasta mãe")
+        self.btn_disk_up.setEnabled(False)
+        self.btn_disk_up.clicked.connect(self.open_disk_parent)
+        self.label_disk_path = QLabel("")
+        path_layout.addWidget(self.btn_disk_up)
+        path_layout.addWidget(self.label_disk_path, 1)
+        layout.addLayout(path_layout)
+
+        self.disk_treemap = TreemapWidget()
+        self.disk_treemap.setToolTip("Duplo clique numa pasta para entrar nela.")
+        self.disk_treemap.node_activated.connect(self.open_disk_node)
+        layout.addWidget(self.disk_treemap, 3)
+        self.disk_model = DiskUsageModel(self)
+        disk_proxy = QSortFilterProxyModel(self)
+        disk_proxy.setSourceModel(self.disk_model)
+        disk_proxy.setSortRole(SORT_ROLE)
+        disk_proxy.setDynamicSortFilter(True)
+        self.disk_table = QTableView()
+        self.disk_table.setModel(disk_proxy)
+        self.disk_table.setSortingEnabled(True)
+        self.disk_table.sortByColumn(1, Qt.SortOrder.DescendingOrder)
+        self.disk_table.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
+        self.disk_table.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+        self.disk_table.verticalHeader().hide()
+        self.disk_table.horizontalHeader().setSectionResizeMode(0, QHeaderView.ResizeMode.Stretch)
+        self.disk_table.doubleClicked.connect(lambda index: self.open_disk_node(index.data(NODE_ROLE)))
+        layout.addWidget(self.disk_table, 2)
+        self.status_label_disk = QLabel("Aguardando comando...")
+        style_text(self.status_label_disk, "status_label")
+        layout.addWidget(self.status_label_disk)
+        return tab
+
+    def create_duplicates_tab(self):
+        tab = QWidget()
+        layout = QVBoxLayout(tab)
+        roots_layout = QHBoxLayout()
+        self.input_duplicate_roots = QLineEdit()
+        self.input_duplicate_roots.setPlaceholderText("Pastas a analisar, separadas por ;")
+        downloads = os.path.join(os.path.expanduser("~"), "Downloads")
+        if os.path.isdir(downloads):
+            self.input_duplicate_roots.setText(downloads)
+        btn_add_root = QPushButton("Adicionar Pasta...")
+        btn_add_root.clicked.connect(self.add_duplicate_root)
+        self.spin_duplicate_min_size = QSpinBox()
+        self.spin_duplicate_min_size.setRange(1, 100 * 1024)
+        self.spin_duplicate_min_size.setValue(1)
+        self.spin_duplicate_min_size.setPrefix("Mínimo: ")
+        self.spin_duplicate_min_size.setSuffix(" MB")
+        self.spin_duplicate_min_size.setToolTip("Ficheiros mais pequenos são ignorados.")
+        roots_layout.addWidget(self.input_duplicate_roots, 1)
+        roots_layout.addWidget(btn_add_root)
+        roots_layout.addWidget(self.spin_duplicate_min_size)
+        layout.addLayout(roots_layout)
+        self.btn_duplicates = QPushButton("Procurar Duplicados")
+        self.btn_duplicates.setToolTip("Agrupa por tamanho, compara o início e o fim e só depois lê os ficheiros inteiros.")
+        self.btn_duplicates.clicked.connect(self.start_duplicate_scan)
+        layout.addWidget(self.btn_duplicates)
+        self.duplicate_tree = QTreeWidget()
+        self.duplicate_tree.setHeaderLabels(["Ficheiro", "Tamanho", "Recuperável"])
+        self.duplicate_tree.header().setSectionResizeMode(0, QHeaderView.ResizeMode.Stretch)
+        self.duplicate_tree.header().setStretchLastSection(False)
+        layout.addWidget(self.duplicate_tree, 1)
+        self.status_label_espaco = QLabel("Aguardando comando...")
+        style_text(self.status_label_espaco, "status_label")
+        layout.addWidget(self.status_label_espaco)
+        return tab
+
     def create_page(self, title):
         page = QWidget()
         layout = QVBoxLayout(page)
         layout.setAlignment(Qt.AlignmentFlag.AlignTop)
         label = QLabel(title)
-        label.setObjectName("page_title")
+        style_text(label, "page_title")
         layout.addWidget(label)
         return page
 
@@ -579,21 +1194,204 @@ class MainWindow(QMainWindow):
         layout.addWidget(theme_label)
         layout.addWidget(btn_light_mode)
         layout.addWidget(btn_dark_mode)
+        self.theme_status_label = QLabel("")
+        style_text(self.theme_status_label, "status_label")
+        layout.addWidget(self.theme_status_label)
+
+        monitor_label = QLabel("Atualização do Monitor (ms):")
+        spin_monitor_interval = QSpinBox()
+        spin_monitor_interval.setRange(250, 10000)
+        spin_monitor_interval.setSingleStep(250)
+        spin_monitor_interval.setValue(int(self.sampling_policy.visible_interval * 1000))
+        spin_monitor_interval.setToolTip("Intervalo de atualização do Monitor enquanto a página está visível.")
+        spin_monitor_interval.valueChanged.connect(self.set_monitor_interval)
+        recording_label = QLabel("Gravação do histórico em segundo plano (s):")
+        spin_recording_interval = QSpinBox()
+        spin_recording_interval.setRange(1, 60)
+        spin_recording_interval.setValue(int(self.metrics_sampler.record_interval))
+        spin_recording_interval.setToolTip("Intervalo entre amostras gravadas, mesmo com o Monitor escondido.")
+        spin_recording_interval.valueChanged.connect(self.set_recording_interval)
+        layout.addWidget(monitor_label)
+        layout.addWidget(spin_monitor_interval)
+        layout.addWidget(recording_label)
+        layout.addWidget(spin_recording_interval)
+
+        timings_label = QLabel("Tempo de arranque: " + self.startup_timings.summary())
+        timings_label.setWordWrap(True)
+        timings_label.setToolTip("Duração de cada fase do arranque desta sessão.")
+        layout.addWidget(timings_label)
         return page
 
+    # --- Espaço em Disco: analisador ---
+    # - `start_disk_scan`: analisa a pasta escolhida (ou cancela a análise em curso)
+    # - `refresh_disk_view`: redesenha o mapa e a lista a partir da árvore, também durante a análise
+    def choose_disk_root(self):
+        folder = QFileDialog.getExistingDirectory(self, "Escolher pasta a analisar", self.input_disk_root.text())
+        if folder:
+            self.input_disk_root.setText(folder)
+
+    def start_disk_scan(self):
+        if self.disk_job is not None and self.disk_job.active:
+            self.disk_job.cancel()
+            self.status_label_disk.setText("A cancelar análise...")
+            return
+        root = self.input_disk_root.text().strip()
+        if not os.path.isdir(root):
+            self.status_label_disk.setText("Escolha uma pasta existente.")
+            return
+
+        self.disk_scanner = DiskScanner(root)
+        self.disk_node = DiskTree.ROOT
+        self.refresh_disk_view()
+        self.btn_disk_scan.setText("Cancelar")
+        self.status_label_disk.setText("A listar pastas...")
+        self.disk_job = self.scheduler.submit(
+            disk_scan_job, self.disk_scanner,
+            long_running=True, key="disk_scan",
+            on_progress=self.update_disk_progress,
+            on_finished=self.handle_disk_result,
+            on_error=self.handle_disk_error,
+            on_cancelled=self._finish_disk_scan,
+        )
+
+    def update_disk_progress(self, progress):
+        self.status_label_disk.setText(
+            f"A analisar... {progress.dirs_scanned} pastas, {progress.files_scanned} ficheiros "
+            f"({format_bytes(progress.bytes_scanned)})"
+        )
+        self.refresh_disk_view()
+
+    def refresh_disk_view(self):
+        if self.disk_scanner is None:
+            return
+        tree = self.disk_scanner.tree
+        items = tree.top_items(self.disk_node, DISK_TOP_ITEMS)
+        total = tree.total_bytes[self.disk_node]
+        self.disk_treemap.set_items(items)
+        self.disk_model.set_items(items, total)
+        self.label_disk_path.setText(f"{tree.path(self.disk_node)} — {format_bytes(total)}")
+        self.btn_disk_up.setEnabled(self.disk_node != DiskTree.ROOT)
+
+    def open_disk_node(self, node):
+        if node is None or node == NO_NODE or self.disk_scanner is None:
+            return
+        self.disk_node = node
+        self.refresh_disk_view()
+
+    def open_disk_parent(self):
+        if self.disk_scanner is not None and self.disk_node != DiskTree.ROOT:
+            self.open_disk_node(self.disk_scanner.tree.parent[self.disk_node])
+
+    def handle_disk_result(self, result):
+        progress = result.progress
+        state = "Análise cancelada (parcial)" if result.cancelled else "Análise concluída"
+        text = (f"{state}: {format_bytes(progress.bytes_scanned)} em {progress.files_scanned} ficheiros e "
+                f"{progress.dirs_scanned} pastas ({result.elapsed:.1f} s).")
+        if progress.collapsed_dirs:
+            text += f" {progress.collapsed_dirs} pastas agregadas à pasta mãe (limite de memória)."
+        if progress.errors:
+            text += f" {progress.errors} entradas sem acesso."
+        self.status_label_disk.setText(text)
+        self._finish_disk_scan()
+
+    def handle_disk_error(self, err):
+        self.status_label_disk.setText(f"Erro na análise: {err}")
+        self._finish_disk_scan()
+
+    def _finish_disk_scan(self):
+        self.btn_disk_scan.setText("Analisar")
+        self.refresh_disk_view()
+
+    # --- Espaço em Disco: ficheiros grandes e duplicados ---
+    # - `start_duplicate_scan`: procura nas pastas escolhidas (ou cancela a procura em curso)
+    # - `update_duplicate_progress`: cada grupo entra na árvore assim que é confirmado
+    def add_duplicate_root(self):
+        folder = QFileDialog.getExistingDirectory(self, "Escolher pasta a analisar")
+        if folder:
+            roots = self.duplicate_roots()
+            if folder not in roots:
+                self.input_duplicate_roots.setText(";".join(roots + [folder]))
+
+    def duplicate_roots(self):
+        return [root.strip() for root in self.input_duplicate_roots.text().split(";") if root.strip()]
+
+    def start_duplicate_scan(self):
+        if self.duplicate_job is not None and self.duplicate_job.active:
+            self.duplicate_job.cancel()
+            self.status_label_espaco.setText("A cancelar procura...")
+            return
+        roots = [root for root in self.duplicate_roots() if os.path.isdir(root)]
+        if not roots:
+            self.status_label_espaco.setText("Escolha pelo menos uma pasta existente.")
+            return
+
+        self.duplicate_tree.clear()
+        self.btn_duplicates.setText("Cancelar")
+        self.status_label_espaco.setText("A listar pastas...")
+        self.duplicate_job = self.scheduler.submit(
+            duplicate_scan_job, roots, self.hash_cache, self.spin_duplicate_min_size.value() * 1024 * 1024,
+            long_running=True, key="duplicates",
+            on_progress=self.update_duplicate_progress,
+            on_finished=self.handle_duplicate_result,
+            on_error=self.handle_duplicate_error,
+            on_cancelled=self._finish_duplicate_scan,
+        )
+
+    def update_duplicate_progress(self, event):
+        kind, payload = event
+        if kind == "group":
+            group = payload
+            item = QTreeWidgetItem([f"{len(group.paths)} cópias", format_bytes(group.size), format_bytes(group.reclaimable)])
+            item.addChildren([QTreeWidgetItem([path, format_bytes(group.size), ""]) for path in group.paths])
+            self.duplicate_tree.addTopLevelItem(item)
+            return
+        progress = payload
+        if progress.phase == "scanning":
+            text = f"A listar pastas... {progress.files_scanned} ficheiros ({format_bytes(progress.bytes_scanned)})"
+        elif progress.phase == "edges":
+            text = f"A comparar o início e o fim de {progress.candidates} candidatos..."
+        else:
+            text = (f"A confirmar duplicados... {format_bytes(progress.hashed_bytes)} lidos, {progress.groups} grupos "
+                    f"({format_bytes(progress.reclaimable)} recuperáveis)")
+        self.status_label_espaco.setText(text)
+
+    def handle_duplicate_result(self, result):
+        if result.largest:
+            largest = QTreeWidgetItem([f"Maiores ficheiros ({len(result.largest)})", "", ""])
+            largest.addChildren([QTreeWidgetItem([info.path, format_bytes(info.size), ""]) for info in result.largest])
+            self.duplicate_tree.addTopLevelItem(largest)
+        progress = result.progress
+        self.status_label_espaco.setText(
+            f"Procura concluída: {len(result.groups)} grupos de duplicados, {format_bytes(result.reclaimable)} recuperáveis "
+            f"({progress.files_scanned} ficheiros, {format_bytes(progress.hashed_bytes)} lidos, "
+            f"{progress.cache_hits} hashes em cache, {result.elapsed:.1f} s)."
+        )
+        self._finish_duplicate_scan()
+
+    def handle_duplicate_error(self, err):
+        self.status_label_espaco.setText(f"Erro na procura de duplicados: {err}")
+        self._finish_duplicate_scan()
+
+    def _finish_duplicate_scan(self):
+        self.btn_duplicates.setText("Procurar Duplicados")
+
     # --- Helpers de UI ---
     # Funções de apoio à interface, como alteração de tema.
     def set_theme(self, theme):
-        if theme == 'dark':
-            self.setStyleSheet(DARK_STYLE)
-        else:
-            self.setStyleSheet(LIGHT_STYLE)
+        # Só troca a paleta (em cache): sem folhas de estilo para reanalisar
+        seconds = self.theme.apply(theme)
+        if self.theme_status_label is not None:
+            self.theme_status_label.setText(f"Tema aplicado em {seconds * 1000:.2f} ms.")
 
 if __name__ == "__main__":
+    # A procura de duplicados usa vários processos (necessário no executável do PyInstaller)
+    multiprocessing.freeze_support()
     if is_admin():
         app = QApplication(sys.argv)
-        window = MainWindow()
+        window = MainWindow(STARTUP_TIMINGS)
         window.show()
+        # Marca quando o ciclo de eventos arranca, com a janela já mostrada
+        QTimer.singleShot(0, lambda: STARTUP_TIMINGS.mark("janela visível"))
         sys.exit(app.exec())
     else:
         ctypes.windll.shell32.ShellExecuteW(None, "runas", sys.executable, " ".join(sys.argv), None, 1)
\ No newline at end of file
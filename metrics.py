@@ -0,0 +1,277 @@
+"""
+PC Control Hub - metrics.py
+
+Amostragem de CPU, RAM e disco numa thread dedicada. Cada amostra é
+escrita em buffers circulares pré-alocados (`array`), em três níveis:
+segundos (1 hora a 1 Hz), minutos (24 horas) e horas (7 dias). A interface
+só lê instantâneos (`snapshot`) e nunca chama o psutil na sua thread.
+"""
+
+import os
+import threading
+import time
+from array import array
+from dataclasses import dataclass
+
+import psutil
+
+# Capacidade de cada nível do histórico: (nome, amostras por ponto, capacidade)
+TIERS = (
+    ("second", 1, 3600),
+    ("minute", 60, 24 * 60),
+    ("hour", 60, 7 * 24),
+)
+
+DEFAULT_DISK_PATH = 'C:\\' if os.name == 'nt' else '/'
+
+
+class RingBuffer:
+    """ Buffer circular de floats com capacidade fixa; `append` é O(1) e não aloca. """
+
+    def __init__(self, capacity):
+        self.capacity = capacity
+        self._data = array('d', bytes(8 * capacity))
+        self._next = 0
+        self._count = 0
+
+    def append(self, value):
+        self._data[self._next] = value
+        self._next = (self._next + 1) % self.capacity
+        if self._count < self.capacity:
+            self._count += 1
+
+    def latest(self, default=None):
+        if not self._count:
+            return default
+        return self._data[self._next - 1]
+
+    def __len__(self):
+        return self._count
+
+    def values(self, last=None):
+        """ Cópia dos últimos `last` valores (todos, por omissão), do mais antigo ao mais recente. """
+        count = self._count if last is None else min(last, self._count)
+        start = (self._next - count) % self.capacity
+        if start + count <= self.capacity:
+            return self._data[start:start + count]
+        return self._data[start:] + self._data[:self._next]
+
+
+class HistoryTier:
+    """ Um nível do histórico: um `RingBuffer` por canal mais o acumulador para o nível seguinte. """
+
+    def __init__(self, name, channels, capacity, factor):
+        self.name = name
+        self.factor = factor
+        self.buffers = {channel: RingBuffer(capacity) for channel in channels}
+        self._sums = dict.fromkeys(channels, 0.0)
+        self._pending = 0
+
+    def append(self, values):
+        for channel, buffer in self.buffers.items():
+            buffer.append(values[channel])
+
+    def accumulate(self, values, factor):
+        """ Soma `values`; devolve a média quando juntou `factor` amostras, senão None. """
+        for channel in self._sums:
+            self._sums[channel] += values[channel]
+        self._pending += 1
+        if self._pending < factor:
+            return None
+        averaged = {channel: total / self._pending for channel, total in self._sums.items()}
+        for channel in self._sums:
+            self._sums[channel] = 0.0
+        self._pending = 0
+        return averaged
+
+
+class MetricsHistory:
+    def __init__(self, channels, tiers=TIERS):
+        self.channels = tuple(channels)
+        self.tiers = [HistoryTier(name, self.channels, capacity, factor) for name, factor, capacity in tiers]
+
+    def append(self, values):
+        self.tiers[0].append(values)
+        # Cada nível acumula as amostras do anterior e escreve a média no seguinte
+        for lower, upper in zip(self.tiers, self.tiers[1:]):
+            values = lower.accumulate(values, upper.factor)
+            if values is None:
+                break
+            upper.append(values)
+
+    def tier(self, name):
+        for tier in self.tiers:
+            if tier.name == name:
+                return tier
+        raise KeyError(name)
+
+
+@dataclass(frozen=True)
+class SamplerOverhead:
+    samples: int
+    avg_ms: float
+    cpu_percent: float
+
+
+class SamplingPolicy:
+    """ Decide o intervalo de atualização da interface conforme a visibilidade dos dados.
+
+    Com a página do Monitor visível usa `visible_interval`; escondida ou com a janela
+    minimizada usa `hidden_interval` (None = pausa). A gravação em segundo plano
+    (`MetricsSampler.interval`) é independente desta política.
+    """
+
+    def __init__(self, visible_interval=1.0, hidden_interval=None):
+        self.visible_interval = visible_interval
+        self.hidden_interval = hidden_interval
+
+    def interval_for(self, visible):
+        return self.visible_interval if visible else self.hidden_interval
+
+
+@dataclass(frozen=True)
+class MetricsSample:
+    timestamp: float
+    cpu_percent: float
+    cpu_per_core: tuple
+    ram_percent: float
+    ram_used: int
+    ram_total: int
+    disk_path: str
+    disk_percent: float = None
+    disk_used: int = 0
+    disk_total: int = 0
+
+
+def collect_sample(disk_path=DEFAULT_DISK_PATH):
+    per_core = tuple(psutil.cpu_percent(interval=None, percpu=True))
+    ram = psutil.virtual_memory()
+    sample = dict(
+        timestamp=time.time(),
+        cpu_percent=round(sum(per_core) / len(per_core), 1) if per_core else 0.0,
+        cpu_per_core=per_core,
+        ram_percent=ram.percent,
+        ram_used=ram.used,
+        ram_total=ram.total,
+        disk_path=disk_path,
+    )
+    try:
+        disk = psutil.disk_usage(disk_path)
+        sample.update(disk_percent=disk.percent, disk_used=disk.used, disk_total=disk.total)
+    except (FileNotFoundError, OSError):
+        pass
+    return MetricsSample(**sample)
+
+
+class MetricsSampler(threading.Thread):
+    """ Thread de amostragem. `collect` pode ser substituído (ex.: por dados sintéticos em testes).
+
+    A amostragem corre sempre a `interval` (1 Hz): os níveis do histórico, o
+    instantâneo da interface e as janelas dos `collectors` dependem desse ritmo.
+    Só uma em cada `record_every` amostras é entregue a `sinks` (objetos com
+    `append(sample)`, como o `MetricsStore`).
+    `collectors` são leituras extra feitas no mesmo ciclo ({nome: função}); o último
+    resultado de cada uma fica disponível em `latest(nome)`.
+    """
+
+    def __init__(self, interval=1.0, collect=collect_sample, tiers=TIERS, sinks=(), collectors=None,
+                 record_every=1):
+        super().__init__(name="metrics-sampler", daemon=True)
+        self.interval = interval
+        self.record_every = max(1, record_every)
+        self.collect = collect
+        self.sinks = list(sinks)
+        self.collectors = dict(collectors or {})
+        self._extras = {}
+        self._tiers = tiers
+        self._lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._latest = None
+        self.history = None
+        self._samples = 0
+        self._busy_seconds = 0.0
+        self._cpu_seconds = 0.0
+        self._started_at = None
+
+    def stop(self):
+        self._stop_event.set()
+
+    def set_record_interval(self, seconds):
+        """ Intervalo entre amostras gravadas nos `sinks`; a amostragem em si mantém o ritmo. """
+        self.record_every = max(1, round(seconds / self.interval))
+
+    @property
+    def record_interval(self):
+        return self.record_every * self.interval
+
+    def overhead(self):
+        """ Custo da própria amostragem: tempo médio por amostra e % de CPU (de um núcleo) gasto na thread. """
+        with self._lock:
+            samples, busy, cpu = self._samples, self._busy_seconds, self._cpu_seconds
+            started = self._started_at
+        if not samples or started is None:
+            return SamplerOverhead(0, 0.0, 0.0)
+        elapsed = max(time.monotonic() - started, 1e-9)
+        return SamplerOverhead(samples, busy / samples * 1000, cpu / elapsed * 100)
+
+    def snapshot(self):
+        with self._lock:
+            return self._latest
+
+    def latest(self, name):
+        with self._lock:
+            return self._extras.get(name)
+
+    def values(self, channel, tier="second", last=None):
+        with self._lock:
+            if self.history is None:
+                return array('d')
+            return self.history.tier(tier).buffers[channel].values(last)
+
+    def run(self):
+        self._started_at = next_tick = time.monotonic()
+        while not self._stop_event.is_set():
+            wall_start, cpu_start = time.perf_counter(), time.thread_time()
+            try:
+                sample = self.collect()
+                self.record(sample)
+                if self._samples % self.record_every == 0:
+                    for sink in self.sinks:
+                        sink.append(sample)
+            except Exception:
+                # Uma falha isolada do psutil não deve parar a amostragem
+                pass
+            for name, collector in self.collectors.items():
+                try:
+                    result = collector()
+                except Exception:
+                    continue
+                with self._lock:
+                    self._extras[name] = result
+            with self._lock:
+                self._samples += 1
+                self._busy_seconds += time.perf_counter() - wall_start
+                self._cpu_seconds += time.thread_time() - cpu_start
+
+            next_tick += self.interval
+            now = time.monotonic()
+            if next_tick < now:
+                # Atrasado (ex.: suspensão do PC): recomeça a contagem em vez de recuperar amostras
+                next_tick = now
+            self._stop_event.wait(next_tick - now)
+
+    def record(self, sample):
+        values = {
+            "timestamp": sample.timestamp,
+            "cpu": sample.cpu_percent,
+            "ram": sample.ram_percent,
+            "disk": sample.disk_percent if sample.disk_percent is not None else 0.0,
+        }
+        for core, percent in enumerate(sample.cpu_per_core):
+            values[f"cpu{core}"] = percent
+        with self._lock:
+            if self.history is None:
+                # Os canais por núcleo só são conhecidos depois da primeira amostra
+                self.history = MetricsHistory(values.keys(), self._tiers)
+            self.history.append(values)
+            self._latest = sample
@@ -0,0 +1,212 @@
+"""
+PC Control Hub - metrics_store.py
+
+Armazenamento em disco das amostras do monitor. Cada amostra é um registo
+binário de tamanho fixo acrescentado ao fim do segmento atual; os
+segmentos rodam por número de registos e os mais antigos são apagados
+pelos limites de idade e de espaço. As leituras usam `mmap` e pesquisa
+binária pelo timestamp, devolvendo colunas `array` sem interpretar texto.
+"""
+
+import mmap
+import os
+import struct
+import threading
+import time
+from array import array
+
+MAGIC = b'PCHM'
+VERSION = 1
+HEADER = struct.Struct('<4sHH8x')
+# timestamp, cpu %, ram %, disco %, ram usada (bytes)
+RECORD = struct.Struct('<dfffQ')
+FIELDS = ('timestamp', 'cpu', 'ram', 'disk', 'ram_used')
+_TYPECODES = ('d', 'd', 'd', 'd', 'Q')
+
+SEGMENT_PREFIX = 'metrics-'
+SEGMENT_SUFFIX = '.bin'
+
+
+class MetricsStore:
+    """ Registo append-only em segmentos `metrics-<início>.bin` dentro de `directory`.
+
+    `segment_records` define quantas amostras cabem num segmento (1 dia a 1 Hz,
+    por omissão); `max_age_days` e `max_bytes` limitam o histórico guardado.
+    """
+
+    def __init__(self, directory, segment_records=86400, max_age_days=30,
+                 max_bytes=256 * 1024 * 1024, flush_every=10):
+        self.directory = directory
+        self.segment_records = segment_records
+        self.max_age_days = max_age_days
+        self.max_bytes = max_bytes
+        self.flush_every = flush_every
+
+        self._lock = threading.Lock()
+        self._file = None
+        self._records_in_segment = 0
+        self._unflushed = 0
+        self._closed = False
+        os.makedirs(directory, exist_ok=True)
+        # A retenção também corre ao abrir: o histórico antigo sai mesmo sem novas amostras
+        with self._lock:
+            self._apply_retention(time.time())
+
+    # --- Escrita ---
+    def append(self, sample):
+        record = RECORD.pack(
+            sample.timestamp,
+            sample.cpu_percent,
+            sample.ram_percent,
+            sample.disk_percent if sample.disk_percent is not None else 0.0,
+            sample.ram_used,
+        )
+        with self._lock:
+            if self._closed:
+                # Depois de `close()` não se abre outro segmento
+                return
+            if self._file is None or self._records_in_segment >= self.segment_records:
+                self._rotate(sample.timestamp)
+            self._file.write(record)
+            self._records_in_segment += 1
+            self._unflushed += 1
+            if self._unflushed >= self.flush_every:
+                self._file.flush()
+                self._unflushed = 0
+
+    def close(self):
+        with self._lock:
+            self._closed = True
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+    def _rotate(self, timestamp):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+        segments = self._segments()
+        last = segments[-1][1] if segments else None
+        if last is not None and self._record_count(last) < self.segment_records:
+            # Continua o último segmento (ex.: depois de reiniciar a aplicação)
+            self._file = open(last, 'r+b')
+            header = self._file.read(HEADER.size)
+            if len(header) == HEADER.size and self._valid_header(header):
+                self._records_in_segment = self._record_count(last)
+            else:
+                # Cabeçalho incompleto ou de outro formato: o segmento recomeça vazio
+                self._file.seek(0)
+                self._file.write(HEADER.pack(MAGIC, VERSION, RECORD.size))
+                self._records_in_segment = 0
+            self._file.truncate(HEADER.size + self._records_in_segment * RECORD.size)
+            self._file.seek(0, os.SEEK_END)
+        else:
+            path = os.path.join(self.directory, f"{SEGMENT_PREFIX}{int(timestamp * 1000):015d}{SEGMENT_SUFFIX}")
+            self._file = open(path, 'wb')
+            self._file.write(HEADER.pack(MAGIC, VERSION, RECORD.size))
+            self._records_in_segment = 0
+        self._unflushed = 0
+        self._apply_retention(timestamp)
+
+    def _apply_retention(self, now):
+        segments = self._segments()
+        current = self._file.name if self._file is not None else None
+        total = sum(os.path.getsize(path) for _, path in segments)
+        oldest_allowed = now - self.max_age_days * 86400
+        # O último segmento (aberto ou a continuar) nunca é apagado
+        for index, (start, path) in enumerate(segments[:-1]):
+            if path == current:
+                break
+            # O fim de um segmento é o início do seguinte
+            segment_end = segments[index + 1][0]
+            if segment_end >= oldest_allowed and total <= self.max_bytes:
+                break
+            total -= os.path.getsize(path)
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+    # --- Leitura ---
+    def query(self, start=None, end=None):
+        """ Devolve {campo: array} com as amostras em [start, end] (por omissão, tudo). """
+        start = float('-inf') if start is None else start
+        end = float('inf') if end is None else end
+        columns = {name: array(code) for name, code in zip(FIELDS, _TYPECODES)}
+
+        with self._lock:
+            if self._file is not None:
+                self._file.flush()
+                self._unflushed = 0
+            segments = self._segments()
+            for index, (segment_start, path) in enumerate(segments):
+                segment_end = segments[index + 1][0] if index + 1 < len(segments) else float('inf')
+                if segment_end < start or segment_start > end:
+                    continue
+                self._read_segment(path, start, end, columns)
+        return columns
+
+    def _read_segment(self, path, start, end, columns):
+        count = self._record_count(path)
+        if count <= 0:
+            return
+        with open(path, 'rb') as f:
+            with mmap.mmap(f.fileno(), HEADER.size + count * RECORD.size, access=mmap.ACCESS_READ) as view:
+                if not self._valid_header(view[:HEADER.size]):
+                    return
+                first = self._bisect(view, count, start)
+                last = self._bisect(view, count, end, right=True)
+                if first >= last:
+                    return
+                offset = HEADER.size + first * RECORD.size
+                chunk = view[offset:HEADER.size + last * RECORD.size]
+                for record in RECORD.iter_unpack(chunk):
+                    for column, value in zip(columns.values(), record):
+                        column.append(value)
+
+    @staticmethod
+    def _bisect(view, count, timestamp, right=False):
+        low, high = 0, count
+        while low < high:
+            middle = (low + high) // 2
+            value = struct.unpack_from('<d', view, HEADER.size + middle * RECORD.size)[0]
+            if value < timestamp or (right and value == timestamp):
+                low = middle + 1
+            else:
+                high = middle
+        return low
+
+    def _segments(self):
+        segments = []
+        try:
+            names = os.listdir(self.directory)
+        except OSError:
+            return segments
+        for name in names:
+            if name.startswith(SEGMENT_PREFIX) and name.endswith(SEGMENT_SUFFIX):
+                try:
+                    start_ms = int(name[len(SEGMENT_PREFIX):-len(SEGMENT_SUFFIX)])
+                except ValueError:
+                    continue
+                segments.append((start_ms / 1000, os.path.join(self.directory, name)))
+        segments.sort()
+        return segments
+
+    @staticmethod
+    def _valid_header(header):
+        magic, version, record_size = HEADER.unpack(header)
+        return magic == MAGIC and record_size == RECORD.size
+
+    @staticmethod
+    def _record_count(path):
+        try:
+            size = os.path.getsize(path)
+        except OSError:
+            return 0
+        # Um registo incompleto no fim (ex.: falha de energia) é ignorado
+        return max(0, (size - HEADER.size) // RECORD.size)
+
+    def disk_usage(self):
+        return sum(os.path.getsize(path) for _, path in self._segments())
+
@@ -0,0 +1,356 @@
+"""
+PC Control Hub - models.py
+
+Modelos Qt (model/view) usados pelas páginas, e os delegados que os
+desenham. Recebem os dados já processados pelos módulos de backend e só
+notificam a vista sobre as linhas e células que mudaram.
+"""
+
+from PySide6.QtCore import Qt, QAbstractTableModel, QAbstractListModel, QModelIndex, QEvent, QRect, QSize, Signal
+from PySide6.QtGui import QPalette
+from PySide6.QtWidgets import QApplication, QStyledItemDelegate, QStyle, QStyleOptionButton, QPushButton
+
+from processes import COLUMNS, CPU, RSS, IO, THREADS, PID, format_cell
+from cleanup import format_bytes
+
+SORT_ROLE = Qt.ItemDataRole.UserRole
+PROGRAM_ROLE = Qt.ItemDataRole.UserRole + 1
+IMPACT_ROLE = Qt.ItemDataRole.UserRole + 2
+
+
+# --- Modelo da tabela de processos (Monitor) ---
+class ProcessTableModel(QAbstractTableModel):
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._rows = []
+        self._row_of = {}
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._rows)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(COLUMNS)
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if role == Qt.ItemDataRole.DisplayRole and orientation == Qt.Orientation.Horizontal:
+            return COLUMNS[section]
+        return None
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        value = self._rows[index.row()][index.column()]
+        if role == Qt.ItemDataRole.DisplayRole:
+            return format_cell(index.column(), value)
+        if role == SORT_ROLE:
+            # Valores em falta (acesso negado) ficam no fim da ordenação
+            return value if value is not None else -1
+        if role == Qt.ItemDataRole.TextAlignmentRole and index.column() in (PID, CPU, RSS, IO, THREADS):
+            return int(Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter)
+        return None
+
+    def apply_diff(self, diff):
+        """ Aplica um `ProcessDiff`: remoções, alterações célula a célula e inserções no fim. """
+        for pid in diff.removed:
+            self._remove_pid(pid)
+
+        for pid, row in diff.changed.items():
+            position = self._row_of.get(pid)
+            if position is None:
+                continue
+            old = self._rows[position]
+            changed = [column for column in range(len(row)) if old[column] != row[column]]
+            self._rows[position] = row
+            if changed:
+                self.dataChanged.emit(self.index(position, changed[0]), self.index(position, changed[-1]))
+
+        added = [row for row in diff.added if row[PID] not in self._row_of]
+        if added:
+            first = len(self._rows)
+            self.beginInsertRows(QModelIndex(), first, first + len(added) - 1)
+            for row in added:
+                self._row_of[row[PID]] = len(self._rows)
+                self._rows.append(row)
+            self.endInsertRows()
+
+    def _remove_pid(self, pid):
+        # A ordem do modelo não importa (a vista ordena por proxy): a última linha
+        # ocupa o lugar da removida e a remoção fica O(1).
+        position = self._row_of.pop(pid, None)
+        if position is None:
+            return
+        last = len(self._rows) - 1
+        if position != last:
+            moved = self._rows[last]
+            self._rows[position] = moved
+            self._row_of[moved[PID]] = position
+            self.dataChanged.emit(self.index(position, 0), self.index(position, len(COLUMNS) - 1))
+        self.beginRemoveRows(QModelIndex(), last, last)
+        self._rows.pop()
+        self.endRemoveRows()
+
+
+# --- Modelo da lista das maiores pastas (Espaço em Disco) ---
+DISK_COLUMNS = ("Nome", "Tamanho", "Ficheiros", "% da pasta")
+NODE_ROLE = Qt.ItemDataRole.UserRole + 3
+
+
+class DiskUsageModel(QAbstractTableModel):
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._items = []
+        self._total = 0
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._items)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(DISK_COLUMNS)
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if role == Qt.ItemDataRole.DisplayRole and orientation == Qt.Orientation.Horizontal:
+            return DISK_COLUMNS[section]
+        return None
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        item = self._items[index.row()]
+        column = index.column()
+        if role == Qt.ItemDataRole.DisplayRole:
+            if column == 0:
+                return item.name
+            if column == 1:
+                return format_bytes(item.bytes)
+            if column == 2:
+                return str(item.files)
+            return f"{item.bytes * 100 / self._total:.1f} %" if self._total else "--"
+        if role == SORT_ROLE:
+            return (item.name.lower(), item.bytes, item.files, item.bytes)[column]
+        if role == NODE_ROLE:
+            return item.node
+        if role == Qt.ItemDataRole.TextAlignmentRole and column > 0:
+            return int(Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter)
+        return None
+
+    def set_items(self, items, total):
+        """ Mostra `items` (`DiskItem`); se as linhas forem as mesmas, só os valores são notificados. """
+        self._total = total
+        if [(item.node, item.name) for item in items] == [(item.node, item.name) for item in self._items]:
+            self._items = list(items)
+            if self._items:
+                self.dataChanged.emit(self.index(0, 1), self.index(len(self._items) - 1, len(DISK_COLUMNS) - 1))
+            return
+        self.beginResetModel()
+        self._items = list(items)
+        self.endResetModel()
+
+
+# --- Modelo da lista de programas de arranque (Limpeza) ---
+def startup_key(program):
+    """ Identifica uma entrada de arranque: o mesmo nome pode existir em HKCU e HKLM. """
+    return (program["hive"], program["path"], program["name"])
+
+
+class StartupListModel(QAbstractListModel):
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._programs = []
+        # Índices chave -> linha e comando -> linhas; refeitos só quando são precisos depois de remoções
+        self._row_of = {}
+        self._rows_of_command = {}
+        self._index_valid = True
+        self._icons = {}
+        self._impacts = {}
+        self.placeholder_icon = None
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._programs)
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        program = self._programs[index.row()]
+        if role == Qt.ItemDataRole.DisplayRole:
+            return program["name"]
+        if role == Qt.ItemDataRole.DecorationRole:
+            return self._icons.get(program["command"], self.placeholder_icon)
+        if role == Qt.ItemDataRole.ToolTipRole:
+            lines = [program["command"]]
+            if program.get("source"):
+                lines.append(program["source"])
+            impact = self._impacts.get(program["command"])
+            if impact is not None and impact.process_count:
+                lines.append(
+                    f"Impacto {impact.rating}: {impact.process_count} processos, CPU {impact.cpu_seconds:.1f} s, "
+                    f"memória {format_bytes(impact.rss)}, E/S {format_bytes(impact.io_bytes)}"
+                )
+                lines.append(f"Ritmo atual: CPU {impact.cpu_per_window:.1f} s/min, E/S {format_bytes(impact.io_per_window)}/min")
+                if impact.started_after_logon is not None:
+                    lines.append(f"Iniciado {impact.started_after_logon:.0f} s após o início de sessão")
+            return "\n".join(lines)
+        if role == PROGRAM_ROLE:
+            return program
+        if role == IMPACT_ROLE:
+            return self._impacts.get(program["command"])
+        if role == SORT_ROLE:
+            # Maior impacto primeiro; dentro do mesmo nível, quem gasta mais CPU agora
+            impact = self._impacts.get(program["command"])
+            return impact.rank * 1e9 + impact.cpu_per_window if impact is not None else -1.0
+        return None
+
+    def programs(self):
+        return list(self._programs)
+
+    def set_programs(self, programs):
+        """ Aplica uma nova leitura: remove, altera e acrescenta só as entradas diferentes.
+
+        Devolve as entradas novas ou com comando alterado (as que precisam de ícone).
+        """
+        new_keys = {startup_key(program) for program in programs}
+        for position in range(len(self._programs) - 1, -1, -1):
+            if startup_key(self._programs[position]) not in new_keys:
+                self._remove_row(position)
+
+        needs_icon = []
+        added = {}
+        row_of = self._key_index()
+        for program in programs:
+            key = startup_key(program)
+            position = row_of.get(key)
+            if position is None:
+                added[key] = program
+            elif self._programs[position] != program:
+                previous_command = self._programs[position]["command"]
+                if previous_command != program["command"]:
+                    needs_icon.append(program)
+                    self._rows_of_command[previous_command].discard(position)
+                    self._rows_of_command.setdefault(program["command"], set()).add(position)
+                self._programs[position] = program
+                model_index = self.index(position)
+                self.dataChanged.emit(model_index, model_index)
+
+        if added:
+            first = len(self._programs)
+            self.beginInsertRows(QModelIndex(), first, first + len(added) - 1)
+            for key, program in added.items():
+                position = len(self._programs)
+                self._row_of[key] = position
+                self._rows_of_command.setdefault(program["command"], set()).add(position)
+                self._programs.append(program)
+            self.endInsertRows()
+        return needs_icon + list(added.values())
+
+    def remove_program(self, program):
+        position = self._key_index().get(startup_key(program))
+        if position is not None:
+            self._remove_row(position)
+
+    def set_icon(self, command, pixmap):
+        self._icons[command] = pixmap
+        self._key_index()
+        for position in self._rows_of_command.get(command, ()):
+            model_index = self.index(position)
+            self.dataChanged.emit(model_index, model_index, [Qt.ItemDataRole.DecorationRole])
+
+    def set_impacts(self, impacts):
+        """ Recebe {comando: ImpactEstimate} e só notifica as linhas cuja estimativa mudou. """
+        previous, self._impacts = self._impacts, dict(impacts)
+        for position, program in enumerate(self._programs):
+            command = program["command"]
+            if previous.get(command) != self._impacts.get(command):
+                model_index = self.index(position)
+                self.dataChanged.emit(model_index, model_index, [IMPACT_ROLE, SORT_ROLE, Qt.ItemDataRole.ToolTipRole])
+
+    def _remove_row(self, position):
+        # A ordem da lista é a do registo: as linhas seguintes sobem uma posição e os
+        # índices só são refeitos (uma vez) na próxima consulta
+        self.beginRemoveRows(QModelIndex(), position, position)
+        del self._programs[position]
+        self._index_valid = False
+        self.endRemoveRows()
+
+    def _key_index(self):
+        if not self._index_valid:
+            self._row_of = {}
+            self._rows_of_command = {}
+            for position, program in enumerate(self._programs):
+                self._row_of[startup_key(program)] = position
+                self._rows_of_command.setdefault(program["command"], set()).add(position)
+            self._index_valid = True
+        return self._row_of
+
+
+class StartupItemDelegate(QStyledItemDelegate):
+    """ Desenha ícone, nome e botão "Desativar" sem criar widgets por linha. """
+
+    disable_requested = Signal(dict)
+
+    ICON_SIZE = 32
+    BUTTON_WIDTH = 90
+    IMPACT_WIDTH = 140
+    MARGIN = 5
+    SPACING = 10
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        # Botão nunca mostrado: só serve para o estilo desenhar o botão como um QPushButton
+        self._button_template = QPushButton("Desativar", parent)
+        self._button_template.hide()
+
+    def sizeHint(self, option, index):
+        return QSize(option.rect.width(), max(40, self.ICON_SIZE + 2 * self.MARGIN))
+
+    def _button_rect(self, rect):
+        height = min(rect.height() - 2 * self.MARGIN, 30)
+        return QRect(rect.right() - self.MARGIN - self.BUTTON_WIDTH,
+                     rect.top() + (rect.height() - height) // 2, self.BUTTON_WIDTH, height)
+
+    def paint(self, painter, option, index):
+        self.initStyleOption(option, index)
+        widget = option.widget
+        style = widget.style() if widget else QApplication.style()
+        style.drawPrimitive(QStyle.PrimitiveElement.PE_PanelItemViewItem, option, painter, widget)
+        painter.save()
+        painter.setPen(option.palette.color(QPalette.ColorRole.Mid))
+        painter.drawLine(option.rect.bottomLeft(), option.rect.bottomRight())
+        painter.restore()
+
+        rect = option.rect
+        icon_rect = QRect(rect.left() + self.MARGIN, rect.top() + (rect.height() - self.ICON_SIZE) // 2,
+                          self.ICON_SIZE, self.ICON_SIZE)
+        pixmap = index.data(Qt.ItemDataRole.DecorationRole)
+        if pixmap is not None:
+            painter.drawPixmap(icon_rect, pixmap)
+
+        button_rect = self._button_rect(rect)
+        impact_rect = QRect(button_rect.left() - self.SPACING - self.IMPACT_WIDTH, rect.top(),
+                            self.IMPACT_WIDTH, rect.height())
+        text_rect = QRect(icon_rect.right() + self.SPACING, rect.top(),
+                          impact_rect.left() - icon_rect.right() - 2 * self.SPACING, rect.height())
+        text = option.fontMetrics.elidedText(option.text, Qt.TextElideMode.ElideRight, text_rect.width())
+        selected = bool(option.state & QStyle.StateFlag.State_Selected)
+        painter.save()
+        painter.setPen(option.palette.color(
+            QPalette.ColorRole.HighlightedText if selected else QPalette.ColorRole.Text))
+        painter.drawText(text_rect, int(Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignVCenter), text)
+        impact = index.data(IMPACT_ROLE)
+        if impact is not None:
+            painter.drawText(impact_rect, int(Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter),
+                             f"Impacto: {impact.rating}")
+        painter.restore()
+
+        button = QStyleOptionButton()
+        button.initFrom(self._button_template)
+        button.rect = button_rect
+        button.text = "Desativar"
+        button.state = QStyle.StateFlag.State_Enabled | QStyle.StateFlag.State_Raised
+        self._button_template.style().drawControl(QStyle.ControlElement.CE_PushButton, button, painter, self._button_template)
+
+    def editorEvent(self, event, model, option, index):
+        if (event.type() == QEvent.Type.MouseButtonRelease
+                and event.button() == Qt.MouseButton.LeftButton
+                and self._button_rect(option.rect).contains(event.position().toPoint())):
+            self.disable_requested.emit(index.data(PROGRAM_ROLE))
+            return True
+        return super().editorEvent(event, model, option, index)
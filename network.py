@@ -0,0 +1,111 @@
+"""
+PC Control Hub - network.py
+
+Débito de rede ao vivo por interface, a partir das diferenças entre
+leituras de `psutil.net_io_counters(pernic=True)`. Cada interface guarda
+uma janela deslizante (`RingBuffer`) para calcular picos e médias sem
+guardar o histórico completo.
+"""
+
+import time
+from dataclasses import dataclass
+
+import psutil
+
+from metrics import RingBuffer
+
+
+@dataclass(frozen=True)
+class InterfaceRate:
+    name: str
+    rx_bps: float
+    tx_bps: float
+    rx_pps: float
+    tx_pps: float
+    errors_ps: float
+    drops_ps: float
+    rx_peak: float
+    rx_avg: float
+    tx_peak: float
+    tx_avg: float
+    errors_total: int
+    drops_total: int
+
+
+class _InterfaceWindow:
+    def __init__(self, size):
+        self.rx = RingBuffer(size)
+        self.tx = RingBuffer(size)
+
+
+class NetworkMonitor:
+    """ `sample()` devolve {interface: InterfaceRate}; picos e médias cobrem os últimos `window_seconds`.
+
+    `interval` é o ritmo a que `sample()` é chamado (o do `MetricsSampler`, fixo em 1 Hz):
+    a janela guarda `window_seconds / interval` amostras.
+    """
+
+    def __init__(self, window_seconds=60.0, interval=1.0, include_loopback=False):
+        self.window = max(1, round(window_seconds / interval))
+        self.include_loopback = include_loopback
+        self._last_counters = None
+        self._last_time = None
+        self._windows = {}
+
+    def sample(self):
+        now = time.monotonic()
+        counters = psutil.net_io_counters(pernic=True)
+        if not self.include_loopback:
+            counters = {name: c for name, c in counters.items() if not _is_loopback(name)}
+
+        rates = {}
+        if self._last_counters is not None and now > self._last_time:
+            elapsed = now - self._last_time
+            for name, current in counters.items():
+                previous = self._last_counters.get(name)
+                if previous is None:
+                    continue
+                rates[name] = self._rate(name, current, previous, elapsed)
+
+        # Interfaces que desapareceram (ex.: VPN desligada) deixam de ocupar memória
+        for name in list(self._windows):
+            if name not in counters:
+                del self._windows[name]
+        self._last_counters = counters
+        self._last_time = now
+        return rates
+
+    def _rate(self, name, current, previous, elapsed):
+        def per_second(attribute):
+            # Contadores que voltam a zero (reset do driver) contam como 0
+            return max(0, getattr(current, attribute) - getattr(previous, attribute)) / elapsed
+
+        rx_bps = per_second('bytes_recv')
+        tx_bps = per_second('bytes_sent')
+        window = self._windows.get(name)
+        if window is None:
+            window = self._windows[name] = _InterfaceWindow(self.window)
+        window.rx.append(rx_bps)
+        window.tx.append(tx_bps)
+        rx_values, tx_values = window.rx.values(), window.tx.values()
+
+        return InterfaceRate(
+            name=name,
+            rx_bps=rx_bps,
+            tx_bps=tx_bps,
+            rx_pps=per_second('packets_recv'),
+            tx_pps=per_second('packets_sent'),
+            errors_ps=per_second('errin') + per_second('errout'),
+            drops_ps=per_second('dropin') + per_second('dropout'),
+            rx_peak=max(rx_values),
+            rx_avg=sum(rx_values) / len(rx_values),
+            tx_peak=max(tx_values),
+            tx_avg=sum(tx_values) / len(tx_values),
+            errors_total=current.errin + current.errout,
+            drops_total=current.dropin + current.dropout,
+        )
+
+
+def _is_loopback(name):
+    lowered = name.lower()
+    return lowered == 'lo' or lowered.startswith('loopback')
@@ -0,0 +1,218 @@
+"""
+PC Control Hub - probes.py
+
+Motor de testes de latência com asyncio: testa dezenas ou centenas de
+destinos em simultâneo, por ligação TCP ou pelo comando `ping` do sistema
+(sem shell), e calcula mín/méd/máx/p95, jitter e perda por destino. Os
+resultados são entregues por callbacks à medida que chegam.
+"""
+
+import asyncio
+import math
+import re
+import socket
+import subprocess
+import sys
+import time
+from dataclasses import dataclass, field
+
+METHOD_TCP = "tcp"
+METHOD_PING = "ping"
+
+# "time=12.3 ms", "tempo=12ms", "time<1ms" (Windows e Linux, várias línguas)
+_PING_TIME_RE = re.compile(r'[=<]\s*([\d]+(?:[.,]\d+)?)\s*ms', re.IGNORECASE)
+
+
+@dataclass
+class ProbeResult:
+    target: str
+    sent: int = 0
+    rtts: list = field(default_factory=list)
+    error: str = None
+
+    @property
+    def received(self):
+        return len(self.rtts)
+
+    @property
+    def loss_percent(self):
+        return 100.0 * (self.sent - self.received) / self.sent if self.sent else 0.0
+
+    @property
+    def min_ms(self):
+        return min(self.rtts) if self.rtts else None
+
+    @property
+    def max_ms(self):
+        return max(self.rtts) if self.rtts else None
+
+    @property
+    def avg_ms(self):
+        return sum(self.rtts) / len(self.rtts) if self.rtts else None
+
+    @property
+    def p95_ms(self):
+        if not self.rtts:
+            return None
+        ordered = sorted(self.rtts)
+        return ordered[max(0, math.ceil(0.95 * len(ordered)) - 1)]
+
+    @property
+    def jitter_ms(self):
+        """ Média da diferença absoluta entre respostas consecutivas. """
+        if len(self.rtts) < 2:
+            return 0.0 if self.rtts else None
+        return sum(abs(b - a) for a, b in zip(self.rtts, self.rtts[1:])) / (len(self.rtts) - 1)
+
+    def summary(self):
+        if not self.rtts:
+            reason = self.error or "sem resposta"
+            return f"{self.target}: {reason} (perda {self.loss_percent:.0f}%)"
+        return (
+            f"{self.target}: mín {self.min_ms:.1f} / méd {self.avg_ms:.1f} / máx {self.max_ms:.1f} / "
+            f"p95 {self.p95_ms:.1f} ms, jitter {self.jitter_ms:.1f} ms, perda {self.loss_percent:.0f}%"
+        )
+
+
+def parse_targets(text):
+    """ Separa a lista escrita pelo utilizador (vírgulas, espaços ou linhas) e remove repetidos. """
+    targets = []
+    for item in re.split(r'[\s,;]+', text):
+        if item and item not in targets:
+            targets.append(item)
+    return targets
+
+
+class LatencyProber:
+    """ Testa `targets` com `count` tentativas cada, espaçadas por `interval` segundos.
+
+    `on_reply(target, rtt_ms_or_None)` é chamado a cada tentativa e `on_result(ProbeResult)`
+    quando um destino termina. No método TCP, um destino pode indicar a porta (`host:porta`).
+    """
+
+    def __init__(self, targets, method=METHOD_TCP, count=4, interval=0.5, timeout=2.0,
+                 port=443, concurrency=64, on_reply=None, on_result=None):
+        self.targets = list(targets)
+        self.method = method
+        self.count = max(1, count)
+        self.interval = interval
+        self.timeout = timeout
+        self.port = port
+        self.concurrency = max(1, concurrency)
+        self.on_reply = on_reply
+        self.on_result = on_result
+        self._cancelled = False
+
+    def cancel(self):
+        self._cancelled = True
+
+    def run(self):
+        """ Versão síncrona de `run_async`, para threads sem event loop. """
+        return asyncio.run(self.run_async())
+
+    async def run_async(self):
+        semaphore = asyncio.Semaphore(self.concurrency)
+        tasks = [asyncio.create_task(self._probe_target(target, semaphore)) for target in self.targets]
+        return list(await asyncio.gather(*tasks))
+
+    async def _probe_target(self, target, semaphore):
+        result = ProbeResult(target=target)
+        async with semaphore:
+            try:
+                probe = await self._prepare(target)
+            except (OSError, ValueError) as e:
+                result.error = f"erro: {e}"
+                probe = None
+
+            if probe is not None:
+                for attempt in range(self.count):
+                    if self._cancelled:
+                        break
+                    if attempt:
+                        await asyncio.sleep(self.interval)
+                    result.sent += 1
+                    rtt = await probe()
+                    if rtt is not None:
+                        result.rtts.append(rtt)
+                    if self.on_reply:
+                        self.on_reply(target, rtt)
+
+        if self.on_result:
+            self.on_result(result)
+        return result
+
+    async def _prepare(self, target):
+        if target.startswith('-'):
+            # Nunca passar opções ao comando ping a partir do texto do utilizador
+            raise ValueError("destino inválido")
+        if self.method == METHOD_PING:
+            return lambda: self._ping_once(target)
+
+        host, port = _split_host_port(target, self.port)
+        # Resolve o nome uma única vez para o DNS não contar na latência
+        loop = asyncio.get_running_loop()
+        infos = await loop.getaddrinfo(host, port, type=socket.SOCK_STREAM)
+        address = infos[0][4]
+        return lambda: self._tcp_once(address[0], address[1])
+
+    async def _tcp_once(self, host, port):
+        start = time.perf_counter()
+        try:
+            _, writer = await asyncio.wait_for(asyncio.open_connection(host, port), self.timeout)
+        except (OSError, asyncio.TimeoutError):
+            return None
+        rtt = (time.perf_counter() - start) * 1000
+        writer.close()
+        try:
+            await writer.wait_closed()
+        except OSError:
+            pass
+        return rtt
+
+    async def _ping_once(self, host):
+        extra = {}
+        if sys.platform == 'win32':
+            args = ['ping', '-n', '1', '-w', str(int(self.timeout * 1000)), host]
+            # Sem janela de consola a piscar quando a aplicação corre sem consola
+            extra['creationflags'] = subprocess.CREATE_NO_WINDOW
+        else:
+            args = ['ping', '-c', '1', '-W', str(max(1, math.ceil(self.timeout))), host]
+        try:
+            process = await asyncio.create_subprocess_exec(
+                *args, stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.DEVNULL, **extra
+            )
+        except OSError:
+            return None
+        try:
+            output, _ = await asyncio.wait_for(process.communicate(), self.timeout + 1)
+        except asyncio.TimeoutError:
+            await _kill(process)
+            return None
+        except asyncio.CancelledError:
+            await _kill(process)
+            raise
+        if process.returncode != 0:
+            return None
+        # Sem tempo na saída (ex.: "Destino inacessível" com código 0 no Windows) conta como perda
+        match = _PING_TIME_RE.search(output.decode(errors='replace'))
+        return float(match.group(1).replace(',', '.')) if match else None
+
+
+async def _kill(process):
+    # Sem `wait` o processo fica zombie e o transporte só fecha no fim do loop
+    try:
+        process.kill()
+    except ProcessLookupError:
+        pass
+    await process.wait()
+
+
+def _split_host_port(target, default_port):
+    if target.startswith('['):
+        # IPv6 com porta: [::1]:8080
+        host, _, rest = target[1:].partition(']')
+        return host, int(rest[1:]) if rest.startswith(':') else default_port
+    if target.count(':') == 1:
+        host, port = target.split(':')
+        return host, int(port)
+    return target, default_port
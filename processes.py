@@ -0,0 +1,111 @@
+"""
+PC Control Hub - processes.py
+
+Tabela de processos do Monitor. O `ProcessTracker` (sem Qt) lê todos os
+processos de uma vez com `psutil.process_iter(attrs=...)`, mantém os
+objetos `psutil.Process` em cache entre leituras e devolve apenas as
+diferenças. O `ProcessTableModel` aplica essas diferenças linha a linha,
+sem reconstruir a tabela.
+"""
+
+import time
+from dataclasses import dataclass, field
+
+import psutil
+
+from cleanup import format_bytes
+
+COLUMNS = ("PID", "Nome", "CPU %", "Memória", "E/S", "Threads")
+PID, NAME, CPU, RSS, IO, THREADS = range(len(COLUMNS))
+
+_ATTRS = ['pid', 'name', 'cpu_percent', 'memory_info', 'io_counters', 'num_threads']
+
+
+@dataclass
+class ProcessDiff:
+    added: list = field(default_factory=list)
+    removed: list = field(default_factory=list)
+    changed: dict = field(default_factory=dict)
+
+    def __bool__(self):
+        return bool(self.added or self.removed or self.changed)
+
+
+class ProcessTracker:
+    def __init__(self):
+        self._processes = {}
+        self._rows = {}
+        self._io_totals = {}
+        self._last_poll = None
+        self._cpu_count = psutil.cpu_count() or 1
+
+    def poll(self):
+        """ Lê o estado atual e devolve um `ProcessDiff` em relação à leitura anterior. """
+        now = time.monotonic()
+        elapsed = now - self._last_poll if self._last_poll else None
+        self._last_poll = now
+
+        diff = ProcessDiff()
+        seen = set()
+        for proc in psutil.process_iter(attrs=_ATTRS, ad_value=None):
+            info = proc.info
+            pid = info['pid']
+            seen.add(pid)
+
+            cached = self._processes.get(pid)
+            if cached is not None and cached != proc:
+                # PID reutilizado por outro processo: trata como remoção + inserção
+                self._forget(pid)
+                diff.removed.append(pid)
+            self._processes[pid] = proc
+
+            row = self._build_row(pid, info, elapsed)
+            previous = self._rows.get(pid)
+            self._rows[pid] = row
+            if previous is None:
+                diff.added.append(row)
+            elif previous != row:
+                diff.changed[pid] = row
+
+        for pid in list(self._processes):
+            if pid not in seen:
+                self._forget(pid)
+                diff.removed.append(pid)
+        return diff
+
+    def _forget(self, pid):
+        self._processes.pop(pid, None)
+        self._rows.pop(pid, None)
+        self._io_totals.pop(pid, None)
+
+    def _build_row(self, pid, info, elapsed):
+        memory = info['memory_info']
+        io = info['io_counters']
+        io_rate = None
+        if io is not None:
+            total = io.read_bytes + io.write_bytes
+            previous = self._io_totals.get(pid)
+            self._io_totals[pid] = total
+            if previous is not None and elapsed:
+                io_rate = max(0.0, (total - previous) / elapsed)
+        cpu = info['cpu_percent']
+        return (
+            pid,
+            info['name'] or "",
+            round(cpu / self._cpu_count, 1) if cpu is not None else None,
+            memory.rss if memory is not None else None,
+            io_rate,
+            info['num_threads'],
+        )
+
+
+def format_cell(column, value):
+    if value is None:
+        return "--"
+    if column == CPU:
+        return f"{value:.1f}"
+    if column == RSS:
+        return format_bytes(value)
+    if column == IO:
+        return f"{format_bytes(value)}/s"
+    return str(value)
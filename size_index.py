@@ -0,0 +1,194 @@
+"""
+PC Control Hub - size_index.py
+
+Índice persistente do tamanho de cada pasta, indexado pelo caminho e pelo
+`mtime` da pasta. Uma nova análise só volta a listar as pastas cujo `mtime`
+mudou desde a última vez; as restantes reaproveitam os valores guardados.
+
+Nota: o `mtime` de uma pasta muda quando entradas são criadas, apagadas ou
+renomeadas, mas não quando um ficheiro existente cresce. O índice é uma
+estimativa rápida para pré-visualização, não uma contagem exata.
+"""
+
+import json
+import os
+import threading
+import time
+from dataclasses import dataclass
+
+from fswalk import is_reparse_point
+
+# Posições dos campos em cada entrada do índice (lista compacta para o JSON)
+_MTIME, _FILE_BYTES, _FILE_COUNT, _SUBDIRS = range(4)
+
+
+@dataclass
+class ScanSummary:
+    root: str
+    total_bytes: int = 0
+    total_files: int = 0
+    dirs_listed: int = 0
+    dirs_reused: int = 0
+    elapsed: float = 0.0
+
+
+class DirSizeIndex:
+    def __init__(self, index_path=None):
+        self.index_path = index_path
+        self._entries = {}
+        self._totals = {}
+        self._lock = threading.Lock()
+        self._dirty = False
+        self._loaded = False
+
+    def load(self):
+        self._loaded = True
+        if not self.index_path or not os.path.exists(self.index_path):
+            return
+        try:
+            with open(self.index_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+        with self._lock:
+            self._entries = data.get("entries", {})
+            self._totals = {}
+
+    def save(self):
+        if not self.index_path:
+            return
+        with self._lock:
+            if not self._dirty:
+                return
+            payload = {"entries": self._entries}
+            self._dirty = False
+        tmp_path = self.index_path + ".tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(payload, f, separators=(",", ":"))
+        os.replace(tmp_path, self.index_path)
+
+    def scan(self, root):
+        """ Atualiza o índice para a árvore em `root` e devolve um `ScanSummary`. """
+        if not self._loaded:
+            self.load()
+        start = time.perf_counter()
+        summary = ScanSummary(root=root)
+        visited = []
+        fresh = {}
+
+        # A travessia não segura o lock: as leituras do índice (`total_size`,
+        # `empty_dirs`) continuam a responder com os valores anteriores
+        stack = [root]
+        while stack:
+            path = stack.pop()
+            entry = self._refresh_directory(path, summary, fresh)
+            if entry is None:
+                continue
+            visited.append(path)
+            stack.extend(os.path.join(path, name) for name in entry[_SUBDIRS])
+
+        with self._lock:
+            if fresh:
+                self._entries.update(fresh)
+                self._dirty = True
+            self._prune(root, set(visited))
+            self._totals.update(self._sum_totals(visited))
+            summary.total_bytes, summary.total_files = self._totals.get(root, (0, 0))
+        summary.elapsed = time.perf_counter() - start
+        return summary
+
+    def total_size(self, path):
+        with self._lock:
+            return self._totals.get(path, (0, 0))[0]
+
+    def empty_dirs(self, root):
+        """ Pastas abaixo de `root` que o índice guardado dá como sem ficheiros.
+
+        Devolve `{caminho: [caminhos das subpastas]}` para quem as apaga de
+        baixo para cima sem as listar. Não lista nada no disco: só confirma,
+        com um `stat` por pasta, que o `mtime` ainda é o do índice.
+        """
+        if not self._loaded:
+            self.load()
+        with self._lock:
+            visited = []
+            stack = [root]
+            while stack:
+                path = stack.pop()
+                entry = self._entries.get(path)
+                if entry is None:
+                    continue
+                visited.append(path)
+                stack.extend(os.path.join(path, name) for name in entry[_SUBDIRS])
+            totals = self._sum_totals(visited)
+            candidates = {
+                path: [os.path.join(path, name) for name in self._entries[path][_SUBDIRS]]
+                for path in visited[1:] if totals[path][1] == 0
+            }
+            mtimes = {path: self._entries[path][_MTIME] for path in candidates}
+
+        result = {}
+        for path, subdirs in candidates.items():
+            try:
+                if os.stat(path).st_mtime_ns == mtimes[path]:
+                    result[path] = subdirs
+            except OSError:
+                continue
+        return result
+
+    def _sum_totals(self, visited):
+        """ Soma de baixo para cima: a ordem inversa da descoberta põe os filhos antes dos pais. """
+        totals = {}
+        for path in reversed(visited):
+            entry = self._entries[path]
+            total_bytes, total_files = entry[_FILE_BYTES], entry[_FILE_COUNT]
+            for name in entry[_SUBDIRS]:
+                child_bytes, child_files = totals.get(os.path.join(path, name), (0, 0))
+                total_bytes += child_bytes
+                total_files += child_files
+            totals[path] = (total_bytes, total_files)
+        return totals
+
+    def _refresh_directory(self, path, summary, fresh):
+        try:
+            mtime = os.stat(path).st_mtime_ns
+        except OSError:
+            return None
+
+        cached = self._entries.get(path)
+        if cached is not None and cached[_MTIME] == mtime:
+            summary.dirs_reused += 1
+            return cached
+
+        file_bytes, file_count, subdirs = 0, 0, []
+        try:
+            with os.scandir(path) as entries:
+                for entry in entries:
+                    try:
+                        # Junções contam como entradas da pasta, nunca como subpastas a somar
+                        if entry.is_dir(follow_symlinks=False) and not is_reparse_point(entry):
+                            subdirs.append(entry.name)
+                        else:
+                            file_bytes += entry.stat(follow_symlinks=False).st_size
+                            file_count += 1
+                    except OSError:
+                        continue
+        except OSError:
+            return None
+
+        entry = [mtime, file_bytes, file_count, subdirs]
+        fresh[path] = entry
+        summary.dirs_listed += 1
+        return entry
+
+    def _prune(self, root, visited):
+        prefix = os.path.join(root, "")
+        stale = [
+            path for path in self._entries
+            if (path == root or path.startswith(prefix)) and path not in visited
+        ]
+        for path in stale:
+            del self._entries[path]
+            self._totals.pop(path, None)
+        if stale:
+            self._dirty = True
@@ -0,0 +1,223 @@
+"""
+PC Control Hub - startup_impact.py
+
+Estimativa do impacto de cada programa de arranque a partir do que os
+seus processos gastam de facto. Cada entrada é associada aos processos em
+execução pelo caminho do executável (atalhos .lnk incluídos) e soma-se o
+tempo de CPU, a memória (RSS) e as E/S de disco de toda a árvore (o
+processo e os seus filhos).
+
+Os limites seguem os do Gestor de Tarefas do Windows (Alto: mais de 1 s
+de CPU ou 3 MB de E/S; Médio: mais de 300 ms ou 300 KB), aplicados a uma
+janela de `IMPACT_WINDOW` segundos: a classificação usa o ritmo de CPU e
+E/S entre duas leituras (na primeira, desde a criação do processo), e não
+os totais acumulados, que cresceriam sem limite num processo que corre
+há dias.
+
+Por leitura há uma só passagem por `psutil.process_iter`; o caminho do
+executável (a chamada mais cara) fica em cache por PID e hora de criação,
+e só os processos associados a entradas são consultados em detalhe.
+"""
+
+import getpass
+import os
+import time
+from collections import deque
+from dataclasses import dataclass
+
+import psutil
+
+IMPACT_HIGH = "Alto"
+IMPACT_MEDIUM = "Médio"
+IMPACT_LOW = "Baixo"
+IMPACT_NONE = "Sem processo"
+
+# Ordem usada para ordenar a lista (maior impacto primeiro)
+IMPACT_RANK = {IMPACT_HIGH: 3, IMPACT_MEDIUM: 2, IMPACT_LOW: 1, IMPACT_NONE: 0}
+
+HIGH_CPU_SECONDS, HIGH_IO_BYTES = 1.0, 3 * 1024 * 1024
+MEDIUM_CPU_SECONDS, MEDIUM_IO_BYTES = 0.3, 300 * 1024
+# Os limites acima são por esta janela (segundos); o ritmo medido é convertido para ela
+IMPACT_WINDOW = 60.0
+
+
+@dataclass(frozen=True)
+class ImpactEstimate:
+    rating: str
+    process_count: int = 0
+    cpu_seconds: float = 0.0
+    rss: int = 0
+    io_bytes: int = 0
+    started_after_logon: float = None
+    # CPU (s) e E/S (bytes) por `IMPACT_WINDOW`, ao ritmo da última medição
+    cpu_per_window: float = 0.0
+    io_per_window: float = 0.0
+
+    @property
+    def rank(self):
+        return IMPACT_RANK[self.rating]
+
+
+def rate_impact(cpu_seconds, io_bytes):
+    if cpu_seconds > HIGH_CPU_SECONDS or io_bytes > HIGH_IO_BYTES:
+        return IMPACT_HIGH
+    if cpu_seconds > MEDIUM_CPU_SECONDS or io_bytes > MEDIUM_IO_BYTES:
+        return IMPACT_MEDIUM
+    return IMPACT_LOW
+
+
+def logon_time():
+    """ Início da sessão do utilizador atual (ou o arranque do sistema, se não for possível saber). """
+    try:
+        user = getpass.getuser().lower()
+        starts = [session.started for session in psutil.users() if session.name.lower() == user]
+    except Exception:
+        starts = []
+    return min(starts) if starts else psutil.boot_time()
+
+
+def _default_resolver(command):
+    from utils import executable_candidates
+    return list(executable_candidates(command))
+
+
+class StartupImpactEstimator:
+    """ `estimate(entradas)` devolve {comando: ImpactEstimate}.
+
+    `resolver(comando)` devolve os caminhos dos executáveis de uma entrada; o padrão usa as
+    mesmas regras do Gestor de Arranque (incluindo os lançadores Update.exe).
+    """
+
+    def __init__(self, resolver=None):
+        self.resolver = resolver or _default_resolver
+        self._paths = {}
+        self._exe_cache = {}
+        # (pid, criação) -> (cpu, e/s, instante) da leitura anterior, para medir o ritmo
+        self._previous = {}
+        self._logon_time = None
+
+    def estimate(self, entries):
+        if self._logon_time is None:
+            self._logon_time = logon_time()
+
+        processes, children, by_exe = self._snapshot()
+        usage = {}
+        estimates = {}
+        now = time.time()
+        for entry in entries:
+            command = entry["command"]
+            if command in estimates:
+                continue
+            roots = [pid for path in self._paths_for(command) for pid in by_exe.get(path, ())]
+            tree = _process_tree(roots, children)
+            estimates[command] = self._aggregate(tree, processes, usage, now)
+        # Só fica a referência dos processos medidos nesta leitura
+        self._previous = {
+            (pid, created): (cpu_seconds, io_bytes, now)
+            for pid, (cpu_seconds, _, io_bytes, created) in usage.items()
+        }
+        return estimates
+
+    def _paths_for(self, command):
+        paths = self._paths.get(command)
+        if paths is None:
+            paths = self._paths[command] = {_normalize_path(p) for p in self.resolver(command)}
+        return paths
+
+    def _snapshot(self):
+        processes, children, by_exe = {}, {}, {}
+        exe_cache = {}
+        for proc in psutil.process_iter(attrs=['pid', 'ppid', 'create_time'], ad_value=None):
+            info = proc.info
+            pid = info['pid']
+            processes[pid] = (proc, info['create_time'])
+            children.setdefault(info['ppid'], []).append(pid)
+
+            cache_key = (pid, info['create_time'])
+            exe = self._exe_cache.get(cache_key, False)
+            if exe is False:
+                try:
+                    exe = proc.exe() or None
+                except (psutil.Error, OSError):
+                    exe = None
+                # Normalizado como os caminhos das entradas (links e maiúsculas)
+                exe = _normalize_path(exe) if exe else None
+            exe_cache[cache_key] = exe
+            if exe:
+                by_exe.setdefault(exe, []).append(pid)
+        # Só ficam em cache os processos que ainda existem
+        self._exe_cache = exe_cache
+        return processes, children, by_exe
+
+    def _aggregate(self, tree, processes, usage, now):
+        if not tree:
+            return ImpactEstimate(rating=IMPACT_NONE)
+        cpu_seconds, rss, io_bytes, first_start = 0.0, 0, 0, None
+        cpu_per_window, io_per_window = 0.0, 0.0
+        for pid in tree:
+            if pid not in usage:
+                usage[pid] = _process_usage(*processes[pid])
+            proc_cpu, proc_rss, proc_io, created = usage[pid]
+            cpu_seconds += proc_cpu
+            rss += proc_rss
+            io_bytes += proc_io
+            if created is not None and (first_start is None or created < first_start):
+                first_start = created
+            # Ritmo desde a leitura anterior; um processo novo conta desde a sua criação
+            previous_cpu, previous_io, since = self._previous.get((pid, created), (0.0, 0, created or now))
+            scale = IMPACT_WINDOW / max(now - since, 1.0)
+            cpu_per_window += max(0.0, proc_cpu - previous_cpu) * scale
+            io_per_window += max(0, proc_io - previous_io) * scale
+        return ImpactEstimate(
+            rating=rate_impact(cpu_per_window, io_per_window),
+            cpu_per_window=cpu_per_window,
+            io_per_window=io_per_window,
+            process_count=len(tree),
+            cpu_seconds=cpu_seconds,
+            rss=rss,
+            io_bytes=io_bytes,
+            started_after_logon=first_start - self._logon_time if first_start is not None else None,
+        )
+
+
+def _normalize_path(path):
+    try:
+        return os.path.normcase(os.path.realpath(path))
+    except (OSError, ValueError):
+        return os.path.normcase(path)
+
+
+def _process_tree(roots, children):
+    """ PIDs das raízes e de todos os descendentes (sem repetir quando uma raiz é filha de outra). """
+    tree = set()
+    queue = deque(roots)
+    while queue:
+        pid = queue.popleft()
+        if pid in tree:
+            continue
+        tree.add(pid)
+        queue.extend(children.get(pid, ()))
+    return tree
+
+
+def _process_usage(proc, created):
+    cpu_seconds, rss, io_bytes = 0.0, 0, 0
+    try:
+        with proc.oneshot():
+            try:
+                times = proc.cpu_times()
+                cpu_seconds = times.user + times.system
+            except (psutil.AccessDenied, AttributeError):
+                pass
+            try:
+                rss = proc.memory_info().rss
+            except psutil.AccessDenied:
+                pass
+            try:
+                counters = proc.io_counters()
+                io_bytes = counters.read_bytes + counters.write_bytes
+            except (psutil.AccessDenied, AttributeError):
+                pass
+    except psutil.NoSuchProcess:
+        pass
+    return cpu_seconds, rss, io_bytes, created
@@ -0,0 +1,196 @@
+"""
+PC Control Hub - startup_snapshots.py
+
+Histórico de estados do Gestor de Arranque. Cada estado guardado tem nome
+e data; o conteúdo (a lista de entradas) é guardado uma única vez por
+hash SHA-256 em `objects/`, por isso estados repetidos não ocupam espaço.
+Um `index.json` pequeno descreve todos os estados e é o único ficheiro
+lido para os listar.
+
+O restauro compara primeiro o estado guardado com o atual e só escreve os
+valores em falta ou alterados (ver `plan_restore`).
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+from dataclasses import dataclass, field, asdict
+
+from startup_sources import source_id
+
+
+@dataclass(frozen=True)
+class SnapshotInfo:
+    id: str
+    name: str
+    created: float
+    digest: str
+    count: int
+
+
+@dataclass
+class RestorePlan:
+    missing: list = field(default_factory=list)
+    changed: list = field(default_factory=list)
+    unchanged: int = 0
+    extra: list = field(default_factory=list)
+
+    @property
+    def to_write(self):
+        return self.missing + self.changed
+
+
+@dataclass
+class RestoreReport:
+    added: list = field(default_factory=list)
+    changed: list = field(default_factory=list)
+    unchanged: int = 0
+    extra: list = field(default_factory=list)
+    failed: list = field(default_factory=list)
+
+
+def _entry_key(entry):
+    return (source_id(entry), entry["name"])
+
+
+def _canonical(entries):
+    """ Forma estável das entradas: a mesma lista dá sempre os mesmos bytes (e o mesmo hash). """
+    cleaned = [
+        {"name": e["name"], "command": e["command"], "hive": e.get("hive"), "path": e.get("path"),
+         "source": source_id(e)}
+        for e in entries
+    ]
+    cleaned.sort(key=lambda e: (e["source"] or "", e["name"]))
+    return json.dumps(cleaned, sort_keys=True, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+
+
+def plan_restore(saved_entries, live_entries):
+    """ Compara um estado guardado com o atual. As entradas a mais no estado atual só são reportadas. """
+    live = {_entry_key(entry): entry for entry in live_entries}
+    plan = RestorePlan()
+    saved_keys = set()
+    for entry in saved_entries:
+        key = _entry_key(entry)
+        saved_keys.add(key)
+        current = live.get(key)
+        if current is None:
+            plan.missing.append(entry)
+        elif current["command"] != entry["command"]:
+            plan.changed.append(entry)
+        else:
+            plan.unchanged += 1
+    plan.extra = [entry for key, entry in live.items() if key not in saved_keys]
+    return plan
+
+
+class SnapshotStore:
+    def __init__(self, directory):
+        self.directory = directory
+        self._objects_dir = os.path.join(directory, "objects")
+        self._index_path = os.path.join(directory, "index.json")
+        self._lock = threading.Lock()
+        self._index = None
+
+    def list(self):
+        """ Estados guardados, do mais recente para o mais antigo (só lê o índice). """
+        with self._lock:
+            snapshots = [SnapshotInfo(**item) for item in self._load_index()]
+        return sorted(snapshots, key=lambda info: info.created, reverse=True)
+
+    def save(self, entries, name=None):
+        payload = _canonical(entries)
+        digest = hashlib.sha256(payload).hexdigest()
+        created = time.time()
+        with self._lock:
+            index = self._load_index()
+            object_path = self._object_path(digest)
+            if not os.path.exists(object_path):
+                os.makedirs(self._objects_dir, exist_ok=True)
+                _write_atomic(object_path, payload)
+            snapshot_id = f"{int(created * 1000):013d}-{digest[:8]}"
+            info = SnapshotInfo(
+                id=snapshot_id,
+                name=name or time.strftime("Estado %d/%m/%Y %H:%M", time.localtime(created)),
+                created=created, digest=digest, count=len(entries),
+            )
+            index.append(asdict(info))
+            self._save_index()
+        return info
+
+    def load(self, snapshot_id):
+        info = self._find(snapshot_id)
+        with open(self._object_path(info.digest), 'rb') as f:
+            return json.loads(f.read().decode("utf-8"))
+
+    def delete(self, snapshot_id):
+        with self._lock:
+            index = self._load_index()
+            remaining = [item for item in index if item["id"] != snapshot_id]
+            removed = [item for item in index if item["id"] == snapshot_id]
+            self._index = remaining
+            self._save_index()
+            # O conteúdo só é apagado quando nenhum outro estado o usa
+            for item in removed:
+                if not any(other["digest"] == item["digest"] for other in remaining):
+                    try:
+                        os.remove(self._object_path(item["digest"]))
+                    except OSError:
+                        pass
+
+    def import_legacy(self, backup_file, name="Backup antigo (startup_backup.json)"):
+        """ Importa o antigo `startup_backup.json` (uma só vez: o conteúdo repetido não cria outro estado). """
+        with open(backup_file, 'r', encoding='utf-8') as f:
+            entries = json.load(f)
+        digest = hashlib.sha256(_canonical(entries)).hexdigest()
+        if any(info.digest == digest for info in self.list()):
+            return None
+        return self.save(entries, name=name)
+
+    def _find(self, snapshot_id):
+        for info in self.list():
+            if info.id == snapshot_id:
+                return info
+        raise KeyError(snapshot_id)
+
+    def _object_path(self, digest):
+        return os.path.join(self._objects_dir, f"{digest}.json")
+
+    def _load_index(self):
+        if self._index is None:
+            try:
+                with open(self._index_path, 'r', encoding='utf-8') as f:
+                    self._index = json.load(f).get("snapshots", [])
+            except (OSError, ValueError):
+                self._index = []
+        return self._index
+
+    def _save_index(self):
+        os.makedirs(self.directory, exist_ok=True)
+        payload = json.dumps({"snapshots": self._index}, separators=(",", ":"), ensure_ascii=False)
+        _write_atomic(self._index_path, payload.encode("utf-8"))
+
+
+def _write_atomic(path, data):
+    tmp_path = path + ".tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+
+
+def restore_snapshot(store, scanner, snapshot_id):
+    """ Restaura um estado guardado escrevendo só as diferenças; devolve um `RestoreReport`. """
+    saved = store.load(snapshot_id)
+    live = scanner.scan(force=True).entries
+    plan = plan_restore(saved, live)
+    failed = scanner.write(plan.to_write) if plan.to_write else []
+    # Pela chave completa: o mesmo nome pode falhar no HKLM e ser reposto no HKCU
+    failed_keys = {_entry_key(entry) for entry, _ in failed}
+    return RestoreReport(
+        added=[e["name"] for e in plan.missing if _entry_key(e) not in failed_keys],
+        changed=[e["name"] for e in plan.changed if _entry_key(e) not in failed_keys],
+        unchanged=plan.unchanged,
+        extra=[e["name"] for e in plan.extra],
+        failed=[(entry["name"], error) for entry, error in failed],
+    )
@@ -0,0 +1,349 @@
+"""
+PC Control Hub - startup_sources.py
+
+Origens dos programas de arranque: as chaves `Run` e `RunOnce` (HKCU, HKLM
+e WOW6432Node) e as pastas Startup do utilizador e comum. Cada origem
+expõe um carimbo de última escrita (`QueryInfoKey` no registo, `mtime` nas
+pastas); o `StartupScanner` só volta a ler as origens cujo carimbo mudou
+e lê as alteradas em paralelo.
+
+O acesso ao registo está atrás de um backend (`WindowsRegistry` ou
+`MemoryRegistry`), para a enumeração poder ser testada fora do Windows.
+
+Nota: o `mtime` de uma pasta muda quando atalhos são criados, apagados ou
+renomeados, mas não quando um atalho existente é editado.
+"""
+
+import abc
+import itertools
+import os
+import shutil
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+
+if sys.platform == 'win32':
+    import winreg
+else:
+    winreg = None
+
+# Os mesmos valores de `winreg`, para as entradas (e os backups em JSON) serem iguais em qualquer sistema
+HKEY_CURRENT_USER = 0x80000001
+HKEY_LOCAL_MACHINE = 0x80000002
+
+RUN_PATH = r"Software\Microsoft\Windows\CurrentVersion\Run"
+RUN_ONCE_PATH = r"Software\Microsoft\Windows\CurrentVersion\RunOnce"
+WOW64_RUN_PATH = r"Software\WOW6432Node\Microsoft\Windows\CurrentVersion\Run"
+WOW64_RUN_ONCE_PATH = r"Software\WOW6432Node\Microsoft\Windows\CurrentVersion\RunOnce"
+
+STARTUP_FOLDER = os.path.join("Microsoft", "Windows", "Start Menu", "Programs", "Startup")
+
+_HIVE_NAMES = {HKEY_CURRENT_USER: "HKCU", HKEY_LOCAL_MACHINE: "HKLM"}
+
+
+# --- BACKENDS DO REGISTO ---
+class WindowsRegistry:
+    def key_stamp(self, hive, path):
+        """ Carimbo da última escrita da chave (None se a chave não existir). """
+        try:
+            with winreg.OpenKey(hive, path, 0, winreg.KEY_READ) as key:
+                return winreg.QueryInfoKey(key)[2]
+        except FileNotFoundError:
+            return None
+
+    def enum_values(self, hive, path):
+        values = []
+        try:
+            with winreg.OpenKey(hive, path, 0, winreg.KEY_READ) as key:
+                for i in itertools.count():
+                    try:
+                        name, value, _ = winreg.EnumValue(key, i)
+                    except OSError:
+                        break
+                    values.append((name, value))
+        except FileNotFoundError:
+            pass
+        return values
+
+    def set_value(self, hive, path, name, value):
+        self.set_values(hive, path, [(name, value)])
+
+    def set_values(self, hive, path, items):
+        """ Escreve vários valores abrindo a chave uma só vez; devolve [(nome, erro)] dos que falharam. """
+        failed = []
+        with winreg.CreateKeyEx(hive, path, 0, winreg.KEY_SET_VALUE) as key:
+            for name, value in items:
+                try:
+                    winreg.SetValueEx(key, name, 0, winreg.REG_SZ, value)
+                except OSError as e:
+                    failed.append((name, str(e)))
+        return failed
+
+    def delete_value(self, hive, path, name):
+        with winreg.OpenKey(hive, path, 0, winreg.KEY_SET_VALUE) as key:
+            winreg.DeleteValue(key, name)
+
+
+class MemoryRegistry:
+    """ Registo em memória com a mesma interface de `WindowsRegistry` (testes e Linux). """
+
+    def __init__(self, keys=None):
+        self._keys = {}
+        self._clock = itertools.count(1)
+        self._lock = threading.Lock()
+        for (hive, path), values in (keys or {}).items():
+            for name, value in values.items():
+                self.set_value(hive, path, name, value)
+
+    def key_stamp(self, hive, path):
+        key = self._keys.get((hive, path))
+        return key["stamp"] if key is not None else None
+
+    def enum_values(self, hive, path):
+        key = self._keys.get((hive, path))
+        return list(key["values"].items()) if key is not None else []
+
+    def set_value(self, hive, path, name, value):
+        self.set_values(hive, path, [(name, value)])
+
+    def set_values(self, hive, path, items):
+        with self._lock:
+            key = self._keys.setdefault((hive, path), {"values": {}, "stamp": 0})
+            for name, value in items:
+                key["values"][name] = value
+            key["stamp"] = next(self._clock)
+        return []
+
+    def delete_value(self, hive, path, name):
+        with self._lock:
+            key = self._keys.get((hive, path))
+            if key is None or name not in key["values"]:
+                raise FileNotFoundError(name)
+            del key["values"][name]
+            key["stamp"] = next(self._clock)
+
+
+# --- ORIGENS ---
+def source_id(entry):
+    """ Origem de uma entrada; os backups antigos só têm `hive` e `path`. """
+    if entry.get("source"):
+        return entry["source"]
+    if entry.get("hive") is not None:
+        return f"{_HIVE_NAMES.get(entry['hive'], entry['hive'])}\\{entry['path']}"
+    return entry.get("path")
+
+
+class StartupSource(abc.ABC):
+    """ `stamp()` muda sempre que o conteúdo muda (None se a origem não existir); `read()` devolve as entradas.
+
+    `write_many(entries)` volta a criar entradas (restauro) e devolve [(nome, erro)] das que falharam.
+    `stamp()` e `read()` podem levantar OSError (ex.: sem permissão de leitura).
+    """
+
+    id = None
+
+    @abc.abstractmethod
+    def stamp(self):
+        ...
+
+    @abc.abstractmethod
+    def read(self):
+        ...
+
+    @abc.abstractmethod
+    def remove(self, entry):
+        ...
+
+    @abc.abstractmethod
+    def write_many(self, entries):
+        ...
+
+
+class RegistrySource(StartupSource):
+    def __init__(self, backend, hive, path):
+        self.backend = backend
+        self.hive = hive
+        self.path = path
+        self.id = f"{_HIVE_NAMES.get(hive, hive)}\\{path}"
+
+    def stamp(self):
+        return self.backend.key_stamp(self.hive, self.path)
+
+    def read(self):
+        return [
+            {"name": name, "command": value, "hive": self.hive, "path": self.path, "source": self.id}
+            for name, value in self.backend.enum_values(self.hive, self.path)
+        ]
+
+    def remove(self, entry):
+        self.backend.delete_value(self.hive, self.path, entry["name"])
+
+    def write_many(self, entries):
+        return self.backend.set_values(self.hive, self.path, [(entry["name"], entry["command"]) for entry in entries])
+
+
+class FolderSource(StartupSource):
+    """ Pasta Startup: cada ficheiro (normalmente um atalho .lnk) é uma entrada.
+
+    Desativar move o ficheiro para `disabled_dir`, em vez de o apagar.
+    """
+
+    def __init__(self, folder, disabled_dir=None):
+        self.folder = folder
+        self.disabled_dir = disabled_dir
+        self.id = folder
+
+    def stamp(self):
+        try:
+            return os.stat(self.folder).st_mtime_ns
+        except FileNotFoundError:
+            return None
+
+    def read(self):
+        entries = []
+        try:
+            with os.scandir(self.folder) as it:
+                for entry in it:
+                    # desktop.ini existe em todas as pastas Startup e não é um programa
+                    if entry.is_file() and entry.name.lower() != 'desktop.ini':
+                        entries.append({"name": entry.name, "command": entry.path, "hive": None,
+                                        "path": self.folder, "source": self.id})
+        except FileNotFoundError:
+            pass
+        return entries
+
+    def remove(self, entry):
+        file_path = os.path.join(self.folder, entry["name"])
+        if self.disabled_dir is None:
+            os.remove(file_path)
+            return
+        os.makedirs(self.disabled_dir, exist_ok=True)
+        shutil.move(file_path, os.path.join(self.disabled_dir, entry["name"]))
+
+    def write_many(self, entries):
+        # Só é possível repor ficheiros que foram desativados por esta aplicação
+        failed = []
+        for entry in entries:
+            disabled_path = os.path.join(self.disabled_dir, entry["name"]) if self.disabled_dir else None
+            if disabled_path is None or not os.path.exists(disabled_path):
+                failed.append((entry["name"], "ficheiro desativado não encontrado"))
+                continue
+            try:
+                shutil.move(disabled_path, os.path.join(self.folder, entry["name"]))
+            except OSError as e:
+                failed.append((entry["name"], str(e)))
+        return failed
+
+
+def default_sources(registry=None, disabled_dir=None):
+    """ Todas as origens conhecidas; as pastas só entram se as variáveis de ambiente existirem. """
+    registry = registry or WindowsRegistry()
+    sources = [
+        RegistrySource(registry, HKEY_CURRENT_USER, RUN_PATH),
+        RegistrySource(registry, HKEY_LOCAL_MACHINE, RUN_PATH),
+        RegistrySource(registry, HKEY_LOCAL_MACHINE, WOW64_RUN_PATH),
+        RegistrySource(registry, HKEY_CURRENT_USER, RUN_ONCE_PATH),
+        RegistrySource(registry, HKEY_LOCAL_MACHINE, RUN_ONCE_PATH),
+        RegistrySource(registry, HKEY_LOCAL_MACHINE, WOW64_RUN_ONCE_PATH),
+    ]
+    for variable in ('APPDATA', 'PROGRAMDATA'):
+        base = os.environ.get(variable)
+        if base:
+            sources.append(FolderSource(os.path.join(base, STARTUP_FOLDER), disabled_dir))
+    return sources
+
+
+# --- ENUMERAÇÃO COM CACHE ---
+@dataclass
+class ScanResult:
+    entries: list
+    sources_read: int = 0
+    sources_skipped: int = 0
+    # Origens que deram erro de acesso; ficam de fora e voltam a ser tentadas no próximo `scan`
+    unreadable: list = field(default_factory=list)
+
+
+class StartupScanner:
+    """ `scan()` devolve todas as entradas, pela ordem das origens, relendo só as que mudaram. """
+
+    def __init__(self, sources, max_workers=8):
+        self.sources = list(sources)
+        self.max_workers = max(1, max_workers)
+        self._cache = {}
+        self._lock = threading.Lock()
+
+    def scan(self, force=False):
+        with self._lock:
+            # Os carimbos são baratos: lidos em série; só as leituras completas vão para a pool
+            stamps = {}
+            unreadable = []
+            for source in self.sources:
+                try:
+                    stamps[source.id] = source.stamp()
+                except OSError as e:
+                    unreadable.append((source.id, str(e)))
+                    self._cache.pop(source.id, None)
+            stale = [
+                source for source in self.sources
+                if source.id in stamps
+                and (force or source.id not in self._cache or self._cache[source.id][0] != stamps[source.id])
+            ]
+
+            def read(source):
+                if stamps[source.id] is None:
+                    return []
+                try:
+                    return source.read()
+                except OSError as e:
+                    return e
+
+            if len(stale) > 1:
+                with ThreadPoolExecutor(max_workers=min(self.max_workers, len(stale)),
+                                        thread_name_prefix="startup") as pool:
+                    results = list(pool.map(read, stale))
+            else:
+                results = [read(source) for source in stale]
+            read_errors = 0
+            for source, entries in zip(stale, results):
+                if isinstance(entries, OSError):
+                    read_errors += 1
+                    unreadable.append((source.id, str(entries)))
+                    self._cache.pop(source.id, None)
+                else:
+                    self._cache[source.id] = (stamps[source.id], entries)
+
+            entries = [entry for source in self.sources if source.id in self._cache
+                       for entry in self._cache[source.id][1]]
+            return ScanResult(entries, sources_read=len(stale) - read_errors,
+                              sources_skipped=len(stamps) - len(stale),
+                              unreadable=unreadable)
+
+    def source_for(self, entry):
+        wanted = source_id(entry)
+        for source in self.sources:
+            if source.id == wanted:
+                return source
+        raise KeyError(wanted)
+
+    def remove(self, entry):
+        self.source_for(entry).remove(entry)
+
+    def write(self, entries):
+        """ Escreve as entradas agrupadas por origem (cada chave é aberta uma vez); devolve [(entrada, erro)].
+
+        Devolve a entrada e não só o nome: o mesmo nome pode existir em várias origens.
+        """
+        grouped = {}
+        for entry in entries:
+            grouped.setdefault(source_id(entry), []).append(entry)
+        failed = []
+        for group in grouped.values():
+            try:
+                source = self.source_for(group[0])
+                # Dentro de uma origem o nome é único
+                by_name = {entry["name"]: entry for entry in group}
+                failed.extend((by_name[name], error) for name, error in source.write_many(group))
+            except (KeyError, OSError) as e:
+                failed.extend((entry, str(e)) for entry in group)
+        return failed
@@ -0,0 +1,39 @@
+"""
+PC Control Hub - startup_timing.py
+
+Marcas de tempo das fases do arranque (importações, serviços, janela,
+páginas...). Cada marca guarda o tempo desde a origem e desde a marca
+anterior, para se ver onde o arranque gasta o tempo.
+"""
+
+import time
+
+
+class StartupTimings:
+    def __init__(self, origin=None):
+        self.origin = origin if origin is not None else time.perf_counter()
+        self._marks = []
+
+    def mark(self, name):
+        """ Regista o fim da fase `name` e devolve os segundos desde a origem. """
+        now = time.perf_counter()
+        self._marks.append((name, now))
+        return now - self.origin
+
+    def checkpoints(self):
+        """ Lista de (fase, segundos desde a origem, segundos desde a marca anterior). """
+        result = []
+        previous = self.origin
+        for name, moment in self._marks:
+            result.append((name, moment - self.origin, moment - previous))
+            previous = moment
+        return result
+
+    def elapsed(self, name):
+        for mark_name, since_origin, _ in self.checkpoints():
+            if mark_name == name:
+                return since_origin
+        return None
+
+    def summary(self):
+        return ", ".join(f"{name} +{delta * 1000:.0f} ms" for name, _, delta in self.checkpoints())
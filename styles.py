@@ -1,110 +1,130 @@
-# --- Estilos QSS (CSS para o aplicativo) ---
-
-# Estilo preto
-DARK_STYLE = """
-    QWidget {
-        background-color: #2b2b2b;
-        color: #ffffff;
-        font-family: Arial;
-        font-size: 14px;
-    }
-    QPushButton {
-        background-color: #3c3c3c;
-        border: 1px solid #555555;
-        padding: 8px;
-        border-radius: 4px;
-    }
-    QPushButton:hover {
-        background-color: #4d4d4d;
-    }
-    QPushButton:pressed {
-        background-color: #555555;
-    }
-    QFrame#sidebar {
-        background-color: #333333;
-    }
-    QListWidget, QLineEdit, QTextEdit {
-        background-color: #3c3c3c;
-        border: 1px solid #555555;
-        border-radius: 4px;
-        padding: 5px;
-    }
-    QListWidget::item {
-        background-color: transparent;
-        padding: 10px 5px; 
-        border-bottom: 1px solid #4a4a4a; 
-    }
-    QLabel#page_title {
-        font-size: 20px;
-        font-weight: bold;
-    }
-    QLabel#status_label {
-        font-size: 12px;
-        color: #888888;
-    }
-    QToolTip {
-        background-color: #333333;
-        color: #ffffff;
-        border: 1px solid #555555;
-        padding: 5px;
-    }
-    QLabel#speed_result {
-        font-size: 16px;
-        color: #4CAF50;
-        font-weight: bold;
-    }
 """
-# Estilo claro
-LIGHT_STYLE = """
-    QWidget {
-        background-color: #f0f0f0;
-        color: #000000;
-        font-family: Arial;
-        font-size: 14px;
-    }
-    QPushButton {
-        background-color: #e1e1e1;
-        border: 1px solid #adadad;
-        padding: 8px;
-        border-radius: 4px;
-    }
-    QPushButton:hover {
-        background-color: #cacaca;
-    }
-    QPushButton:pressed {
-        background-color: #adadad;
-    }
-    QFrame#sidebar {
-        background-color: #dddddd;
-    }
-    QListWidget, QLineEdit, QTextEdit {
-        background-color: #ffffff;
-        border: 1px solid #adadad;
-        border-radius: 4px;
-        padding: 5px;
-    }
-    QListWidget::item {
-        background-color: transparent;
-        padding: 10px 5px; 
-        border-bottom: 1px solid #dcdcdc; 
-    }
-    QLabel#page_title {
-        font-size: 20px;
-        font-weight: bold;
-    }
-    QLabel#status_label {
-        font-size: 12px;
-        color: #666666;
-    }
-    QToolTip {
-        background-color: #ffffff;
-        color: #000000;
-        border: 1px solid #adadad;
-        padding: 5px;
-    }
-    QLabel#speed_result {
-        font-size: 16px;
-        color: #2E7D32;
-        font-weight: bold;
-    }
-"""
\ No newline at end of file
+PC Control Hub - styles.py
+
+Temas da aplicação. Cada tema é um conjunto de cores (tokens) convertido
+uma única vez numa `QPalette` (em cache); mudar de tema é só trocar a
+paleta da aplicação, sem folhas de estilo para o Qt voltar a analisar.
+Os tipos de texto (títulos, estados, resultados...) usam fontes em cache
+e um papel da paleta para a cor, por isso também acompanham o tema.
+
+Nota: uma folha de estilo na aplicação fixa as cores no momento em que é
+aplicada e deixa de seguir a paleta; por isso aqui não há nenhuma.
+"""
+
+import functools
+import time
+
+from PySide6.QtGui import QColor, QFont, QPalette
+
+# --- TOKENS DOS TEMAS ---
+THEMES = {
+    "dark": {
+        "window": "#2b2b2b",
+        "text": "#ffffff",
+        "muted": "#888888",
+        "surface": "#3c3c3c",
+        "sidebar": "#333333",
+        "border": "#555555",
+        "hover": "#4d4d4d",
+        "selection": "#3d6a99",
+        "accent": "#4CAF50",
+        "tooltip": "#333333",
+    },
+    "light": {
+        "window": "#f0f0f0",
+        "text": "#000000",
+        "muted": "#666666",
+        "surface": "#ffffff",
+        "sidebar": "#dddddd",
+        "border": "#adadad",
+        "hover": "#cacaca",
+        "selection": "#3b7dd8",
+        "accent": "#2E7D32",
+        "tooltip": "#ffffff",
+    },
+}
+
+FONT_FAMILY = "Arial"
+BASE_FONT_SIZE = 14
+
+# Tipo de texto -> (tamanho em px, negrito, papel da paleta para a cor ou None)
+TEXT_STYLES = {
+    "page_title": (20, True, None),
+    "status_label": (12, False, QPalette.ColorRole.PlaceholderText),
+    "metric_label": (18, False, QPalette.ColorRole.PlaceholderText),
+    "ip_label": (16, False, None),
+    "speed_result": (16, True, QPalette.ColorRole.Link),
+}
+
+
+@functools.lru_cache(maxsize=None)
+def build_palette(theme):
+    tokens = {name: QColor(value) for name, value in THEMES[theme].items()}
+    palette = QPalette()
+    roles = {
+        QPalette.ColorRole.Window: "window",
+        QPalette.ColorRole.WindowText: "text",
+        QPalette.ColorRole.Base: "surface",
+        QPalette.ColorRole.AlternateBase: "sidebar",
+        QPalette.ColorRole.Text: "text",
+        QPalette.ColorRole.Button: "surface",
+        QPalette.ColorRole.ButtonText: "text",
+        QPalette.ColorRole.BrightText: "text",
+        QPalette.ColorRole.ToolTipBase: "tooltip",
+        QPalette.ColorRole.ToolTipText: "text",
+        QPalette.ColorRole.PlaceholderText: "muted",
+        QPalette.ColorRole.Link: "accent",
+        QPalette.ColorRole.Highlight: "selection",
+        QPalette.ColorRole.Mid: "border",
+        QPalette.ColorRole.Light: "hover",
+        QPalette.ColorRole.Midlight: "hover",
+        QPalette.ColorRole.Dark: "sidebar",
+        QPalette.ColorRole.Shadow: "window",
+    }
+    for role, token in roles.items():
+        palette.setColor(role, tokens[token])
+    palette.setColor(QPalette.ColorRole.HighlightedText, QColor("#ffffff"))
+    for role in (QPalette.ColorRole.WindowText, QPalette.ColorRole.Text, QPalette.ColorRole.ButtonText):
+        palette.setColor(QPalette.ColorGroup.Disabled, role, tokens["muted"])
+    return palette
+
+
+@functools.lru_cache(maxsize=None)
+def text_font(kind):
+    size, bold, _ = TEXT_STYLES[kind]
+    font = QFont(FONT_FAMILY)
+    font.setPixelSize(size)
+    font.setBold(bold)
+    return font
+
+
+def style_text(label, kind):
+    """ Aplica um tipo de texto de `TEXT_STYLES` (fonte e cor) a um QLabel. """
+    label.setObjectName(kind)
+    label.setFont(text_font(kind))
+    role = TEXT_STYLES[kind][2]
+    if role is not None:
+        label.setForegroundRole(role)
+
+
+class ThemeManager:
+    """ Aplica os temas à aplicação; `last_switch_seconds` guarda quanto demorou a última troca. """
+
+    def __init__(self, app):
+        self.app = app
+        self.current = None
+        self.last_switch_seconds = None
+        # O estilo Fusion desenha tudo a partir da paleta (o nativo do Windows ignora parte dela)
+        if app.style().name().lower() != "fusion":
+            app.setStyle("Fusion")
+        base_font = QFont(FONT_FAMILY)
+        base_font.setPixelSize(BASE_FONT_SIZE)
+        app.setFont(base_font)
+
+    def apply(self, theme):
+        start = time.perf_counter()
+        if theme != self.current:
+            self.app.setPalette(build_palette(theme))
+            self.current = theme
+        self.last_switch_seconds = time.perf_counter() - start
+        return self.last_switch_seconds
@@ -0,0 +1,299 @@
+"""
+PC Control Hub - throughput.py
+
+Motor do teste de velocidade. Abre `streams` ligações HTTP em paralelo
+(download por GET, upload por POST) contra qualquer servidor e mede o
+débito total a cada `sample_interval` (100 ms). Os primeiros `warmup`
+segundos de cada fase (arranque do TCP) são descartados; o resultado traz
+os percentis p50 e p90 do débito e a latência medida durante a carga,
+comparada com a latência em repouso (bufferbloat).
+
+O servidor vem de um backend: `HttpBackend` para URLs próprios (ou um
+servidor local nos testes) e `OoklaBackend`, que usa a biblioteca
+`speedtest` só para escolher o servidor Ookla mais próximo.
+"""
+
+import http.client
+import math
+import os
+import socket
+import statistics
+import threading
+import time
+from dataclasses import dataclass, field
+from urllib.parse import urlsplit
+
+DOWNLOAD = "download"
+UPLOAD = "upload"
+
+CHUNK_SIZE = 64 * 1024
+UPLOAD_REQUEST_SIZE = 4 * 1024 * 1024
+MAX_ERRORS = 20
+
+
+class ThroughputError(Exception):
+    pass
+
+
+@dataclass(frozen=True)
+class Endpoints:
+    name: str
+    download_url: str
+    upload_url: str
+
+
+@dataclass
+class PhaseResult:
+    direction: str
+    streams: int
+    p50_mbps: float = 0.0
+    p90_mbps: float = 0.0
+    mean_mbps: float = 0.0
+    bytes: int = 0
+    seconds: float = 0.0
+    loaded_latency_ms: float = None
+    # (segundos desde o início da fase, Mbps, em aquecimento) a cada amostra
+    samples: list = field(default_factory=list)
+    errors: list = field(default_factory=list)
+
+
+@dataclass
+class ThroughputResult:
+    server: str
+    idle_latency_ms: float = None
+    download: PhaseResult = None
+    upload: PhaseResult = None
+
+    def bufferbloat_ms(self, direction):
+        """ Quanto a latência sobe com a ligação cheia, na fase `direction` (None se não houver medição). """
+        phase = self.download if direction == DOWNLOAD else self.upload
+        if phase is None or phase.loaded_latency_ms is None or self.idle_latency_ms is None:
+            return None
+        return phase.loaded_latency_ms - self.idle_latency_ms
+
+
+def percentile(values, fraction):
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(fraction * len(ordered)) - 1)]
+
+
+# --- SERVIDORES ---
+class HttpBackend:
+    """ Servidor próprio: `download_url` devolve um ficheiro grande e `upload_url` aceita POST (o mesmo URL, por omissão). """
+
+    def __init__(self, download_url, upload_url=None, name=None):
+        self.endpoints = Endpoints(name or urlsplit(download_url).netloc, download_url, upload_url or download_url)
+
+    def prepare(self):
+        return self.endpoints
+
+
+class OoklaBackend:
+    """ Servidor Ookla mais próximo (a mesma escolha do speedtest-cli). """
+
+    def prepare(self):
+        import speedtest  # só carregado quando o teste é pedido (arranque mais rápido)
+
+        best = speedtest.Speedtest().get_best_server()
+        upload_url = best['url']
+        base_url = upload_url.rsplit('/', 1)[0]
+        return Endpoints(f"{best['sponsor']} ({best['name']})", f"{base_url}/random4000x4000.jpg", upload_url)
+
+
+# --- LIGAÇÕES ---
+def _connect(url, timeout):
+    parts = urlsplit(url)
+    connection_class = http.client.HTTPSConnection if parts.scheme == "https" else http.client.HTTPConnection
+    path = (parts.path or "/") + (f"?{parts.query}" if parts.query else "")
+    return connection_class(parts.hostname, parts.port, timeout=timeout), path
+
+
+def tcp_latency_ms(url, timeout=2.0):
+    """ Tempo de abertura de uma ligação TCP ao servidor (None se falhar). """
+    parts = urlsplit(url)
+    port = parts.port or (443 if parts.scheme == "https" else 80)
+    start = time.perf_counter()
+    try:
+        with socket.create_connection((parts.hostname, port), timeout=timeout):
+            return (time.perf_counter() - start) * 1000
+    except OSError:
+        return None
+
+
+class ThroughputTester:
+    """ `run()` faz as fases pedidas e devolve um `ThroughputResult`.
+
+    `on_sample(direção, segundos, mbps, em_aquecimento)` é chamado a cada amostra e
+    `on_phase(nome)` no início de cada fase ("latency", "download", "upload").
+    """
+
+    def __init__(self, backend, streams=4, duration=8.0, warmup=2.0, sample_interval=0.1,
+                 latency_interval=0.25, timeout=5.0, directions=(DOWNLOAD, UPLOAD), on_sample=None, on_phase=None):
+        self.backend = backend
+        self.streams = max(1, streams)
+        self.duration = duration
+        self.warmup = warmup
+        self.sample_interval = sample_interval
+        self.latency_interval = latency_interval
+        self.timeout = timeout
+        self.directions = tuple(directions)
+        self.on_sample = on_sample
+        self.on_phase = on_phase
+        self._stop = threading.Event()
+        self._cancelled = threading.Event()
+
+    def cancel(self):
+        self._cancelled.set()
+        self._stop.set()
+
+    @property
+    def cancelled(self):
+        return self._cancelled.is_set()
+
+    def run(self):
+        endpoints = self.backend.prepare()
+        result = ThroughputResult(server=endpoints.name)
+
+        self._phase("latency")
+        idle = []
+        for _ in range(5):
+            if self.cancelled:
+                return result
+            rtt = tcp_latency_ms(endpoints.download_url, self.timeout)
+            if rtt is None:
+                # Servidor inacessível: não vale a pena esperar mais `timeout` por tentativa
+                break
+            idle.append(rtt)
+        result.idle_latency_ms = statistics.median(idle) if idle else None
+        if self.cancelled:
+            return result
+
+        for direction in self.directions:
+            if self.cancelled:
+                break
+            url = endpoints.download_url if direction == DOWNLOAD else endpoints.upload_url
+            phase = self._run_phase(direction, url)
+            if direction == DOWNLOAD:
+                result.download = phase
+            else:
+                result.upload = phase
+        return result
+
+    def _phase(self, name):
+        if self.on_phase is not None:
+            self.on_phase(name)
+
+    def _run_phase(self, direction, url):
+        self._phase(direction)
+        self._stop.clear()
+        if self.cancelled:
+            self._stop.set()
+        counters = [0] * self.streams
+        phase = PhaseResult(direction=direction, streams=self.streams)
+        worker = self._download_stream if direction == DOWNLOAD else self._upload_stream
+        threads = [threading.Thread(target=worker, args=(url, counters, index, phase.errors), daemon=True)
+                   for index in range(self.streams)]
+        latencies = []
+        threads.append(threading.Thread(target=self._latency_loop, args=(url, latencies), daemon=True))
+        for thread in threads:
+            thread.start()
+
+        start = time.perf_counter()
+        end = start + self.warmup + self.duration
+        last_time, last_total = start, 0
+        measured, measured_from = [], None
+        next_sample = start + self.sample_interval
+        while not self._stop.is_set():
+            self._stop.wait(max(0.0, next_sample - time.perf_counter()))
+            now = time.perf_counter()
+            total = sum(counters)
+            mbps = (total - last_total) * 8 / (now - last_time) / 1_000_000 if now > last_time else 0.0
+            warming = now - start < self.warmup
+            phase.samples.append((now - start, mbps, warming))
+            if not warming:
+                measured.append(mbps)
+                if measured_from is None:
+                    measured_from = (last_time, last_total)
+            if self.on_sample is not None:
+                self.on_sample(direction, now - start, mbps, warming)
+            last_time, last_total = now, total
+            next_sample += self.sample_interval
+            if now >= end:
+                break
+        self._stop.set()
+        for thread in threads:
+            thread.join(self.timeout)
+
+        if measured_from is not None:
+            phase.seconds = last_time - measured_from[0]
+            phase.bytes = last_total - measured_from[1]
+            phase.mean_mbps = phase.bytes * 8 / phase.seconds / 1_000_000 if phase.seconds else 0.0
+        phase.p50_mbps = percentile(measured, 0.5)
+        phase.p90_mbps = percentile(measured, 0.9)
+        phase.loaded_latency_ms = statistics.median(latencies) if latencies else None
+        if sum(counters) == 0 and phase.errors and not self.cancelled:
+            raise ThroughputError(f"Sem dados no {direction}: {phase.errors[0]}")
+        return phase
+
+    def _download_stream(self, url, counters, index, errors):
+        while not self._stop.is_set():
+            connection, path = _connect(url, self.timeout)
+            try:
+                # A mesma ligação serve pedidos seguidos (keep-alive) até ao fim da fase
+                while not self._stop.is_set():
+                    connection.request("GET", path, headers={"Cache-Control": "no-cache"})
+                    response = connection.getresponse()
+                    if response.status >= 400:
+                        raise ThroughputError(f"HTTP {response.status}")
+                    while not self._stop.is_set():
+                        chunk = response.read(CHUNK_SIZE)
+                        if not chunk:
+                            break
+                        counters[index] += len(chunk)
+            except (OSError, http.client.HTTPException, ThroughputError) as e:
+                if len(errors) < MAX_ERRORS:
+                    errors.append(str(e) or type(e).__name__)
+                self._stop.wait(0.2)
+            finally:
+                connection.close()
+
+    def _upload_stream(self, url, counters, index, errors):
+        payload = memoryview(os.urandom(CHUNK_SIZE))
+        while not self._stop.is_set():
+            connection, path = _connect(url, self.timeout)
+            try:
+                while not self._stop.is_set():
+                    connection.putrequest("POST", path)
+                    connection.putheader("Content-Type", "application/octet-stream")
+                    connection.putheader("Content-Length", str(UPLOAD_REQUEST_SIZE))
+                    connection.endheaders()
+                    sent = 0
+                    while sent < UPLOAD_REQUEST_SIZE:
+                        if self._stop.is_set():
+                            return  # pedido a meio: a ligação é fechada sem esperar pela resposta
+                        chunk = payload[:min(CHUNK_SIZE, UPLOAD_REQUEST_SIZE - sent)]
+                        connection.send(chunk)
+                        sent += len(chunk)
+                        counters[index] += len(chunk)
+                    response = connection.getresponse()
+                    response.read()
+                    if response.status >= 400:
+                        raise ThroughputError(f"HTTP {response.status}")
+            except (OSError, http.client.HTTPException, ThroughputError) as e:
+                if len(errors) < MAX_ERRORS:
+                    errors.append(str(e) or type(e).__name__)
+                self._stop.wait(0.2)
+            finally:
+                connection.close()
+
+    def _latency_loop(self, url, latencies):
+        # Espera pelo fim do aquecimento: só interessa a latência com a ligação já cheia
+        if self._stop.wait(self.warmup):
+            return
+        while not self._stop.is_set():
+            rtt = tcp_latency_ms(url, self.timeout)
+            if rtt is not None:
+                latencies.append(rtt)
+            self._stop.wait(self.latency_interval)
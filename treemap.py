@@ -0,0 +1,91 @@
+"""
+PC Control Hub - treemap.py
+
+Mapa de áreas (treemap) do analisador de disco: cada retângulo é uma
+subpasta, com área proporcional ao espaço ocupado. Recebe as linhas já
+calculadas (`DiskItem`, de disk_tree.py) e só refaz a disposição quando
+os dados ou o tamanho do widget mudam.
+"""
+
+import zlib
+
+from PySide6.QtCore import Qt, QRectF, Signal
+from PySide6.QtGui import QColor, QPainter, QPalette
+from PySide6.QtWidgets import QWidget, QToolTip
+
+from cleanup import format_bytes
+from disk_tree import NO_NODE, squarify
+
+MIN_LABEL_WIDTH = 48
+MIN_LABEL_HEIGHT = 18
+
+
+class TreemapWidget(QWidget):
+    # Duplo clique numa subpasta (índice do nó na `DiskTree`)
+    node_activated = Signal(int)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setMinimumHeight(160)
+        self.setMouseTracking(True)
+        self._items = []
+        self._rects = []
+
+    def set_items(self, items):
+        """ `items`: `DiskItem` do maior para o menor; os vazios não são desenhados. """
+        self._items = [item for item in items if item.bytes > 0]
+        self._layout()
+        self.update()
+
+    def item_at(self, position):
+        for item, rect in zip(self._items, self._rects):
+            if rect.contains(position):
+                return item
+        return None
+
+    def resizeEvent(self, event):
+        self._layout()
+        super().resizeEvent(event)
+
+    def _layout(self):
+        rects = squarify([item.bytes for item in self._items], 0.0, 0.0, self.width(), self.height())
+        self._rects = [QRectF(*rect) for rect in rects]
+
+    def paintEvent(self, event):
+        painter = QPainter(self)
+        palette = self.palette()
+        painter.fillRect(self.rect(), palette.color(QPalette.ColorRole.Base))
+        painter.setPen(palette.color(QPalette.ColorRole.Base))
+        for item, rect in zip(self._items, self._rects):
+            painter.setBrush(self._color(item, palette))
+            painter.drawRect(rect)
+            if rect.width() >= MIN_LABEL_WIDTH and rect.height() >= MIN_LABEL_HEIGHT:
+                text_rect = rect.adjusted(4, 2, -4, -2)
+                label = f"{item.name}\n{format_bytes(item.bytes)}" if rect.height() >= 2 * MIN_LABEL_HEIGHT else item.name
+                painter.setPen(Qt.GlobalColor.black)
+                elided = "\n".join(painter.fontMetrics().elidedText(line, Qt.TextElideMode.ElideRight, int(text_rect.width()))
+                                   for line in label.split("\n"))
+                painter.drawText(text_rect, int(Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignTop), elided)
+                painter.setPen(palette.color(QPalette.ColorRole.Base))
+        painter.end()
+
+    def _color(self, item, palette):
+        if item.node == NO_NODE:
+            return palette.color(QPalette.ColorRole.Mid)
+        # A cor depende só do nome: a mesma pasta mantém a cor entre atualizações
+        hue = zlib.crc32(item.name.encode("utf-8", "replace")) % 360
+        return QColor.fromHsv(hue, 90, 225)
+
+    def mouseDoubleClickEvent(self, event):
+        item = self.item_at(event.position())
+        if item is not None and item.node != NO_NODE:
+            self.node_activated.emit(item.node)
+
+    def mouseMoveEvent(self, event):
+        item = self.item_at(event.position())
+        if item is None:
+            QToolTip.hideText()
+        else:
+            QToolTip.showText(event.globalPosition().toPoint(),
+                              f"{item.name}\n{format_bytes(item.bytes)} em {item.files} ficheiros", self)
+        super().mouseMoveEvent(event)
@@ -2,7 +2,9 @@ import sys
 import os
 import ctypes
 import re
-from PySide6.QtGui import QImage, QPixmap
+import struct
+
+from exe_index import ExecutableIndex
 
 class SHFILEINFO(ctypes.Structure):
     _fields_ = [
@@ -23,6 +25,38 @@ def resource_path(relative_path):
         base_path = os.path.dirname(os.path.abspath(__file__))
     return os.path.join(base_path, relative_path)
 
+def app_data_dir():
+    """ Pasta local onde a aplicação guarda índices e caches (criada se não existir) """
+    base_path = os.environ.get('LOCALAPPDATA') or os.path.join(os.path.expanduser('~'), '.local', 'share')
+    path = os.path.join(base_path, 'PCControlHub')
+    os.makedirs(path, exist_ok=True)
+    return path
+
+# --- DADOS PARTILHADOS PELA INTERFACE E PELA LINHA DE COMANDOS ---
+# Antigo ficheiro de backup do Gestor de Arranque (importado para o histórico de estados)
+LEGACY_STARTUP_BACKUP = "startup_backup.json"
+
+def open_startup_scanner():
+    from startup_sources import StartupScanner, default_sources
+    return StartupScanner(default_sources(disabled_dir=os.path.join(app_data_dir(), "startup_disabled")))
+
+def open_snapshot_store():
+    from startup_snapshots import SnapshotStore
+    return SnapshotStore(os.path.join(app_data_dir(), "startup_snapshots"))
+
+def open_size_index():
+    from size_index import DirSizeIndex
+    return DirSizeIndex(os.path.join(app_data_dir(), "size_index.json"))
+
+def open_hash_cache():
+    from duplicates import HashCache
+    return HashCache(os.path.join(app_data_dir(), "hash_cache.json"))
+
+def open_cleanup_rules():
+    """ Regras de limpeza predefinidas mais as do utilizador (cleanup_rules.json, se existir). """
+    from cleanup_rules import load_rules
+    return load_rules(os.path.join(app_data_dir(), "cleanup_rules.json"))
+
 def is_admin():
     try:
         return ctypes.windll.shell32.IsUserAnAdmin()
@@ -31,11 +65,40 @@ def is_admin():
 
 # --- FUNÇÕES DE ÍCONES ---
 
+# Partilhado por todas as entradas: a pasta-mãe dos lançadores Update.exe costuma ser a mesma (%LOCALAPPDATA%)
+_executable_index = ExecutableIndex()
+
 def get_icon_for_executable(command):
+    from PySide6.QtGui import QPixmap  # o Qt só é carregado por quem desenha ícones (a linha de comandos não)
+    image = get_icon_image_for_executable(command)
+    return QPixmap.fromImage(image) if image is not None else None
+
+# Versão com QImage: pode correr fora da thread da interface (QPixmap não pode)
+def get_icon_image_for_executable(command, large=False):
+    for path in executable_candidates(command):
+        image = extract_icon_image(path, large)
+        if image is not None:
+            return image
+    return None
+
+def resolve_icon_sources(command):
+    """ Executáveis existentes de onde o ícone pode ser extraído, pela ordem a tentar """
+    return [path for path in executable_candidates(command) if os.path.exists(path)]
+
+def executable_candidates(command):
+    """ Executáveis que um comando de arranque lança: a aplicação real dos lançadores Update.exe e o próprio exe """
+    # Entradas da pasta Startup: o comando é o próprio atalho
+    shortcut = command.strip().strip('"')
+    if shortcut.lower().endswith('.lnk'):
+        target_command = shortcut_command(shortcut)
+        if target_command:
+            yield from executable_candidates(target_command)
+        return
+
     main_exe_path = _get_main_executable_path(command)
     
     if not main_exe_path:
-        return None
+        return
 
     if 'update.exe' in main_exe_path.lower():
         match = re.search(r'\s([\w-]+\.exe)', command)
@@ -45,14 +108,9 @@ def get_icon_for_executable(command):
             search_dirs = [base_dir, os.path.abspath(os.path.join(base_dir, '..'))]
             
             for s_dir in search_dirs:
-                for root, _, files in os.walk(s_dir):
-                    if secondary_exe_name.lower() in [f.lower() for f in files]:
-                        found_path = os.path.join(root, secondary_exe_name)
-                        pixmap = _extract_pixmap_from_path(found_path)
-                        if pixmap:
-                            return pixmap
+                yield from _executable_index.find(s_dir, secondary_exe_name)
     
-    return _extract_pixmap_from_path(main_exe_path)
+    yield main_exe_path
 
 def _get_main_executable_path(command):
     command = command.strip()
@@ -69,7 +127,80 @@ def _get_main_executable_path(command):
             return path_candidate.strip()
     return None
 
-def _extract_pixmap_from_path(file_path):
+# Formato binário dos atalhos (.lnk, [MS-SHLLINK]): lido diretamente, sem COM nem Windows
+_LNK_HAS_ID_LIST, _LNK_HAS_LINK_INFO, _LNK_IS_UNICODE = 0x1, 0x2, 0x80
+_LNK_STRINGS = ((0x4, 'name'), (0x8, 'relative_path'), (0x10, 'working_dir'), (0x20, 'arguments'), (0x40, 'icon'))
+_LNK_ENVIRONMENT_BLOCK = 0xA0000001
+
+def shortcut_command(lnk_path):
+    """ Comando que um atalho .lnk lança ('"destino" argumentos'), ou None se não for possível ler """
+    try:
+        with open(lnk_path, 'rb') as f:
+            data = f.read(1024 * 1024)
+        target, strings = _parse_shortcut(data)
+    except (OSError, struct.error, UnicodeDecodeError, IndexError):
+        return None
+    if not target and strings.get('relative_path'):
+        target = os.path.normpath(os.path.join(os.path.dirname(lnk_path), strings['relative_path']))
+    if not target:
+        return None
+    arguments = strings.get('arguments', '')
+    return f'"{target}" {arguments}'.strip()
+
+def _parse_shortcut(data):
+    if len(data) < 0x4C or struct.unpack_from('<I', data, 0)[0] != 0x4C:
+        return None, {}
+    flags = struct.unpack_from('<I', data, 0x14)[0]
+    position = 0x4C
+    if flags & _LNK_HAS_ID_LIST:
+        position += 2 + struct.unpack_from('<H', data, position)[0]
+
+    target = None
+    if flags & _LNK_HAS_LINK_INFO:
+        info_size, header_size, info_flags = struct.unpack_from('<3I', data, position)
+        if info_flags & 0x1:  # VolumeIDAndLocalBasePath
+            if header_size >= 0x24:
+                base_offset, suffix_offset = struct.unpack_from('<2I', data, position + 0x1C)
+                target = _utf16_z(data, position + base_offset) + _utf16_z(data, position + suffix_offset)
+            else:
+                base_offset = struct.unpack_from('<I', data, position + 0x10)[0]
+                suffix_offset = struct.unpack_from('<I', data, position + 0x18)[0]
+                target = _ansi_z(data, position + base_offset) + _ansi_z(data, position + suffix_offset)
+        position += info_size
+
+    strings = {}
+    unicode = flags & _LNK_IS_UNICODE
+    for flag, name in _LNK_STRINGS:
+        if flags & flag:
+            count = struct.unpack_from('<H', data, position)[0]
+            size = count * 2 if unicode else count
+            raw = data[position + 2:position + 2 + size]
+            strings[name] = raw.decode('utf-16-le') if unicode else raw.decode('latin-1')
+            position += 2 + size
+
+    if not target:
+        # Atalhos só com lista de IDs: o destino pode vir no bloco de variáveis de ambiente
+        while position + 8 <= len(data):
+            block_size, signature = struct.unpack_from('<2I', data, position)
+            if block_size < 8:
+                break
+            if signature == _LNK_ENVIRONMENT_BLOCK and block_size >= 8 + 260 + 520:
+                target = os.path.expandvars(_utf16_z(data[:position + 8 + 260 + 520], position + 8 + 260)) or None
+                break
+            position += block_size
+    return target, strings
+
+def _utf16_z(data, offset):
+    end = offset
+    while end + 1 < len(data) and data[end:end + 2] != b'\0\0':
+        end += 2
+    return data[offset:end].decode('utf-16-le')
+
+def _ansi_z(data, offset):
+    end = data.find(b'\0', offset)
+    return data[offset:end if end != -1 else len(data)].decode('latin-1')
+
+def extract_icon_image(file_path, large=False):
     if not os.path.exists(file_path):
         return None
 
@@ -77,7 +208,7 @@ def _extract_pixmap_from_path(file_path):
     SHGFI_SMALLICON = 0x000000001
     
     file_info = SHFILEINFO()
-    flags = SHGFI_ICON | SHGFI_SMALLICON
+    flags = SHGFI_ICON if large else SHGFI_ICON | SHGFI_SMALLICON
     
     try:
         ctypes.windll.shell32.SHGetFileInfoW(
@@ -86,11 +217,11 @@ def _extract_pixmap_from_path(file_path):
         
         hicon = file_info.hIcon
         if hicon:
+            from PySide6.QtGui import QImage
             image = QImage.fromHICON(hicon)
+            ctypes.windll.user32.DestroyIcon(hicon)
             if not image.isNull():
-                pixmap = QPixmap.fromImage(image)
-                ctypes.windll.user32.DestroyIcon(hicon)
-                return pixmap
+                return image
     except Exception:
         return None
-    return None
\ No newline at end of file
+    return None
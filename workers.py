@@ -1,47 +1,140 @@
+import ctypes
+import os
 import subprocess
-import speedtest
-from PySide6.QtCore import QThread, Signal
-
-# --- WORKER PARA O PING ---
-class PingWorker(QThread):
-    finished = Signal(str)
-
-    def __init__(self, address):
-        super().__init__()
-        self.address = address
-
-    def run(self):
-        try:
-            # Executa o comando ping do Windows (apenas 1 tentativa para ser rápido)
-            output = subprocess.check_output(f"ping -n 1 {self.address}", shell=True, text=True)
-            self.finished.emit(f"Sucesso:\n{output}")
-        except subprocess.CalledProcessError:
-            self.finished.emit(f"Falha: Não foi possível contactar {self.address}")
-        except Exception as e:
-            self.finished.emit(f"Erro: {str(e)}")
-
-# --- WORKER PARA O SPEEDTEST ---
-class SpeedtestWorker(QThread):
-    progress = Signal(str) 
-    finished = Signal(float, float, float)
-    error = Signal(str)
-
-    def run(self):
-        try:
-            self.progress.emit("A procurar servidor...")
-            st = speedtest.Speedtest()
-            st.get_best_server()
-            
-            self.progress.emit("A testar Download...")
-            download_bps = st.download()
-            download_mbps = download_bps / 1_000_000 # Converter bits para Megabits
-            
-            self.progress.emit("A testar Upload...")
-            upload_bps = st.upload()
-            upload_mbps = upload_bps / 1_000_000
-            
-            ping = st.results.ping
-            
-            self.finished.emit(download_mbps, upload_mbps, ping)
-        except Exception as e:
-            self.error.emit(str(e))
\ No newline at end of file
+
+from cleanup import TempCleaner
+from cleanup_rules import RuleCleaner
+from duplicates import DuplicateFinder
+from ip_resolver import collect_ip_info
+from probes import LatencyProber, METHOD_TCP
+from startup_snapshots import restore_snapshot
+
+# Funções de tarefa para o `JobScheduler` (jobs.py): cada uma recebe o `Job`
+# como primeiro argumento, corre numa thread da pool e devolve o resultado.
+
+# --- TAREFA PARA ABRIR FERRAMENTAS DO WINDOWS ---
+def launch_job(job, command, shell=False):
+    subprocess.Popen(command, shell=shell)
+    return command
+
+# --- TAREFA PARA OS TESTES DE LATÊNCIA (vários destinos em simultâneo) ---
+# Progresso: ("reply", destino, rtt_ms) a cada tentativa e ("host", ProbeResult) por destino.
+def probe_job(job, targets, method=METHOD_TCP, count=4, interval=0.5, timeout=2.0):
+    prober = LatencyProber(
+        targets, method=method, count=count, interval=interval, timeout=timeout,
+        on_reply=lambda target, rtt: job.report_progress(("reply", target, rtt)),
+        on_result=lambda result: job.report_progress(("host", result)),
+    )
+    job.token.on_cancel(prober.cancel)
+    return prober.run()
+
+# --- TAREFA PARA O TESTE DE VELOCIDADE ---
+# Progresso: ("phase", nome) no início de cada fase e ("sample", direção, segundos, mbps, em_aquecimento)
+# a cada 100 ms. Sem `server_url` usa o servidor Ookla mais próximo. Devolve um `ThroughputResult` (throughput.py).
+def speedtest_job(job, server_url=None, upload_url=None, streams=4, duration=8.0, warmup=2.0):
+    # Só carregado quando o teste é pedido (arranque mais rápido)
+    from throughput import ThroughputTester, HttpBackend, OoklaBackend
+
+    backend = HttpBackend(server_url, upload_url) if server_url else OoklaBackend()
+    tester = ThroughputTester(
+        backend, streams=streams, duration=duration, warmup=warmup,
+        on_sample=lambda *sample: job.report_progress(("sample",) + sample),
+        on_phase=lambda name: job.report_progress(("phase", name)),
+    )
+    job.token.on_cancel(tester.cancel)
+    result = tester.run()
+    job.token.raise_if_cancelled()
+    return result
+
+# --- TAREFA PARA OBTER OS IPs ---
+# Devolve um `IPInfo` (ip_resolver.py); o IP público vem da cache do resolvedor enquanto for válido.
+def ip_info_job(job, resolver, force=False):
+    return collect_ip_info(resolver, force=force)
+
+# --- TAREFA PARA A LIMPEZA DE TEMPORÁRIOS ---
+# Progresso: `CleanupStats` parciais.
+def cleanup_job(job, target_dir, dry_run=False, max_workers=8, size_index=None):
+    cleaner = TempCleaner(
+        target_dir,
+        max_workers=max_workers,
+        dry_run=dry_run,
+        progress_callback=job.report_progress,
+    )
+    job.token.on_cancel(cleaner.cancel)
+    if size_index is not None:
+        # O índice da última análise evita listar as pastas que já estavam vazias
+        cleaner.skip_dirs = size_index.empty_dirs(target_dir)
+    # Sem nova análise no fim: a interface já recalcula o espaço recuperável (e grava o índice)
+    # depois da limpeza, e o índice valida cada pasta pelo `mtime`, por isso não fica errado
+    return cleaner.run()
+
+# --- TAREFA PARA A LIMPEZA POR REGRAS ---
+# Progresso: `CleanupStats` com os totais. Devolve um `RuleCleanupResult` (cleanup_rules.py).
+def rule_cleanup_job(job, rules, dry_run=False, max_workers=8):
+    cleaner = RuleCleaner(rules, max_workers=max_workers, dry_run=dry_run, progress_callback=job.report_progress)
+    job.token.on_cancel(cleaner.cancel)
+    return cleaner.run()
+
+# --- TAREFA PARA A PRÉ-VISUALIZAÇÃO DO ESPAÇO RECUPERÁVEL ---
+def size_scan_job(job, size_index, target_dir):
+    summary = size_index.scan(target_dir)
+    size_index.save()
+    return summary
+
+# --- TAREFA PARA OS FICHEIROS GRANDES E DUPLICADOS ---
+# Progresso: ("progress", FinderProgress) e ("group", DuplicateGroup) a cada grupo confirmado.
+# Devolve um `FinderResult` (duplicates.py).
+def duplicate_scan_job(job, roots, hash_cache, min_size):
+    finder = DuplicateFinder(
+        roots, min_size=min_size, hash_cache=hash_cache,
+        on_group=lambda group: job.report_progress(("group", group)),
+        on_progress=lambda progress: job.report_progress(("progress", progress)),
+    )
+    job.token.on_cancel(finder.cancel)
+    result = finder.run()
+    # Os hashes de ficheiros apagados desde a última procura não voltam a ser úteis
+    hash_cache.prune()
+    hash_cache.save()
+    return result
+
+# --- TAREFA PARA O ANALISADOR DE ESPAÇO ---
+# Progresso: `DiskScanProgress`. A árvore (`scanner.tree`) pode ser lida durante a análise.
+# Devolve um `DiskScanResult` (disk_tree.py).
+def disk_scan_job(job, scanner):
+    scanner.on_progress = job.report_progress
+    job.token.on_cancel(scanner.cancel)
+    return scanner.run()
+
+# --- TAREFA PARA ESVAZIAR A RECICLAGEM ---
+def empty_recycle_bin_job(job):
+    return ctypes.windll.shell32.SHEmptyRecycleBinW(None, None, 7)
+
+# --- TAREFA PARA A TABELA DE PROCESSOS ---
+def process_poll_job(job, tracker):
+    return tracker.poll()
+
+# --- TAREFAS DO GESTOR DE ARRANQUE ---
+# Devolve um `ScanResult` (startup_sources.py): as origens sem alterações não são relidas.
+def startup_list_job(job, scanner):
+    return scanner.scan()
+
+def startup_backup_job(job, store, programs, name=None):
+    return store.save(programs, name=name)
+
+# Lista os estados guardados; o antigo `startup_backup.json`, se existir, entra no histórico.
+def startup_snapshots_job(job, store, legacy_file=None):
+    if legacy_file and os.path.exists(legacy_file):
+        store.import_legacy(legacy_file)
+    return store.list()
+
+# Devolve um `RestoreReport`: só os valores em falta ou alterados são escritos.
+def startup_restore_job(job, store, scanner, snapshot_id):
+    return restore_snapshot(store, scanner, snapshot_id)
+
+# Devolve {comando: ImpactEstimate} (startup_impact.py).
+def startup_impact_job(job, estimator, programs):
+    return estimator.estimate(programs)
+
+def startup_disable_job(job, scanner, program_details):
+    scanner.remove(program_details)
+    return program_details["name"]